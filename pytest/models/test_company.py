@@ -1,6 +1,6 @@
 import pytest
 import pandas as pd
-from models.company import Company, CompanySession
+from models.company import Company, CompanySession, CompanyTable, SessionGrid
 # not working yet
 @pytest.fixture
 def sample_company_data():
@@ -38,4 +38,41 @@ def test_company_session():
     
     assert session.is_full() == False
     assert session.add_student("10A_1", "Jane Doe") == True
-    assert len(session.students) == 1
\ No newline at end of file
+    assert len(session.students) == 1
+def test_company_table():
+    df = pd.DataFrame({
+        'Unternehmen': ['Company A ', 'Company B', 'Company A'],
+        'Fachrichtung': ['IT', 'IT', 'IT'],
+        'Max. Teilnehmer': [5, 4, 3],
+        'Max. Veranstaltungen': [2, 5, 1],
+        'Frühester Zeitpunkt': ['A', 'c', None]
+    })
+    table = CompanyTable.from_dataframe(df)
+    assert table.earliest_slot.tolist() == [0, 2, 0]
+    assert table.blocked_mask.tolist() == [0, 0b11, 0]
+    assert table[1].blocked_slots == [0, 1]
+    assert table[1].company_id == 1
+    assert table.resolve('Company A') == 0
+    assert table.resolve('2') == 1
+    assert table.resolve('Unknown') == -1
+    assert table.open_slots(5) == [[0, 1], [2, 3, 4], [0]]
+
+def test_session_grid():
+    company = Company(name="Test Company", capacity=5, max_sessions=2, earliest_slot=0, blocked_slots=[], company_id=1)
+    grid = SessionGrid(2, 3)
+    session = CompanySession(company=company, room="101", time_slot="B", time_range="9:50 – 10:35")
+    grid[(1, 1)] = session
+    session.add_student("10A_1", "Jane Doe")
+
+    assert len(grid) == 1
+    assert (1, 1) in grid
+    assert grid.session(1, 1) is session
+    assert grid.session(-1, 1) is None
+    assert grid.get((0, 0)) is None
+    # old name keys are simply not there
+    assert ("Test Company", 1) not in grid
+    assert grid.get(("Test Company", 1)) is None
+    with pytest.raises(KeyError):
+        grid[("Test Company", 1)]
+    assert list(grid.items()) == [((1, 1), session)]
+    assert grid.student_counts().tolist() == [[-1, -1, -1], [-1, 1, -1]]
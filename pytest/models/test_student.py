@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
-from models.student import StudentPreference
+import numpy as np
+from models.student import StudentPreference, PreferenceMatrix, satisfaction_scores, summarize_satisfaction
 # not working yet
 @pytest.fixture
 def sample_student_data():
@@ -46,3 +47,53 @@ def test_get_satisfaction_score():
     
     # Default
     assert student.get_satisfaction_score([True, True, True]) == 71.42857142857143
+
+def test_preference_matrix(sample_student_data):
+    preferences = PreferenceMatrix.from_dataframe(sample_student_data, {1: 'Company A'})
+    assert preferences.choices.dtype == 'int16'
+    assert preferences.choices.tolist() == [[1, 2, 3, -1, -1, -1]]
+    assert preferences[0].student_id.startswith("10A_")
+    assert preferences[0].wishes == ['Company A', '2', '3']
+
+def test_preference_matrix_keeps_out_of_range_wishes_as_text():
+    df = pd.DataFrame({
+        'Klasse': ['10A'], 'Name': ['Dilaksan'], 'Vorname': ['Müller'],
+        'Wahl 1': [40000], 'Wahl 2': [-3], 'Wahl 3': [2]
+    })
+    preferences = PreferenceMatrix.from_dataframe(df)
+    assert preferences.choices.tolist() == [[-1, -1, 2, -1, -1, -1]]
+    assert preferences.text_wishes == {(0, 0): '40000', (0, 1): '-3'}
+    assert preferences[0].wishes == ['40000', '-3', '2']
+
+def test_student_ids_are_stable_and_unique():
+    df = pd.DataFrame({
+        'Klasse': ['10A', '10A', '10B', '10A'],
+        'Name': ['Müller', 'Schmidt', 'Meyer', 'Müller'],
+        'Vorname': ['Gwen', 'Jan', 'Ali', 'Gwen']
+    })
+    ids = PreferenceMatrix.from_dataframe(df).student_ids.tolist()
+    assert ids[3] == ids[0] + '-2'
+    assert len(set(ids)) == 4
+
+    # row order does not matter, surrounding spaces neither
+    shuffled = df.iloc[[2, 1, 0]].reset_index(drop=True)
+    shuffled['Name'] = shuffled['Name'] + ' '
+    assert PreferenceMatrix.from_dataframe(shuffled).student_ids.tolist() == [ids[2], ids[1], ids[0]]
+
+def test_satisfaction_scores_match_single_score():
+    student = StudentPreference(student_id="10A_1", name="Christian, Müller", wishes=['1', '2', '3'])
+    realized = np.array([[True, True, True, False, False, False], [False, True, False, False, False, True]])
+    scores = satisfaction_scores(realized)
+    assert scores[0] == pytest.approx(student.get_satisfaction_score([True, True, True]))
+    assert scores[1] == pytest.approx(student.get_satisfaction_score(realized[1].tolist()))
+
+def test_summarize_satisfaction():
+    realized = np.zeros((4, 6), dtype=bool)
+    realized[0, :5] = True
+    realized[1, 0] = True
+    realized[2, 1] = True
+    summary = summarize_satisfaction(realized, ['10A', '10A', '10B', '10B'])
+    assert summary.class_names == ['10A', '10B']
+    assert summary.rank_histogram.tolist() == [2, 2, 1, 1, 1, 0]
+    assert summary.class_means[0] == pytest.approx((summary.scores[0] + summary.scores[1]) / 2)
+    assert summary.class_stats()['10B'][2] == pytest.approx(summary.scores[2] / 2)
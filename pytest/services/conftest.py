@@ -0,0 +1,39 @@
+import pytest
+import pandas as pd
+from services.scheduler import SchedulerService
+
+@pytest.fixture
+def sample_student_data():
+    return pd.DataFrame({
+        'Klasse': ['10A', '10A'],
+        'Name': ['Dilaksan', 'Müller'],
+        'Vorname': ['Christian', 'Gwen'],
+        'Wahl 1': [1, 2],
+        'Wahl 2': [2, 1],
+        'Wahl 3': [3, 3]
+    })
+
+@pytest.fixture
+def sample_company_data():
+    return pd.DataFrame({
+        'Unternehmen': ['Company A', 'Company B', 'Company C'],
+        'Fachrichtung': ['IT', 'Engineering', 'Marketing'],
+        'Max. Teilnehmer': [5, 4, 3],
+        'Max. Veranstaltungen': [2, 2, 1],
+        'Frühester Zeitpunkt': ['A', 'B', 'A']
+    })
+
+@pytest.fixture
+def sample_room_data():
+    return pd.DataFrame({
+        0: [101, 102, 103, 'Aula', 104]
+    })
+
+@pytest.fixture
+def loaded_scheduler(sample_student_data, sample_company_data, sample_room_data):
+    """SchedulerService mit den Beispieldaten, noch ohne Zeitplan."""
+    scheduler = SchedulerService()
+    scheduler.load_companies(sample_company_data)
+    scheduler.load_student_preferences(sample_student_data)
+    scheduler.load_rooms(sample_room_data)
+    return scheduler
@@ -0,0 +1,32 @@
+from services.assignment import MinCostFlow, assign_students
+
+def test_min_cost_flow():
+    mcf = MinCostFlow(4)
+    mcf.add_edge(0, 1, 2, 1)
+    mcf.add_edge(0, 2, 1, 5)
+    mcf.add_edge(1, 3, 1, 1)
+    mcf.add_edge(2, 3, 2, 1)
+    mcf.add_edge(1, 2, 1, 1)
+    assert mcf.flow(0, 3) == (3, 11)
+
+def test_assign_students_respects_capacity():
+    wish_lists = [[0, 1], [0, 1], [0, 1]]
+    assignments = assign_students(wish_lists, [2, 2], [[0], [0]], 1)
+    assert sum(1 for a in assignments if a.get(0) == 0) == 2
+    assert sum(1 for a in assignments if a.get(0) == 1) == 1
+
+def test_assign_students_one_session_per_slot():
+    wish_lists = [[0, 1, 2]]
+    assignments = assign_students(wish_lists, [5, 5, 5], [[0, 1], [0, 1], [0, 1]], 2)
+    assert len(assignments[0]) == 2
+    assert set(assignments[0].values()) == {0, 1}
+
+def test_assign_students_open_slots():
+    assignments = assign_students([[0]], [5], [[1]], 2)
+    assert assignments[0] == {1: 0}
+
+def test_assign_students_into_remaining_seats():
+    # slot 0 of company 0 is full, slot 1 is already taken by company 1
+    assignments = assign_students([[0, 1, 2]], [5, 5, 5], [[0, 2], [1], [0]], 3,
+                                  seats=[[0, 0, 1], [0, 3, 0], [2, 0, 0]], busy=[{1: 1}])
+    assert assignments[0] == {2: 0, 0: 2}
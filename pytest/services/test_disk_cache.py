@@ -0,0 +1,20 @@
+import os
+from services.disk_cache import evict_lru
+
+def test_evict_lru_removes_oldest_first(tmp_path):
+    for i, name in enumerate(['old.json', 'mid.json', 'new.json', 'keep.tmp']):
+        path = tmp_path / name
+        path.write_bytes(b'x' * 10)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    evict_lru(str(tmp_path), '.json', 20)
+    assert sorted(os.listdir(tmp_path)) == ['keep.tmp', 'mid.json', 'new.json']
+
+def test_evict_lru_skips_vanished_entries(tmp_path, monkeypatch):
+    for name in ('a.json', 'b.json'):
+        (tmp_path / name).write_bytes(b'x' * 10)
+    # another process evicted a.json between listdir and stat
+    monkeypatch.setattr(os, 'listdir', lambda directory: ['gone.json', 'a.json', 'b.json'])
+
+    evict_lru(str(tmp_path), '.json', 10)
+    assert len([name for name in ('a.json', 'b.json') if (tmp_path / name).exists()]) == 1
@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+import pytest
+from services.errors import ExportError
+from services.export_jobs import ExportQueue
+
+@pytest.fixture
+def scheduler(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    return loaded_scheduler
+
+def wait(exports, timeout=30.0):
+    finished = []
+    deadline = time.perf_counter() + timeout
+    while exports.jobs:
+        assert time.perf_counter() < deadline
+        finished += exports.poll()
+        time.sleep(0.01)
+    return finished
+
+def test_export_queue_runs_exports_concurrently(tmp_path, scheduler):
+    exports = ExportQueue()
+    progress = {}
+    for kind in ('schedule', 'students', 'attendance'):
+        task = scheduler.export_task(kind, str(tmp_path / f'{kind}.pdf'))
+        def recording(callback, task=task, kind=kind):
+            def report(done, total):
+                progress.setdefault(kind, []).append((done, total))
+                callback(done, total)
+            return task(report)
+        exports.submit(kind, recording, str(tmp_path / f'{kind}.pdf'), 'Teile')
+
+    finished = wait(exports)
+
+    assert sorted(job.label for job in finished) == ['attendance', 'schedule', 'students']
+    assert all(os.path.getsize(job.future.result()) > 0 for job in finished)
+    assert progress['students'][-1] == (1, 1)
+    assert progress['attendance'][-1] == (len(scheduler.schedule), len(scheduler.schedule))
+
+def test_export_queue_rejects_same_file(tmp_path):
+    exports = ExportQueue()
+    release = threading.Event()
+    path = str(tmp_path / 'schedule.pdf')
+    exports.submit('Zeitplan', lambda progress: release.wait(5), path, 'Seiten')
+    with pytest.raises(ExportError):
+        exports.submit('Zeitplan', lambda progress: None, path, 'Seiten')
+    release.set()
+    wait(exports)
+
+def test_export_task_keeps_collected_data(tmp_path, scheduler):
+    pypdf = pytest.importorskip('pypdf')
+    path = str(tmp_path / 'attendance.pdf')
+    task = scheduler.export_task('attendance', path)
+    # later changes to the schedule don't reach a task that is already prepared
+    for session in scheduler.schedule.values():
+        session.students.clear()
+    task()
+    text = "".join(page.extract_text() for page in pypdf.PdfReader(path).pages)
+    assert 'Dilaksan, Christian' in text
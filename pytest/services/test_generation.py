@@ -0,0 +1,36 @@
+import time
+import pandas as pd
+from services.generation import GenerationJob
+
+def wait(job, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not job.done():
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+def test_generation_job_runs_on_copy(loaded_scheduler):
+    job = GenerationJob(loaded_scheduler).start()
+    wait(job)
+
+    events = job.poll()
+    assert events[-1] == (1.0, "Fertig")
+    result = job.result()
+    assert result is not loaded_scheduler and result.get_schedule()
+    assert not loaded_scheduler.get_schedule()
+
+def test_generation_job_cancel_keeps_best_result(loaded_scheduler):
+    job = GenerationJob(loaded_scheduler, improve_seconds=60).start()
+    job.cancel()
+    wait(job)
+
+    assert job.cancelled
+    assert job.poll()[-1] == (1.0, "Abgebrochen")
+    assert job.result().get_schedule()
+
+def test_generation_job_discards_result_for_new_inputs(loaded_scheduler):
+    job = GenerationJob(loaded_scheduler).start()
+    loaded_scheduler.load_rooms(pd.DataFrame({0: [201, 202, 203, 204, 205]}))
+    wait(job)
+
+    assert job.error is None
+    assert job.result() is None
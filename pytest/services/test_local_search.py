@@ -0,0 +1,43 @@
+import time
+import numpy as np
+from services.local_search import improve_assignment
+
+def test_improve_assignment_swaps_into_better_schedule():
+    # student 0 holds the only seat of company 0, student 1 only wants company 0
+    student_slots = np.array([[0], [-1]])
+    points = np.array([[6, 5, 0], [6, 0, 0]])
+    seats = np.array([[1], [1]])
+    slots, score = improve_assignment(student_slots, points, seats, time_budget=0.2, seed=1)
+    assert score == 11
+    assert slots.tolist() == [[1], [0]]
+
+def test_improve_assignment_keeps_constraints():
+    rng = np.random.default_rng(0)
+    n_students, n_companies, n_slots = 60, 6, 3
+    points = np.zeros((n_students, n_companies + 1), dtype=np.int64)
+    for s in range(n_students):
+        points[s, rng.choice(n_companies, 4, replace=False)] = [6, 5, 4, 3]
+    seats = np.full((n_companies, n_slots), 10)
+    student_slots = np.full((n_students, n_slots), -1)
+    slots, score = improve_assignment(student_slots, points, seats, time_budget=0.2, seed=3)
+    for company_id in range(n_companies):
+        assert ((slots == company_id).sum(axis=0) <= 10).all()
+    for row in slots.tolist():
+        taken = [c for c in row if c >= 0]
+        assert len(taken) == len(set(taken))
+    assert score == points[np.arange(n_students)[:, None], slots].sum()
+    assert score > 0
+
+def test_improve_assignment_checkpoint_stops_early():
+    student_slots = np.array([[0], [-1]])
+    points = np.array([[6, 5, 0], [6, 0, 0]])
+    seats = np.array([[1], [1]])
+    calls = []
+    def checkpoint(progress, best_score):
+        calls.append((progress, best_score))
+        return True
+    start = time.perf_counter()
+    slots, score = improve_assignment(student_slots, points, seats, time_budget=60, seed=1, checkpoint=checkpoint)
+    assert time.perf_counter() - start < 5
+    assert len(calls) == 1 and 0 <= calls[0][0] < 1
+    assert score == points[np.arange(2)[:, None], slots].sum()
@@ -0,0 +1,64 @@
+import pytest
+from pypdf import PdfReader
+from models.company import Company, CompanySession
+from models.student import StudentScheduleView
+from services.export_cache import ExportCache
+from services.pdf_export import render_student_schedules, render_attendance_lists
+
+# the renderers batch many cells into one text object, the text has to come back out unchanged
+
+def page_text(path):
+    return "\n".join(page.extract_text() for page in PdfReader(path).pages)
+
+def text_positions(path):
+    """Text -> (x, y) der ersten Seite, Seitenkoordinaten."""
+    positions = {}
+    def visit(text, cm, tm, font, size):
+        if text.strip():
+            positions.setdefault(text.strip(), (tm[4] * cm[0] + tm[5] * cm[2] + cm[4], tm[4] * cm[1] + tm[5] * cm[3] + cm[5]))
+    PdfReader(path).pages[0].extract_text(visitor_text=visit)
+    return positions
+
+def test_student_schedule_text(tmp_path):
+    student = StudentScheduleView(
+        student_id='10Ä_1', name='Müller, Jürgen', class_name='10Ä',
+        appointments=[{'time': 'A (8:45 – 9:30)', 'company': 'Bäckerei Größ (Schäl)', 'room': 'Aula', 'wish_number': 2}],
+        realized_wishes=[False, True], score=83.333
+    )
+    path = str(tmp_path / 'students.pdf')
+    for cache in (None, ExportCache(str(tmp_path / 'cache')), ExportCache(str(tmp_path / 'cache'))):
+        render_student_schedules(path, {'10Ä': [student]}, cache=cache)
+        text = page_text(path)
+        assert 'Müller, Jürgen - Klasse 10Ä - Score: 83.3%' in text
+        assert 'A (8:45 – 9:30)' in text
+        assert 'Bäckerei Größ (Schäl)' in text
+        assert 'Aula' in text
+
+def test_student_schedule_rows_sit_below_the_header(tmp_path):
+    student = StudentScheduleView(
+        student_id='10A_1', name='Weiß, André', class_name='10A',
+        appointments=[{'time': 'A (8:00)', 'company': 'Firma A', 'room': '101', 'wish_number': 1},
+                      {'time': 'B (9:00)', 'company': 'Firma B', 'room': '102', 'wish_number': 2}],
+        realized_wishes=[True, True], score=100.0
+    )
+    path = str(tmp_path / 'students.pdf')
+    render_student_schedules(path, {'10A': [student]})
+
+    positions = text_positions(path)
+    title_y = positions['Weiß, André - Klasse 10A - Score: 100.0%'][1]
+    # title 32 pt, header 27 pt, rows 20 pt with the baseline 4 pt above the row's bottom line
+    assert positions['A (8:00)'][1] == pytest.approx(title_y + 12 - 32 - 27 - 20 + 4)
+    assert positions['B (9:00)'][1] == pytest.approx(title_y + 12 - 32 - 27 - 40 + 4)
+    assert positions['Firma B'][1] == positions['B (9:00)'][1]
+
+def test_attendance_list_text(tmp_path):
+    session = CompanySession(company=Company('Zentis Öl & Co', 10, 2, 0, []), room='101', time_slot='B', time_range='9:50 – 10:35')
+    session.add_student('10A_2', 'Özdemir, Ümran')
+    session.add_student('9B_1', 'Weiß, André')
+    path = str(tmp_path / 'attendance.pdf')
+    render_attendance_lists(path, [session])
+
+    text = page_text(path)
+    for expected in ('Zentis Öl & Co', 'Zeitfenster: B (9:50 – 10:35)', 'Raum: 101',
+                     'Özdemir, Ümran', 'Weiß, André', '10A', '9B', 'Unterschrift'):
+        assert expected in text
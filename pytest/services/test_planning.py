@@ -0,0 +1,36 @@
+import numpy as np
+from services.planning import demand_histogram, weighted_demand, plan_sessions
+
+def test_demand_histogram():
+    wish_matrix = np.array([[0, 1, -1], [1, 0, 2], [1, 5, -2]])
+    histogram = demand_histogram(wish_matrix, 3)
+    assert histogram.tolist() == [[1, 1, 0], [2, 1, 0], [0, 0, 1]]
+
+def test_weighted_demand_sums_to_slots_per_student():
+    histogram = np.array([[1, 0, 0, 0, 0, 0], [0, 1, 1, 1, 1, 1]])
+    assert weighted_demand(histogram, 5).sum() == 5.0
+
+def test_plan_sessions_follows_demand():
+    open_slots = plan_sessions(
+        np.array([45.0, 5.0, 0.0]),
+        np.array([20, 20, 20]),
+        np.array([5, 5, 5]),
+        [[0, 1, 2], [0, 1, 2], [0, 1, 2]],
+        n_rooms=2,
+        n_slots=3
+    )
+    assert open_slots == [[0, 1, 2], [0], []]
+
+def test_plan_sessions_respects_rooms_and_max_sessions():
+    open_slots = plan_sessions(
+        np.array([100.0, 100.0, 100.0]),
+        np.array([20, 20, 20]),
+        np.array([1, 5, 5]),
+        [[0, 1], [0, 1], [1]],
+        n_rooms=1,
+        n_slots=2,
+        own_room={2}
+    )
+    assert len(open_slots[0]) == 1
+    assert sorted(open_slots[0] + open_slots[1]) == [0, 1]
+    assert open_slots[2] == [1]
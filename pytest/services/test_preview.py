@@ -0,0 +1,74 @@
+import pandas as pd
+from services.scheduler import SchedulerService
+from models.company import Company, CompanySession
+from models.student import StudentScheduleView
+from services.preview import RowLayout, attendance_layout, column_positions, class_title, student_rows, schedule_rows, diff_rows
+
+def make_session(name, students):
+    session = CompanySession(company=Company(name, 10, 2, 0, []), room='101', time_slot='A', time_range='8:45 – 9:30')
+    for student_id, student_name in students:
+        session.add_student(student_id, student_name)
+    return session
+
+def test_attendance_layout_rows():
+    sessions = [
+        make_session('Zentis', [('10A_2', 'Müller, Gwen'), ('9B_1', 'Dilaksan, Christian')]),
+        make_session('Aldi', []),
+    ]
+    layout = attendance_layout(sessions)
+
+    # title, slot, room, header, students, 5 empty rows per session
+    assert len(layout) == (4 + 2 + 5) + (4 + 0 + 5)
+    cells = [row.cells for row in layout.rows if row.style == 'cell']
+    assert cells[0][:3] == ('1', 'Dilaksan, Christian', '9B')
+    assert cells[1][:3] == ('2', 'Müller, Gwen', '10A')
+    assert [row[0] for row in cells[2:7]] == ['3', '4', '5', '6', '7']
+    assert layout.rows[-1].top + layout.rows[-1].height == layout.height
+
+def test_column_positions_fit_longest_text():
+    layout = attendance_layout([make_session('Ein sehr langer Unternehmensname', [('10A_2', 'Mustermann-Schmidt, Maximiliane')])])
+    # one pixel per character, bold header two
+    positions = column_positions(layout, lambda style, text: len(text) * (2 if style == 'header' else 1), left=5, gap=10)
+
+    # widths: 'Nr.' 6, the name 31, 'Klasse' 12; the company title spans all columns
+    assert positions == [5, 21, 62, 84]
+
+def test_row_layout_visible():
+    layout = RowLayout()
+    for i in range(1000):
+        layout.add('cell', [str(i)], 20)
+    assert list(layout.visible(0, 59)) == [0, 1, 2]
+    assert list(layout.visible(10010, 10050)) == [500, 501, 502]
+    assert list(layout.visible(19990, 30000)) == [999]
+
+def test_student_rows():
+    student = StudentScheduleView(
+        student_id='10A_1', name='Müller, Gwen', class_name='10A',
+        appointments=[{'time': 'A (8:45 – 9:30)', 'company': 'Zentis', 'room': '101', 'wish_number': 2}],
+        realized_wishes=[False, True], score=83.333
+    )
+    assert student_rows([student]) == [
+        ('10A_1', 'Müller, Gwen - Bewertung: 83.3%', [('A (8:45 – 9:30)', 'Zentis', '101', '2')])
+    ]
+    assert class_title('10A', (50.0, 10.0, 55.0, 90.0)) == 'Klasse 10A - Ø 50.0% (Median 55.0%, P10 10.0%, P90 90.0%)'
+
+def test_diff_rows():
+    old = {'company-0': ('Zentis', 'Raum: 101', ''), 'company-1': ('Aldi', '', '')}
+    new = {'company-0': ('Zentis', 'Raum: 101', 'Raum: 102'), 'company-2': ('Lidl', '', '')}
+    removed, added, changed = diff_rows(old, new)
+    assert removed == ['company-1']
+    assert added == [(1, 'company-2')]
+    assert changed == [('company-0', 2, 'Raum: 102')]
+    assert diff_rows(new, new) == ([], [], [])
+
+def test_schedule_rows_stable_iids():
+    scheduler = SchedulerService()
+    scheduler.load_companies(pd.DataFrame({
+        'Unternehmen': ['Company A', 'Company B'],
+        'Max. Teilnehmer': [5, 4],
+        'Max. Veranstaltungen': [1, 1],
+        'Frühester Zeitpunkt': ['A', 'B']
+    }))
+    rows = schedule_rows(scheduler.companies, scheduler.schedule, scheduler.time_slots)
+    assert list(rows) == ['company-0', 'company-1']
+    assert rows['company-1'] == ('Company B', '', '', '', '', '')
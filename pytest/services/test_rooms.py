@@ -0,0 +1,24 @@
+import pytest
+from services.rooms import allocate_rooms, RoomAllocationError
+
+SLOTS = ['A', 'B', 'C', 'D', 'E']
+
+def test_allocate_rooms_shares_disjoint_slots():
+    allocation = allocate_rooms({0: 0b00011, 1: 0b11100}, ['101'], SLOTS)
+    assert allocation == {0: {0: '101', 1: '101'}, 1: {2: '101', 3: '101', 4: '101'}}
+
+def test_allocate_rooms_no_double_booking():
+    # 80 companies, half in the morning (A-B), half from C on, 40 rooms
+    masks = {company_id: 0b00011 if company_id % 2 else 0b11100 for company_id in range(80)}
+    allocation = allocate_rooms(masks, [str(room) for room in range(40)], SLOTS)
+    used = set()
+    for company_id, slot_rooms in allocation.items():
+        assert set(slot_rooms) == {slot for slot in range(5) if masks[company_id] >> slot & 1}
+        assert len(set(slot_rooms.values())) == 1
+        for slot, room in slot_rooms.items():
+            assert (slot, room) not in used
+            used.add((slot, room))
+
+def test_allocate_rooms_infeasible():
+    with pytest.raises(RoomAllocationError, match="A: 3 Veranstaltungen, 2 Räume"):
+        allocate_rooms({0: 1, 1: 1, 2: 1}, ['101', '102'], SLOTS)
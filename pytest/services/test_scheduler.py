@@ -1,38 +1,15 @@
+import os
 import pytest
+import numpy as np
 import pandas as pd
 from services.scheduler import SchedulerService
+from services.errors import ScheduleGenerationError, SchedulerError, SnapshotError
+from services.export_cache import ExportCache, fragment_key
 # not working yet
 @pytest.fixture
 def scheduler():
     return SchedulerService()
 
-@pytest.fixture
-def sample_student_data():
-    return pd.DataFrame({
-        'Klasse': ['10A', '10A'],
-        'Name': ['Dilaksan', 'Müller'],
-        'Vorname': ['Christian', 'Gwen'],
-        'Wahl 1': [1, 2],
-        'Wahl 2': [2, 1],
-        'Wahl 3': [3, 3]
-    })
-
-@pytest.fixture
-def sample_company_data():
-    return pd.DataFrame({
-        'Unternehmen': ['Company A', 'Company B', 'Company C'],
-        'Fachrichtung': ['IT', 'Engineering', 'Marketing'],
-        'Max. Teilnehmer': [5, 4, 3],
-        'Max. Veranstaltungen': [2, 2, 1],
-        'Frühester Zeitpunkt': ['A', 'B', 'A']
-    })
-
-@pytest.fixture
-def sample_room_data():
-    return pd.DataFrame({
-        0: [101, 102, 103, 'Aula', 104]
-    })
-
 def test_load_student_preferences(scheduler, sample_student_data):
     result = scheduler.load_student_preferences(sample_student_data)
     assert result == True
@@ -71,4 +48,215 @@ def test_generate_schedule(scheduler, sample_student_data, sample_company_data,
     
     result = scheduler.generate_schedule()
     assert result == True
-    assert len(scheduler.schedule) > 0
\ No newline at end of file
+    assert len(scheduler.schedule) > 0
+
+def test_generate_schedule_assigns_students(loaded_scheduler):
+    assert loaded_scheduler.generate_schedule() == True
+    for slot_idx in range(len(loaded_scheduler.time_slots)):
+        for student in loaded_scheduler.student_preferences:
+            count = sum(1 for (_, s), session in loaded_scheduler.schedule.items()
+                        if s == slot_idx and any(st['id'] == student.student_id for st in session.students))
+            assert count <= 1
+    assert sum(len(session.students) for session in loaded_scheduler.schedule.values()) == 6
+
+def test_get_student_schedules(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+
+    class_schedules = loaded_scheduler.get_student_schedules()
+    assert list(class_schedules) == ['10A']
+    view = class_schedules['10A'][0]
+    assert len(view.appointments) == 3
+    assert view.realized_wishes[:3] == [True, True, True]
+    assert loaded_scheduler.get_student_session(view.student_id, 0) is not None
+    assert loaded_scheduler.get_student_schedules() is class_schedules
+
+def test_improve_schedule(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    assigned = sum(len(session.students) for session in loaded_scheduler.schedule.values())
+
+    assert loaded_scheduler.improve_schedule(time_budget=0.05, restarts=1) >= 0
+    assert sum(len(session.students) for session in loaded_scheduler.schedule.values()) == assigned
+
+def test_generate_schedule_raises_structured_error(scheduler, sample_student_data, sample_company_data):
+    scheduler.load_companies(sample_company_data)
+    scheduler.load_student_preferences(sample_student_data)
+
+    # no rooms loaded
+    with pytest.raises(ScheduleGenerationError):
+        scheduler.generate_schedule()
+    assert len(scheduler.schedule) == 0
+
+def test_snapshot_roundtrip_and_stale_inputs(tmp_path, loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    wishes = tmp_path / 'wahl.xlsx'
+    wishes.write_bytes(b'v1')
+    path = str(tmp_path / 'session.npz')
+    loaded_scheduler.save_snapshot(path, {'preferences': str(wishes)})
+
+    restored = SchedulerService()
+    assert restored.load_snapshot(path, {'preferences': str(wishes)})
+    assert restored.student_slots.tolist() == loaded_scheduler.student_slots.tolist()
+    assert restored.rooms == loaded_scheduler.rooms
+    for key, session in loaded_scheduler.schedule.items():
+        assert restored.schedule[key].room == session.room
+        assert restored.schedule[key].students == session.students
+    assert restored.student_preferences[0].wishes == loaded_scheduler.student_preferences[0].wishes
+
+    wishes.write_bytes(b'v2')
+    with pytest.raises(SnapshotError):
+        SchedulerService().load_snapshot(path, {'preferences': str(wishes)})
+
+def test_failed_snapshot_load_keeps_current_state(tmp_path, loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    path = str(tmp_path / 'session.npz')
+    loaded_scheduler.save_snapshot(path)
+    before = ([session.room for session in loaded_scheduler.schedule.values()], loaded_scheduler.rooms)
+
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+    broken = str(tmp_path / 'broken.npz')
+    np.savez(broken, **dict(arrays, meta=np.array('{not json')))
+    with pytest.raises(SnapshotError):
+        loaded_scheduler.load_snapshot(broken)
+
+    del arrays['student_slots']
+    np.savez(broken, **arrays)
+    with pytest.raises(SnapshotError):
+        loaded_scheduler.load_snapshot(broken)
+    assert ([session.room for session in loaded_scheduler.schedule.values()], loaded_scheduler.rooms) == before
+
+    with pytest.raises(SnapshotError):
+        loaded_scheduler.load_snapshot(path, {'preferences': str(tmp_path / 'missing.xlsx')})
+
+def test_reimport_student_preferences_keeps_unaffected(loaded_scheduler, sample_student_data):
+    loaded_scheduler.generate_schedule()
+    first_id = loaded_scheduler.student_preferences[0].student_id
+    kept = loaded_scheduler.student_slots[loaded_scheduler.student_rows[first_id]].tolist()
+
+    # reversed rows, second student changes a wish, one new student
+    df = sample_student_data.iloc[::-1].reset_index(drop=True)
+    df.loc[0, 'Wahl 3'] = None
+    df = pd.concat([df, pd.DataFrame({'Klasse': ['10B'], 'Name': ['Meyer'], 'Vorname': ['Ali'], 'Wahl 1': [1]})], ignore_index=True)
+    delta = loaded_scheduler.reimport_student_preferences(df)
+
+    assert len(delta.added) == 1 and delta.removed == [] and len(delta.changed) == 1
+    assert first_id not in delta.changed
+    assert loaded_scheduler.student_slots[loaded_scheduler.student_rows[first_id]].tolist() == kept
+    for session in loaded_scheduler.schedule.values():
+        assert len(session.students) <= session.company.capacity
+
+def test_update_student_keeps_other_assignments(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    first, second = loaded_scheduler.student_preferences.student_ids.tolist()
+    kept = loaded_scheduler.student_slots[loaded_scheduler.student_rows[second]].tolist()
+    before = loaded_scheduler.student_slots[loaded_scheduler.student_rows[first]].tolist()
+
+    changed = loaded_scheduler.update_student(first, ['Company C'])
+
+    assert loaded_scheduler.student_preferences[0].wishes == ['Company C']
+    assert loaded_scheduler.student_slots[loaded_scheduler.student_rows[second]].tolist() == kept
+    row = loaded_scheduler.student_slots[loaded_scheduler.student_rows[first]].tolist()
+    assert [company_id for company_id in row if company_id >= 0] == [2]
+    dropped = [(company_id, slot_idx) for slot_idx, company_id in enumerate(before) if company_id in (0, 1)]
+    assert dropped and set(dropped) <= set(changed)
+
+def test_update_student_takes_company_ids_and_rejects_unknown(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    first = loaded_scheduler.student_preferences.student_ids[0]
+
+    loaded_scheduler.update_student(first, [2, 'Company A'])
+
+    assert loaded_scheduler.student_preferences[0].wishes == ['Company C', 'Company A']
+    with pytest.raises(SchedulerError):
+        loaded_scheduler.update_student(first, ['Company X'])
+    with pytest.raises(SchedulerError):
+        loaded_scheduler.update_student(first, [7])
+    assert loaded_scheduler.student_preferences[0].wishes == ['Company C', 'Company A']
+    assert not loaded_scheduler.student_preferences.text_wishes
+
+def test_update_company_moves_participants_with_the_session(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    before = (loaded_scheduler.student_slots == 0).any(axis=1)
+
+    loaded_scheduler.update_company(0, earliest_slot=3)
+
+    assert ((loaded_scheduler.student_slots == 0).any(axis=1) == before).all()
+    assert (loaded_scheduler.student_slots[:, :3] != 0).all()
+
+def test_update_company_moves_and_shrinks_sessions(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+
+    changed = loaded_scheduler.update_company(0, capacity=1, earliest_slot=3)
+
+    assert changed
+    for (company_id, slot_idx), session in loaded_scheduler.schedule.items():
+        assert len(session.students) <= session.company.capacity
+        if company_id == 0:
+            assert slot_idx >= 3
+    assert loaded_scheduler.companies[0].capacity == 1
+
+def test_export_class_schedules(tmp_path, loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+
+    paths = loaded_scheduler.export_class_schedules(str(tmp_path), workers=2, combine='zip')
+
+    assert [os.path.basename(path) for path in paths] == [
+        'student_schedules_auswertung.pdf', 'student_schedules_10A.pdf', 'student_schedules.zip'
+    ]
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+
+def test_export_cache_renders_only_changed_fragments(tmp_path, loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+    cache_dir = tmp_path / 'cache'
+    loaded_scheduler.export_cache = ExportCache(str(cache_dir))
+
+    loaded_scheduler.export_attendance_lists(output_path=str(tmp_path / 'attendance.pdf'))
+    loaded_scheduler.export_student_schedules(str(tmp_path / 'students.pdf'))
+    entries = set(os.listdir(cache_dir))
+    # one fragment per session plus one for the class 10A
+    assert len(entries) == len(loaded_scheduler.schedule) + 1
+
+    loaded_scheduler.export_attendance_lists(output_path=str(tmp_path / 'attendance.pdf'))
+    loaded_scheduler.export_student_schedules(str(tmp_path / 'students.pdf'))
+    assert set(os.listdir(cache_dir)) == entries
+
+    first = loaded_scheduler.student_preferences.student_ids[0]
+    changed = loaded_scheduler.update_student(first, ['Company C'])
+    loaded_scheduler.export_attendance_lists(output_path=str(tmp_path / 'attendance.pdf'))
+    loaded_scheduler.export_student_schedules(str(tmp_path / 'students.pdf'))
+    new_entries = set(os.listdir(cache_dir)) - entries
+    assert 1 <= len(new_entries) <= len(changed) + 1
+    assert any(name.startswith('students-') for name in new_entries)
+
+def test_fragment_key_depends_on_kind_and_data():
+    key = fragment_key('students', ['10A', [['Müller, Gwen', 50.0]]])
+    assert key == fragment_key('students', ['10A', [['Müller, Gwen', 50.0]]])
+    assert key != fragment_key('attendance', ['10A', [['Müller, Gwen', 50.0]]])
+    assert key != fragment_key('students', ['10A', [['Müller, Gwen', 75.0]]])
+
+def test_attendance_sessions_include_all_companies(loaded_scheduler):
+    loaded_scheduler.generate_schedule()
+
+    sessions = loaded_scheduler.attendance_sessions()
+
+    assert len(sessions) == len(loaded_scheduler.schedule)
+    assert [(s.company.name, s.time_slot) for s in sessions] == sorted((s.company.name, s.time_slot) for s in sessions)
+
+def test_wish_matrix_keeps_same_named_companies_apart(scheduler):
+    scheduler.load_companies(pd.DataFrame({
+        'Unternehmen': ['Inform', 'Inform', 'Zentis'],
+        'Max. Teilnehmer': [5, 5, 5],
+        'Max. Veranstaltungen': [2, 2, 2],
+        'Frühester Zeitpunkt': ['A', 'A', 'A']
+    }))
+    scheduler.load_student_preferences(pd.DataFrame({
+        'Klasse': ['10A', '10A'],
+        'Name': ['Dilaksan', 'Müller'],
+        'Vorname': ['Christian', 'Gwen'],
+        'Wahl 1': [2, 1],
+        'Wahl 2': ['Zentis', 3],
+    }))
+
+    # the text cell is resolved by name, the numbers stay as they are
+    assert scheduler._wish_matrix()[:, :2].tolist() == [[1, 2], [0, 2]]
@@ -0,0 +1,117 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import pandas as pd
+from services import workbooks
+from models.student import PreferenceMatrix
+from services.workbooks import WorkbookCache, read_companies, parse_companies, stream_preferences
+
+def write_workbook(path, names):
+    pd.DataFrame({' Unternehmen ': names, 'Max. Teilnehmer': [20] * len(names)}).to_excel(path, index=False)
+
+def test_workbook_cache_hit_and_content_key(tmp_path):
+    cache = WorkbookCache(str(tmp_path / '.cache'))
+    path = str(tmp_path / 'companies.xlsx')
+    write_workbook(path, ['Zentis'])
+
+    first = read_companies(path, cache)
+    assert list(first.columns) == ['Unternehmen', 'Max. Teilnehmer']
+    assert len(os.listdir(cache.directory)) == 1
+
+    calls = []
+    def reader(file_path):
+        calls.append(file_path)
+        return parse_companies(file_path)
+    reader.__name__ = 'parse_companies'
+    assert cache.load(path, reader).equals(first)
+    assert calls == []
+
+    write_workbook(path, ['Aldi'])
+    assert read_companies(path, cache)['Unternehmen'].tolist() == ['Aldi']
+
+def test_workbook_cache_eviction(tmp_path):
+    cache = WorkbookCache(str(tmp_path / '.cache'), max_bytes=1)
+    for i in range(3):
+        path = str(tmp_path / f'companies{i}.xlsx')
+        write_workbook(path, [f'Company {i}'])
+        read_companies(path, cache)
+    assert len(os.listdir(cache.directory)) <= 1
+
+def test_stream_preferences_matches_dataframe_loader(tmp_path):
+    path = str(tmp_path / 'wahl.xlsx')
+    df = pd.DataFrame({
+        'Klasse': ['10A', '10A', '10B'],
+        'Name': ['Müller', 'Schmidt', 'Meyer'],
+        'Vorname': ['Gwen', 'Jan', 'Ali'],
+        'Wahl 1': [1, 2, None],
+        'Wahl 2': [2, 'Zentis', 3]
+    })
+    df.to_excel(path, index=False)
+    progress = []
+
+    prefs, preview = stream_preferences(path, chunk_size=2, progress=lambda done, total: progress.append(done))
+    expected = PreferenceMatrix.from_dataframe(pd.read_excel(path))
+
+    assert progress == [2, 3]
+    assert prefs.student_ids.tolist() == expected.student_ids.tolist()
+    assert prefs.choices.tolist() == expected.choices.tolist()
+    assert prefs[1].wishes == ['2', 'Zentis']
+    assert len(preview) == 3
+
+def test_read_all_results_load_in_dependency_order(tmp_path, monkeypatch):
+    from services.scheduler import SchedulerService
+    from services.workbooks import read_all
+
+    rooms = str(tmp_path / 'rooms.xlsx')
+    companies = str(tmp_path / 'companies.xlsx')
+    wishes = str(tmp_path / 'wahl.xlsx')
+    pd.DataFrame([[101], [102]]).to_excel(rooms, index=False, header=False)
+    pd.DataFrame({
+        'Unternehmen': ['Zentis', 'Aldi'], 'Fachrichtung': ['', ''], 'Max. Teilnehmer': [20, 20],
+        'Max. Veranstaltungen': [5, 5], 'Frühester Zeitpunkt': ['A', 'A']
+    }).to_excel(companies, index=False)
+    pd.DataFrame({'Klasse': ['10A'], 'Name': ['Müller'], 'Vorname': ['Gwen'], 'Wahl 1': [2]}).to_excel(wishes, index=False)
+
+    # small files are read one after the other, no pool is started
+    monkeypatch.setattr(workbooks, 'import_pool', lambda: pytest.fail("pool started for small files"))
+    books = read_all(rooms, companies, wishes)
+    scheduler = SchedulerService()
+    assert scheduler.load_all(books.rooms, books.companies, books.preferences) == {
+        'rooms': True, 'companies': True, 'preferences': True
+    }
+    assert scheduler.rooms == ['101', '102']
+    assert scheduler.student_preferences[0].wishes == ['Aldi']
+    assert len(books.preferences_preview) == 1
+
+def test_stream_preferences_gives_the_same_student_ids(tmp_path):
+    path = str(tmp_path / 'wahl.xlsx')
+    pd.DataFrame({
+        'Klasse': [10, 10, None, '10B'],
+        'Name': ['Müller', 'Schmidt', 'Meyer', 'Weiß'],
+        'Vorname': ['Gwen', None, 'Ali', 'Jan'],
+        'Wahl 1': [1, 2, 3, 1]
+    }).to_excel(path, index=False)
+
+    expected = PreferenceMatrix.from_dataframe(pd.read_excel(path))
+    for chunk_size in (1, 5000):
+        prefs, _ = stream_preferences(path, chunk_size=chunk_size)
+        assert prefs.student_ids.tolist() == expected.student_ids.tolist()
+        assert prefs.names.tolist() == expected.names.tolist()
+    assert expected.student_ids[0].startswith('10_')
+
+def test_read_all_parses_the_three_files_concurrently(monkeypatch):
+    # every reader waits until all three run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    def reader(name):
+        def read(*args):
+            barrier.wait()
+            return name
+        return read
+    monkeypatch.setattr(workbooks, 'read_rooms', reader('rooms'))
+    monkeypatch.setattr(workbooks, 'read_companies', reader('companies'))
+    monkeypatch.setattr(workbooks, '_read_preferences_with_preview', lambda *args: (reader('prefs')(), 'preview'))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        books = workbooks.read_all('rooms.xlsx', 'companies.xlsx', 'wahl.xlsx', executor=executor)
+    assert (books.rooms, books.companies, books.preferences, books.preferences_preview) == ('rooms', 'companies', 'prefs', 'preview')
@@ -0,0 +1,97 @@
+"""
+Zeitplan ohne GUI erzeugen und alle PDFs schreiben.
+
+    cd src && python -m cli BOT0_Raumliste.xlsx BOT1_Veranstaltungsliste.xlsx BOT2_Wahl.xlsx -o out/
+"""
+import argparse
+import os
+import sys
+
+from services.scheduler import SchedulerService
+from services.errors import SchedulerError, SnapshotError
+from services.workbooks import WorkbookCache, read_all
+from services.export_cache import ExportCache
+from services.pdf_export import use_binary_streams
+
+
+def _restore(scheduler: SchedulerService, path: str, inputs) -> bool:
+    if not os.path.exists(path):
+        return False
+    try:
+        return scheduler.load_snapshot(path, inputs)
+    except SnapshotError as e:
+        print(f"Snapshot wird neu erzeugt: {e}", file=sys.stderr)
+        return False
+
+
+def _export_student_schedules(scheduler: SchedulerService, args):
+    if not args.per_class:
+        return [scheduler.export_student_schedules(os.path.join(args.output_dir, "student_schedules.pdf"))]
+    combine = None if args.per_class == "files" else args.per_class
+    return scheduler.export_class_schedules(args.output_dir, workers=args.workers, combine=combine)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Zeitplan erzeugen und PDFs exportieren")
+    parser.add_argument("rooms", help="Raumliste (BOT0)")
+    parser.add_argument("companies", help="Veranstaltungsliste (BOT1)")
+    parser.add_argument("preferences", help="Schülerwünsche (BOT2)")
+    parser.add_argument("-o", "--output-dir", default=".", help="Zielordner für die PDFs")
+    parser.add_argument("--improve", type=float, default=0.0, metavar="SECONDS",
+                        help="Zeitbudget für die lokale Verbesserung (0 = aus)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir",
+                        help="Cache-Ordner für eingelesene Arbeitsmappen und gerenderte PDF-Seiten")
+    parser.add_argument("--stream", action="store_true",
+                        help="Wahlliste zeilenweise einlesen (sehr große Dateien)")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="Zeitplan-Snapshot: wird wiederverwendet, solange die Eingabedateien gleich sind")
+    parser.add_argument("--per-class", choices=["pdf", "zip", "files"],
+                        help="Schülerzeitpläne parallel je Klasse rendern: zusammenführen (pdf), "
+                             "als zip packen oder einzeln lassen")
+    parser.add_argument("--workers", type=int, help="Prozesse für --per-class (Standard: alle Kerne)")
+    args = parser.parse_args(argv)
+    use_binary_streams()
+
+    scheduler = SchedulerService()
+    cache = WorkbookCache(args.cache_dir) if args.cache_dir else None
+    if args.cache_dir:
+        # unchanged classes / sessions are not drawn again on the next export
+        scheduler.export_cache = ExportCache(os.path.join(args.cache_dir, 'pdf'))
+    inputs = {'rooms': args.rooms, 'companies': args.companies, 'preferences': args.preferences}
+    try:
+        if not (args.snapshot and _restore(scheduler, args.snapshot, inputs)):
+            # all three files are parsed concurrently, the scheduler applies companies before preferences
+            books = read_all(args.rooms, args.companies, args.preferences, cache, stream=args.stream)
+            loaded = scheduler.load_all(books.rooms, books.companies, books.preferences)
+            if not loaded['rooms']:
+                raise SchedulerError(f"Ungültige Raumliste: {args.rooms}")
+            if not loaded['companies']:
+                raise SchedulerError(f"Ungültige Veranstaltungsliste: {args.companies}")
+            if not loaded['preferences']:
+                raise SchedulerError(f"Ungültige Wahlliste: {args.preferences}")
+
+            scheduler.generate_schedule()
+            if args.improve > 0:
+                scheduler.improve_schedule(time_budget=args.improve, seed=args.seed)
+            if args.snapshot:
+                scheduler.save_snapshot(args.snapshot, inputs)
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        written = [
+            scheduler.export_schedule(os.path.join(args.output_dir, "schedule.pdf")),
+            *_export_student_schedules(scheduler, args),
+            scheduler.export_attendance_lists(output_path=os.path.join(args.output_dir, "attendance_lists.pdf")),
+        ]
+    except (SchedulerError, OSError, ValueError, KeyError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+    print(scheduler.get_satisfaction_summary().overview_text())
+    for path in written:
+        print(f"Gespeichert: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
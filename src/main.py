@@ -2,12 +2,101 @@ import os
 from dotenv import load_dotenv
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from services.scheduler import SchedulerService
+from services.errors import SchedulerError
+from services.workbooks import WorkbookCache, read_preferences, read_companies, read_rooms, stream_preferences, read_all
+from services.export_cache import ExportCache
+from services.pdf_export import use_binary_streams
+from services.generation import GenerationJob
+from services.export_jobs import ExportQueue
+from services.preview import RowLayout, attendance_layout, column_positions, class_title, student_rows, schedule_rows, diff_rows
 
 load_dotenv()
 
+# preference workbooks from this size on are imported row by row
+STREAMING_IMPORT_BYTES = 2 * 1024 * 1024
+# how often the UI looks for progress of background work
+POLL_MS = 100
+# PDF exports: kind for SchedulerService.export_task -> label, file, progress unit
+PDF_EXPORTS = {
+    'schedule': ("Zeitplan", "schedule.pdf", "Seiten"),
+    'students': ("Schülerzeitpläne", "student_schedules.pdf", "Klassen"),
+    'attendance': ("Anwesenheitslisten", "attendance_lists.pdf", "Veranstaltungen"),
+}
+
+class VirtualRows:
+    """
+    Zeigt ein RowLayout auf einem tk.Canvas. Textelemente gibt es nur für
+    die sichtbaren Zeilen; beim Scrollen werden sie umgesetzt und neu
+    beschriftet statt neu erzeugt, ihre Anzahl hängt nur von der
+    Fensterhöhe ab. Die Spaltenpositionen richten sich nach dem längsten
+    Text jeder Spalte.
+    """
+
+    def __init__(self, canvas, scrollbar, fonts, color):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.columns = []               # x position per cell, from show()
+        self.fonts = fonts              # row style -> font
+        self.color = color
+        self._measures = {style: tkfont.Font(font=font).measure for style, font in fonts.items()}
+        self.layout = RowLayout()
+        self.pool = []                  # one list of text items per visible row
+        self._pending = False
+        canvas.configure(yscrollcommand=self._on_scroll)
+        canvas.bind('<Configure>', lambda event: self._schedule_refresh(), add='+')
+
+    def show(self, layout: RowLayout):
+        self.layout = layout
+        columns = column_positions(layout, lambda style, text: self._measures[style](text))
+        if len(columns) != len(self.columns):
+            for items in self.pool:
+                for item in items:
+                    self.canvas.delete(item)
+            self.pool = []
+        self.columns = columns
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), layout.height))
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        # several scroll events per frame, draw once
+        if not self._pending:
+            self._pending = True
+            self.canvas.after_idle(self.refresh)
+
+    def refresh(self):
+        self._pending = False
+        canvas = self.canvas
+        top = canvas.canvasy(0)
+        rows = self.layout.visible(top, top + canvas.winfo_height())
+        while len(self.pool) < len(rows):
+            self.pool.append([
+                canvas.create_text(x, 0, anchor='nw', fill=self.color, state='hidden')
+                for x in self.columns
+            ])
+        for items, index in zip(self.pool, rows):
+            row = self.layout.rows[index]
+            font = self.fonts[row.style]
+            for column, item in enumerate(items):
+                if column < len(row.cells):
+                    canvas.coords(item, self.columns[column], row.top + 2)
+                    canvas.itemconfigure(item, text=row.cells[column], font=font, state='normal')
+                else:
+                    canvas.itemconfigure(item, state='hidden')
+        for items in self.pool[len(rows):]:
+            for item in items:
+                canvas.itemconfigure(item, state='hidden')
+
+
 class RoomManagementApp:
     def __init__(self, root):
         self.root = root
@@ -135,10 +224,33 @@ class RoomManagementApp:
         # Load environment variables and setup import folder
         self.dev_mode = os.getenv('DEV_MODE', 'false').lower() == 'true'
         self.import_folder = os.getenv('IMPORT_FOLDER', 'import/')
+        # seconds of local search after each generation, 0 = off (default). The GUI
+        # runs a single annealing restart so it can cancel, unlike the parallel
+        # restarts of scheduler.improve_schedule without a checkpoint (CLI --improve).
+        try:
+            self.improve_seconds = max(0.0, float(os.getenv('IMPROVE_SECONDS', '0')))
+        except ValueError:
+            self.improve_seconds = 0.0
+        # running background generation, None when idle
+        self.generation = None
+        # import_all parses in a worker thread: (future, paths) while running, else None
+        self.import_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="import")
+        self.importing = None
+        # PDF exports rendering in background threads
+        self.exports = ExportQueue()
+        self.saved_exports = []
         
         # Create import folder if it doesn't exist
         if self.dev_mode and not os.path.exists(self.import_folder):
             os.makedirs(self.import_folder)
+
+        # parsed workbooks, keyed by file content
+        self.workbook_cache = WorkbookCache(os.path.join(self.import_folder, '.cache'))
+        # rendered PDF fragments, re-exports only draw changed classes / sessions
+        self.scheduler.export_cache = ExportCache(os.path.join(self.import_folder, '.cache', 'pdf'))
+        # imported files (rooms/companies/preferences -> path), snapshots are checked against them
+        self.input_files = {}
+        self.last_snapshot = os.path.join(self.import_folder, '.cache', 'last_schedule.npz')
         
         self.main_frame = ttk.Frame(self.root, padding="10")
         self.main_frame.grid(row=0, column=0, sticky="nsew")
@@ -147,6 +259,15 @@ class RoomManagementApp:
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.grid(row=0, column=0, sticky="nsew")
 
+        # status bar for background exports
+        self.status_frame = ttk.Frame(self.main_frame)
+        self.status_frame.grid(row=1, column=0, sticky="ew", pady=(5, 0))
+        self.export_progress = ttk.Progressbar(self.status_frame, mode="determinate", maximum=1.0, length=200)
+        self.export_progress.grid(row=0, column=0, padx=(0, 10))
+        self.export_progress.grid_remove()
+        self.status_label = ttk.Label(self.status_frame, text="", style="TLabel")
+        self.status_label.grid(row=0, column=1, sticky="w")
+
         # Import: Student wishes, Company list, Room list
         self.import_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.import_frame, text="Daten importieren")
@@ -191,9 +312,20 @@ class RoomManagementApp:
         self.import_sections.bind('<Configure>', self._on_frame_configure)
         self.import_canvas.bind_all("<MouseWheel>", lambda e: self._on_mousewheel(e, self.import_canvas))
 
+        # all three workbooks at once
+        load_all_frame = ttk.Frame(self.import_sections, style="Secondary.TFrame")
+        load_all_frame.grid(row=0, column=0, sticky="ew", pady=(0, 20))
+        self.import_all_button = ttk.Button(
+            load_all_frame,
+            text="Alle importieren",
+            command=self.import_all,
+            style="Action.TButton"
+        )
+        self.import_all_button.grid(row=0, column=0, pady=2, padx=(0, 10), sticky="w")
+
         # Student wishes section
         section_frame = ttk.Frame(self.import_sections, style="Secondary.TFrame")
-        section_frame.grid(row=0, column=0, sticky="nsew", pady=(0, 20))
+        section_frame.grid(row=1, column=0, sticky="nsew", pady=(0, 20))
         
         ttk.Label(
             section_frame,
@@ -242,7 +374,7 @@ class RoomManagementApp:
 
         # Company list section
         section_frame = ttk.Frame(self.import_sections, style="Secondary.TFrame")
-        section_frame.grid(row=1, column=0, sticky="nsew", pady=(0, 20))
+        section_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 20))
         
         ttk.Label(
             section_frame,
@@ -291,7 +423,7 @@ class RoomManagementApp:
 
         # Room list section
         section_frame = ttk.Frame(self.import_sections, style="Secondary.TFrame")
-        section_frame.grid(row=2, column=0, sticky="nsew")
+        section_frame.grid(row=3, column=0, sticky="nsew")
         
         ttk.Label(
             section_frame,
@@ -353,12 +485,13 @@ class RoomManagementApp:
         self.schedule_controls = ttk.Frame(self.schedule_frame)
         self.schedule_controls.grid(row=0, column=0, sticky="ew", padx=15, pady=(15,5))
         
-        ttk.Button(
+        self.generate_button = ttk.Button(
             self.schedule_controls,
             text="Zeitplan generieren",
             command=self.generate_schedule,
             style="Action.TButton"
-        ).grid(row=0, column=0, padx=5)
+        )
+        self.generate_button.grid(row=0, column=0, padx=5)
         
         ttk.Button(
             self.schedule_controls,
@@ -366,6 +499,47 @@ class RoomManagementApp:
             command=self.export_schedule,
             style="Action.TButton"
         ).grid(row=0, column=1, padx=5)
+
+        ttk.Button(
+            self.schedule_controls,
+            text="Alle PDFs exportieren",
+            command=self.export_all,
+            style="Action.TButton"
+        ).grid(row=0, column=2, padx=5)
+
+        ttk.Button(
+            self.schedule_controls,
+            text="Sitzung speichern",
+            command=self.save_session,
+            style="Action.TButton"
+        ).grid(row=0, column=3, padx=5)
+
+        ttk.Button(
+            self.schedule_controls,
+            text="Sitzung laden",
+            command=self.load_session,
+            style="Action.TButton"
+        ).grid(row=0, column=4, padx=5)
+
+        # progress of a running generation, hidden while idle
+        self.generation_progress = ttk.Progressbar(
+            self.schedule_controls,
+            mode="determinate",
+            maximum=1.0,
+            length=200
+        )
+        self.generation_progress.grid(row=0, column=5, padx=(20, 5))
+        self.generation_status = ttk.Label(self.schedule_controls, text="", style="TLabel")
+        self.generation_status.grid(row=0, column=6, padx=5)
+        self.cancel_button = ttk.Button(
+            self.schedule_controls,
+            text="Abbrechen",
+            command=self.cancel_generation,
+            style="Action.TButton"
+        )
+        self.cancel_button.grid(row=0, column=7, padx=5)
+        for widget in (self.generation_progress, self.generation_status, self.cancel_button):
+            widget.grid_remove()
         
         # Schedule display frame with scrollbar
         self.schedule_frame_inner = ttk.Frame(self.schedule_frame)
@@ -381,6 +555,9 @@ class RoomManagementApp:
             style="Schedule.Treeview"
         )
         self.schedule_tree.grid(row=0, column=0, sticky="nsew")
+        # what the tree currently shows: slots of the columns, values per company iid
+        self.schedule_columns = None
+        self.schedule_rows = {}
         
         self.schedule_scrollbar.config(command=self.schedule_tree.yview)
         
@@ -405,21 +582,30 @@ class RoomManagementApp:
         ttk.Button(self.student_schedules_frame, text="Vorschau", command=self.preview_student_schedules).grid(row=0, column=0, pady=5, padx=5)
         ttk.Button(self.student_schedules_frame, text="Als PDF exportieren", command=self.export_student_schedules).grid(row=0, column=1, pady=5, padx=5)
         
-        # canvas and scrollbar for the preview
-        self.student_preview_canvas = tk.Canvas(self.student_schedules_frame)
-        self.student_preview_scrollbar = ttk.Scrollbar(self.student_schedules_frame, orient="vertical", command=self.student_preview_canvas.yview)
-        self.student_preview_frame = ttk.Frame(self.student_preview_canvas)
-        
-        self.student_preview_canvas.configure(yscrollcommand=self.student_preview_scrollbar.set)
-        
-        # Bind mouse wheel for student preview
-        self.student_preview_canvas.bind_all("<MouseWheel>", lambda e: self._on_mousewheel(e, self.student_preview_canvas))
-        
-        self.student_preview_canvas.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
-        self.student_preview_scrollbar.grid(row=1, column=2, sticky="ns")
-        self.student_preview_canvas.create_window((0, 0), window=self.student_preview_frame, anchor="nw")
+        self.student_preview_summary = ttk.Label(self.student_schedules_frame, text="", style="TLabel")
+        self.student_preview_summary.grid(row=1, column=0, columnspan=2, sticky="w", padx=5)
+
+        # one tree: classes collapsed, students are inserted when a class is opened
+        self.student_preview_tree = ttk.Treeview(
+            self.student_schedules_frame,
+            columns=['Zeit', 'Unternehmen', 'Raum', 'Wunsch'],
+            style="Treeview"
+        )
+        self.student_preview_tree.heading('#0', text='Klasse / Schüler:in', anchor=tk.W)
+        self.student_preview_tree.column('#0', width=380, anchor=tk.W)
+        for col, width in (('Zeit', 140), ('Unternehmen', 250), ('Raum', 80), ('Wunsch', 70)):
+            self.student_preview_tree.heading(col, text=col, anchor=tk.W)
+            self.student_preview_tree.column(col, width=width, anchor=tk.W)
+        self.student_preview_scrollbar = ttk.Scrollbar(self.student_schedules_frame, orient="vertical", command=self.student_preview_tree.yview)
+        self.student_preview_tree.configure(yscrollcommand=self.student_preview_scrollbar.set)
+        self.student_preview_tree.bind('<<TreeviewOpen>>', self._fill_student_class)
+        # class node iid -> students not yet inserted
+        self.student_preview_pending = {}
+
+        self.student_preview_tree.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+        self.student_preview_scrollbar.grid(row=2, column=2, sticky="ns")
         
-        self.student_schedules_frame.rowconfigure(1, weight=1)
+        self.student_schedules_frame.rowconfigure(2, weight=1)
         self.student_schedules_frame.columnconfigure(0, weight=1)
         self.student_schedules_frame.columnconfigure(1, weight=1)
         
@@ -430,19 +616,28 @@ class RoomManagementApp:
         ttk.Button(self.attendance_lists_frame, text="Vorschau", command=self.preview_attendance_lists).grid(row=0, column=0, pady=5, padx=5)
         ttk.Button(self.attendance_lists_frame, text="Als PDF exportieren", command=self.export_attendance_lists).grid(row=0, column=1, pady=5, padx=5)
         
-        # canvas and scrollbar for the preview
-        self.attendance_preview_canvas = tk.Canvas(self.attendance_lists_frame)
+        # canvas and scrollbar for the preview, only visible rows get text items
+        self.attendance_preview_canvas = tk.Canvas(
+            self.attendance_lists_frame, background=self.colors['bg'], highlightthickness=0
+        )
         self.attendance_preview_scrollbar = ttk.Scrollbar(self.attendance_lists_frame, orient="vertical", command=self.attendance_preview_canvas.yview)
-        self.attendance_preview_frame = ttk.Frame(self.attendance_preview_canvas)
-        
-        self.attendance_preview_canvas.configure(yscrollcommand=self.attendance_preview_scrollbar.set)
+        self.attendance_preview = VirtualRows(
+            self.attendance_preview_canvas,
+            self.attendance_preview_scrollbar,
+            fonts={
+                'title': ("Helvetica", 10, "bold"),
+                'header': ("Helvetica", 10, "bold"),
+                'text': ("Helvetica", 10),
+                'cell': ("Helvetica", 10),
+            },
+            color=self.colors['fg']
+        )
         
         # Bind mouse wheel for attendance preview
         self.attendance_preview_canvas.bind_all("<MouseWheel>", lambda e: self._on_mousewheel(e, self.attendance_preview_canvas))
         
         self.attendance_preview_canvas.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
         self.attendance_preview_scrollbar.grid(row=1, column=2, sticky="ns")
-        self.attendance_preview_canvas.create_window((0, 0), window=self.attendance_preview_frame, anchor="nw")
         
         self.attendance_lists_frame.rowconfigure(1, weight=1)
         self.attendance_lists_frame.columnconfigure(0, weight=1)
@@ -458,6 +653,10 @@ class RoomManagementApp:
         self.main_frame.columnconfigure(0, weight=1)
         self.main_frame.rowconfigure(0, weight=1)
 
+        # dev mode: configured workbooks are loaded right after startup
+        if self.dev_mode and all(os.getenv(key) for key in ('ROOM_LIST', 'COMPANY_LIST', 'STUDENT_PREFERENCES')):
+            self.root.after_idle(self._startup_import)
+
     def setup_preview_tree(self, tree, columns):
         tree['columns'] = columns
         tree.column('#0', width=0, stretch=tk.NO)
@@ -493,427 +692,347 @@ class RoomManagementApp:
         file_path = self.get_import_file('STUDENT_PREFERENCES', "Import Student Preferences")
         if file_path:
             try:
-                df = pd.read_excel(file_path)
-                df.columns = df.columns.str.strip()
-                if self.scheduler.load_student_preferences(df):
-                    self.preferences_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
-                    cols = ['Klasse', 'Name', 'Vorname'] + [f'Wahl {i}' for i in range(1, 7)]
-                    self.setup_preview_tree(self.preferences_preview, cols)
-                    self.update_preview(self.preferences_preview, df, cols)
+                if os.path.getsize(file_path) >= STREAMING_IMPORT_BYTES:
+                    # district-wide sheets: stream rows with bounded memory
+                    prefs, df = stream_preferences(file_path, progress=self._show_import_progress)
                 else:
-                    self.preferences_status.config(text="Ungültiges Format", foreground="red")
+                    df = read_preferences(file_path, self.workbook_cache)
+                    prefs = df
+                if self.scheduler.get_schedule():
+                    # late changes: keep the schedule, only affected students are reassigned
+                    delta = self.scheduler.reimport_student_preferences(prefs)
+                    self._show_preferences(file_path, df, delta is not None)
+                    if delta is not None:
+                        self.update_schedule_display()
+                        messagebox.showinfo("Wahlliste aktualisiert", delta.summary_text())
+                    return
+                if isinstance(prefs, pd.DataFrame):
+                    loaded = self.scheduler.load_student_preferences(prefs)
+                else:
+                    loaded = self.scheduler.load_student_matrix(prefs)
+                self._show_preferences(file_path, df, loaded)
             except Exception as e:
                 self.preferences_status.config(text=f"Error: {str(e)}", foreground="red")
 
+    def _show_preferences(self, file_path, df, loaded):
+        if loaded:
+            self.input_files['preferences'] = file_path
+            self.preferences_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
+            cols = ['Klasse', 'Name', 'Vorname'] + [f'Wahl {i}' for i in range(1, 7)]
+            self.setup_preview_tree(self.preferences_preview, cols)
+            self.update_preview(self.preferences_preview, df, cols)
+        else:
+            self.preferences_status.config(text="Ungültiges Format", foreground="red")
+
+    def _show_import_progress(self, done, total):
+        text = f"{done} / {total} Zeilen" if total else f"{done} Zeilen"
+        self.preferences_status.config(text=f"Importiere... {text}", foreground=self.colors['fg'])
+        self.root.update_idletasks()
+
     def import_companies(self):
         file_path = self.get_import_file('COMPANY_LIST', "Import Company List")
         if file_path:
             try:
-                df = pd.read_excel(file_path)
-                df.columns = df.columns.str.strip()
-                if self.scheduler.load_companies(df):
-                    self.companies_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
-                    cols = ['Unternehmen', 'Fachrichtung', 'Max. Teilnehmer', 'Max. Veranstaltungen', 'Frühester Zeitpunkt']
-                    self.setup_preview_tree(self.companies_preview, cols)
-                    self.update_preview(self.companies_preview, df, cols)
-                else:
-                    self.companies_status.config(text="Ungültiges Format", foreground="red")
+                df = read_companies(file_path, self.workbook_cache)
+                self._show_companies(file_path, df, self.scheduler.load_companies(df))
             except Exception as e:
                 self.companies_status.config(text=f"Error: {str(e)}", foreground="red")
 
+    def _show_companies(self, file_path, df, loaded):
+        if loaded:
+            self.input_files['companies'] = file_path
+            self.companies_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
+            cols = ['Unternehmen', 'Fachrichtung', 'Max. Teilnehmer', 'Max. Veranstaltungen', 'Frühester Zeitpunkt']
+            self.setup_preview_tree(self.companies_preview, cols)
+            self.update_preview(self.companies_preview, df, cols)
+        else:
+            self.companies_status.config(text="Ungültiges Format", foreground="red")
+
     def import_rooms(self):
         file_path = self.get_import_file('ROOM_LIST', "Import Room List")
         if file_path:
             try:
-                df = pd.read_excel(file_path, header=None)
-                if self.scheduler.load_rooms(df):
-                    self.rooms_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
-                    self.setup_preview_tree(self.rooms_preview, ['Raum'])
-                    self.update_preview(self.rooms_preview, df.rename(columns={df.columns[0]: 'Raum'}), ['Raum'])
-                else:
-                    self.rooms_status.config(text="Ungültiges Format", foreground="red")
+                df = read_rooms(file_path, self.workbook_cache)
+                self._show_rooms(file_path, df, self.scheduler.load_rooms(df))
             except Exception as e:
                 self.rooms_status.config(text=f"Error: {str(e)}", foreground="red")
 
+    def _show_rooms(self, file_path, df, loaded):
+        if loaded:
+            self.input_files['rooms'] = file_path
+            self.rooms_status.config(text=f"Imported: {os.path.basename(file_path)}", foreground="green")
+            self.setup_preview_tree(self.rooms_preview, ['Raum'])
+            self.update_preview(self.rooms_preview, df.rename(columns={df.columns[0]: 'Raum'}), ['Raum'])
+        else:
+            self.rooms_status.config(text="Ungültiges Format", foreground="red")
+
+    def _startup_import(self):
+        # the last generated schedule is reused while the input files are unchanged
+        inputs = {
+            name: os.path.normpath(os.path.join(self.import_folder, os.getenv(key)))
+            for name, key in (('rooms', 'ROOM_LIST'), ('companies', 'COMPANY_LIST'), ('preferences', 'STUDENT_PREFERENCES'))
+        }
+        if os.path.exists(self.last_snapshot) and all(os.path.exists(path) for path in inputs.values()):
+            if self._restore_snapshot(self.last_snapshot, inputs):
+                return
+        self.import_all()
+
+    def import_all(self):
+        if self.importing is not None:
+            return
+        # pick all files first, then parse them in the background
+        paths = [
+            self.get_import_file('ROOM_LIST', "Import Room List"),
+            self.get_import_file('COMPANY_LIST', "Import Company List"),
+            self.get_import_file('STUDENT_PREFERENCES', "Import Student Preferences"),
+        ]
+        if not all(paths):
+            return
+        rooms_path, companies_path, preferences_path = paths
+        for status in (self.rooms_status, self.companies_status, self.preferences_status):
+            status.config(text="Importiere...", foreground=self.colors['fg'])
+        future = self.import_worker.submit(
+            read_all, rooms_path, companies_path, preferences_path, self.workbook_cache,
+            stream=os.path.getsize(preferences_path) >= STREAMING_IMPORT_BYTES
+        )
+        self.importing = (future, paths)
+        self.import_all_button.state(['disabled'])
+        self.root.after(POLL_MS, self._poll_import)
+
+    def _poll_import(self):
+        future, (rooms_path, companies_path, preferences_path) = self.importing
+        if not future.done():
+            self.root.after(POLL_MS, self._poll_import)
+            return
+
+        self.importing = None
+        self.import_all_button.state(['!disabled'])
+        try:
+            books = future.result()
+        except Exception as e:
+            for status in (self.rooms_status, self.companies_status, self.preferences_status):
+                status.config(text=f"Error: {str(e)}", foreground="red")
+            return
+        loaded = self.scheduler.load_all(books.rooms, books.companies, books.preferences)
+        self._show_rooms(rooms_path, books.rooms, loaded['rooms'])
+        self._show_companies(companies_path, books.companies, loaded['companies'])
+        self._show_preferences(preferences_path, books.preferences_preview, loaded['preferences'])
+
     def generate_schedule(self):
+        if self.generation is not None:
+            return
         if not self.scheduler.is_data_loaded():
             messagebox.showerror("Fehler", "Bitte alle erforderlichen Daten importieren!")
             return
-        if self.scheduler.generate_schedule():
-            self.update_schedule_display()
-            messagebox.showinfo("Erfolg", "Zeitplan erfolgreich generiert!")
+        # runs on a copy in a worker thread, the window stays responsive
+        self.generation = GenerationJob(self.scheduler, self.improve_seconds).start()
+        self.generate_button.state(['disabled'])
+        self.generation_progress['value'] = 0
+        self.generation_status.config(text="")
+        for widget in (self.generation_progress, self.generation_status, self.cancel_button):
+            widget.grid()
+        self.root.after(POLL_MS, self._poll_generation)
+
+    def cancel_generation(self):
+        if self.generation is not None:
+            self.generation.cancel()
+            self.generation_status.config(text="Wird abgebrochen...")
+
+    def _poll_generation(self):
+        job = self.generation
+        # check before draining, so the final event is not missed
+        finished = job.done()
+        for fraction, text in job.poll():
+            self.generation_progress['value'] = fraction
+            self.generation_status.config(text=text)
+        if not finished:
+            self.root.after(POLL_MS, self._poll_generation)
+            return
+
+        self.generation = None
+        self.generate_button.state(['!disabled'])
+        for widget in (self.generation_progress, self.generation_status, self.cancel_button):
+            widget.grid_remove()
+        if job.error is not None:
+            messagebox.showerror("Fehler", f"Zeitplan konnte nicht generiert werden. Bitte prüfen Sie Ihre Daten und Zeitslots.\n\n{job.error}")
+            return
+        result = job.result()
+        if result is None:
+            messagebox.showwarning("Zeitplan verworfen", "Die Daten wurden während der Generierung neu importiert. Bitte erneut generieren.")
+            return
+        self.scheduler = result
+        self.update_schedule_display()
+        try:
+            # next start can skip import and generation
+            self.scheduler.save_snapshot(self.last_snapshot, self.input_files)
+        except SchedulerError:
+            pass
+        if job.cancelled:
+            messagebox.showinfo("Abgebrochen", "Generierung abgebrochen, der beste bisher gefundene Zeitplan wurde übernommen.")
         else:
-            messagebox.showerror("Fehler", "Zeitplan konnte nicht generiert werden. Bitte prüfen Sie Ihre Daten und Zeitslots.")
+            messagebox.showinfo("Erfolg", "Zeitplan erfolgreich generiert!")
+
+    def save_session(self):
+        if not self.scheduler.get_schedule():
+            messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Sitzung speichern",
+            defaultextension=".npz",
+            filetypes=[("Zeitplan-Sitzung", "*.npz")]
+        )
+        if not file_path:
+            return
+        try:
+            self.scheduler.save_snapshot(file_path, self.input_files)
+        except SchedulerError as e:
+            messagebox.showerror("Fehler", str(e))
+
+    def load_session(self):
+        file_path = filedialog.askopenfilename(
+            title="Sitzung laden",
+            filetypes=[("Zeitplan-Sitzung", "*.npz")]
+        )
+        if file_path:
+            # checked against the files imported in this session
+            self._restore_snapshot(file_path, dict(self.input_files), quiet=False)
+
+    def _restore_snapshot(self, file_path, inputs=None, quiet=True) -> bool:
+        try:
+            self.scheduler.load_snapshot(file_path, inputs)
+        except SchedulerError as e:
+            if not quiet:
+                messagebox.showerror("Fehler", f"Sitzung konnte nicht geladen werden.\n\n{e}")
+            return False
+        if inputs:
+            self.input_files = dict(inputs)
+        name = os.path.basename(file_path)
+        for status in (self.rooms_status, self.companies_status, self.preferences_status):
+            status.config(text=f"Aus Sitzung: {name}", foreground="green")
+        self.update_schedule_display()
+        return True
 
     def update_schedule_display(self):
-        for item in self.schedule_tree.get_children():
-            self.schedule_tree.delete(item)
-        
-        time_slots = [
-            ('A', '8:45 – 9:30'),
-            ('B', '9:50 – 10:35'),
-            ('C', '10:35 – 11:20'),
-            ('D', '11:40 – 12:25'),
-            ('E', '12:25 – 13:10')
-        ]
-        self.scheduler.time_slots = time_slots
+        """Überträgt nur geänderte Zellen in die Zeitplanansicht, Zeilen behalten ihre iid."""
+        tree = self.schedule_tree
+        time_slots = list(self.scheduler.time_slots)
+        if time_slots != self.schedule_columns:
+            self._setup_schedule_columns(time_slots)
+
+        rows = schedule_rows(self.scheduler.companies, self.scheduler.schedule, time_slots)
+        removed, added, changed = diff_rows(self.schedule_rows, rows)
+        if removed:
+            tree.delete(*removed)
+        for position, iid in added:
+            tree.insert('', position, iid=iid, values=rows[iid])
+        columns = tree['columns']
+        for iid, column, text in changed:
+            tree.set(iid, columns[column], text)
+        self.schedule_rows = rows
+
+    def _setup_schedule_columns(self, time_slots):
+        tree = self.schedule_tree
+        tree.delete(*tree.get_children())
+        self.schedule_rows = {}
 
         columns = ['Company'] + [slot for slot, _ in time_slots]
-        self.schedule_tree['columns'] = columns
-        self.schedule_tree.column('#0', width=0, stretch=tk.NO)
-        self.schedule_tree.column('Company', anchor=tk.W, width=250)
-        self.schedule_tree.heading('Company', text='Unternehmen', anchor=tk.W)
-        
-        for col in columns:
-            self.schedule_tree.column(col, anchor=tk.W, width=150)  
-            if col == 'Company':
-                self.schedule_tree.heading(col, text='Unternehmen', anchor=tk.W)
-            else:
-                time_range = dict(time_slots).get(col, '')
-                self.schedule_tree.heading(col, text=f"{col} ({time_range})", anchor=tk.W)
-
-        for company in self.scheduler.companies:
-            row = [company.name]
-            for slot_idx, (slot_letter, time_range) in enumerate(time_slots):
-                if slot_idx < company.earliest_slot:
-                    text = ""
-                else:
-                    session = self.scheduler.schedule.get((company.name, slot_idx))
-                    if session:
-                        count = len(session.students)
-                        text = f"Raum: {session.room}"
-                        if count > 0:
-                            text += f"\n({count} Schü{'' if count == 1 else 'ler:innen'})"
-                    else:
-                        text = ""
-                row.append(text)
-            self.schedule_tree.insert('', tk.END, values=row)
+        tree['columns'] = columns
+        tree.column('#0', width=0, stretch=tk.NO)
+        tree.column('Company', anchor=tk.W, width=250)
+        tree.heading('Company', text='Unternehmen', anchor=tk.W)
+        for slot, time_range in time_slots:
+            tree.column(slot, anchor=tk.W, width=150)
+            tree.heading(slot, text=f"{slot} ({time_range})", anchor=tk.W)
+        self.schedule_columns = time_slots
 
     def export_student_schedules(self):
-        if not self.scheduler.get_schedule():
-            messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
-            return
-        self.scheduler.export_student_schedules()
+        self._start_exports(['students'])
 
     def export_attendance_lists(self):
+        self._start_exports(['attendance'])
+
+    def export_all(self):
+        self._start_exports(list(PDF_EXPORTS))
+
+    def _start_exports(self, kinds):
         if not self.scheduler.get_schedule():
             messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
             return
-        self.scheduler.export_attendance_lists(preview_mode=False)
+        idle = not self.exports.jobs
+        for kind in kinds:
+            label, file_name, unit = PDF_EXPORTS[kind]
+            try:
+                # data is collected here, rendering runs in the background
+                self.exports.submit(label, self.scheduler.export_task(kind, file_name), file_name, unit)
+            except SchedulerError as e:
+                messagebox.showerror("Export Fehler", str(e))
+        if idle and self.exports.jobs:
+            self.saved_exports = []
+            self.export_progress.grid()
+            self.root.after(POLL_MS, self._poll_exports)
+        self._show_export_status()
+
+    def _poll_exports(self):
+        for job in self.exports.poll():
+            try:
+                job.future.result()
+                self.saved_exports.append(os.path.basename(job.output_path))
+            except SchedulerError as e:
+                messagebox.showerror("Export Fehler", str(e))
+        self._show_export_status()
+        if self.exports.jobs:
+            self.root.after(POLL_MS, self._poll_exports)
+        else:
+            self.export_progress.grid_remove()
+
+    def _show_export_status(self):
+        if self.exports.jobs:
+            self.export_progress['value'] = self.exports.fraction()
+            self.status_label.config(text=self.exports.status_text())
+        elif self.saved_exports:
+            self.status_label.config(text="Gespeichert: " + ", ".join(self.saved_exports))
 
     def preview_student_schedules(self):
         if not self.scheduler.get_schedule():
             messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
             return
 
-        # Clear previous preview
-        for widget in self.student_preview_frame.winfo_children():
-            widget.destroy()
-
-        # Group students by class
-        class_schedules = {}
-        for student in self.scheduler.student_preferences:
-            class_name = student.student_id.split('_')[0]
-            if class_name not in class_schedules:
-                class_schedules[class_name] = []
-            
-            # Collect all appointments for this student
-            student_schedule = []
-            realized_wishes = []
-            for slot_idx, (slot_letter, time_range) in enumerate(self.scheduler.time_slots):
-                session_found = False
-                for wish_idx, wish in enumerate(student.wishes):
-                    key = (str(wish).strip(), slot_idx)
-                    if key in self.scheduler.schedule:
-                        session = self.scheduler.schedule[key]
-                        if any(s['id'] == student.student_id for s in session.students):
-                            student_schedule.append({
-                                'time': f"{slot_letter} ({time_range})",
-                                'company': str(wish).strip(),
-                                'room': session.room,
-                                'wish_number': wish_idx + 1
-                            })
-                            realized_wishes.append(True)
-                            session_found = True
-                            break
-                if not session_found:
-                    realized_wishes.append(False)
-            
-            satisfaction_score = student.get_satisfaction_score(realized_wishes)
-            class_schedules[class_name].append({
-                'name': student.name,
-                'schedule': sorted(student_schedule, key=lambda x: x['time']),
-                'score': satisfaction_score
-            })
-
-        # Create preview for each class
-        row = 0
-        style = ttk.Style()
-        style.configure("Preview.TLabel", font=("Helvetica", 10))
-        style.configure("PreviewHeader.TLabel", font=("Helvetica", 10, "bold"))
+        tree = self.student_preview_tree
+        tree.delete(*tree.get_children())
+        self.student_preview_pending = {}
 
+        class_schedules = self.scheduler.get_student_schedules()
+        summary = self.scheduler.get_satisfaction_summary()
+        class_stats = summary.class_stats()
+        self.student_preview_summary.config(text=summary.overview_text())
+
+        # only the class nodes now, each with a placeholder so it can be opened
         for class_name, students in sorted(class_schedules.items()):
-            ttk.Label(
-                self.student_preview_frame,
-                text=f"Klasse {class_name}",
-                style="PreviewHeader.TLabel"
-            ).grid(row=row, column=0, columnspan=4, pady=(20, 10), sticky="w")
-            row += 1
-
-            for student in students:
-                # Student header
-                ttk.Label(
-                    self.student_preview_frame,
-                    text=f"{student['name']} - Bewertung: {student['score']:.1f}%",
-                    style="PreviewHeader.TLabel"
-                ).grid(row=row, column=0, columnspan=4, pady=(10, 5), sticky="w")
-                row += 1
-
-                # Schedule headers
-                for col, header in enumerate(['Zeit', 'Unternehmen', 'Raum', 'Wunsch']):
-                    ttk.Label(
-                        self.student_preview_frame,
-                        text=header,
-                        style="PreviewHeader.TLabel"
-                    ).grid(row=row, column=col, padx=5, pady=2, sticky="w")
-                row += 1
-
-                # Schedule rows
-                for appointment in student['schedule']:
-                    ttk.Label(
-                        self.student_preview_frame,
-                        text=appointment['time'],
-                        style="Preview.TLabel"
-                    ).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                    ttk.Label(
-                        self.student_preview_frame,
-                        text=appointment['company'],
-                        style="Preview.TLabel"
-                    ).grid(row=row, column=1, padx=5, pady=2, sticky="w")
-                    ttk.Label(
-                        self.student_preview_frame,
-                        text=appointment['room'],
-                        style="Preview.TLabel"
-                    ).grid(row=row, column=2, padx=5, pady=2, sticky="w")
-                    ttk.Label(
-                        self.student_preview_frame,
-                        text=str(appointment['wish_number']),
-                        style="Preview.TLabel"
-                    ).grid(row=row, column=3, padx=5, pady=2, sticky="w")
-                    row += 1
-
-        # Update canvas scroll region
-        self.student_preview_frame.update_idletasks()
-        self.student_preview_canvas.configure(
-            scrollregion=self.student_preview_canvas.bbox("all")
-        )
+            iid = tree.insert('', tk.END, text=class_title(class_name, class_stats[class_name]), open=False)
+            tree.insert(iid, tk.END, text="...")
+            self.student_preview_pending[iid] = students
+
+    def _fill_student_class(self, event):
+        tree = self.student_preview_tree
+        iid = tree.focus()
+        students = self.student_preview_pending.pop(iid, None)
+        if students is None:
+            return
+        tree.delete(*tree.get_children(iid))
+        for student_id, title, appointments in student_rows(students):
+            node = tree.insert(iid, tk.END, iid=student_id, text=title, open=True)
+            for values in appointments:
+                tree.insert(node, tk.END, values=values)
 
     def preview_attendance_lists(self):
         if not self.scheduler.get_schedule():
             messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
             return
-
-        # Clear previous preview
-        for widget in self.attendance_preview_frame.winfo_children():
-            widget.destroy()
-        
-        # Sort sessions by company name and time slot
-        sorted_sessions = sorted(
-            self.scheduler.schedule.items(),
-            key=lambda x: (x[0][0], x[0][1])  # Sort by company name, then slot
-        )
-        
-        # Get unique company names and limit to first 6
-        company_names = list(set(company_name for (company_name, _), _ in sorted_sessions))
-        if len(company_names) > 6:
-            company_names = company_names[:6]
-            
-        # Filter sessions to only include these companies
-        sorted_sessions = [(key, session) for (key, session) in sorted_sessions 
-                          if key[0] in company_names]
-
-        # Create preview for each session
-        row = 0
-        style = ttk.Style()
-        style.configure("Preview.TLabel", font=("Helvetica", 10))
-        style.configure("PreviewHeader.TLabel", font=("Helvetica", 10, "bold"))
-
-        for (company_name, slot_idx), session in sorted_sessions:
-            # Session header
-            ttk.Label(
-                self.attendance_preview_frame,
-                text=f"{company_name}",
-                style="PreviewHeader.TLabel"
-            ).grid(row=row, column=0, columnspan=4, pady=(20, 5), sticky="w")
-            row += 1
-
-            ttk.Label(
-                self.attendance_preview_frame,
-                text=f"Zeitfenster: {session.time_slot} ({session.time_range})",
-                style="Preview.TLabel"
-            ).grid(row=row, column=0, columnspan=4, pady=2, sticky="w")
-            row += 1
-
-            ttk.Label(
-                self.attendance_preview_frame,
-                text=f"Raum: {session.room}",
-                style="Preview.TLabel"
-            ).grid(row=row, column=0, columnspan=4, pady=(2, 10), sticky="w")
-            row += 1
-
-            # Attendance list headers
-            for col, header in enumerate(['Nr.', 'Name', 'Klasse', 'Unterschrift']):
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text=header,
-                    style="PreviewHeader.TLabel"
-                ).grid(row=row, column=col, padx=5, pady=2, sticky="w")
-            row += 1
-
-            # Attendee rows
-            for i, student in enumerate(sorted(session.students, key=lambda x: x['name']), 1):
-                class_name = student['id'].split('_')[0]
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text=str(i),
-                    style="Preview.TLabel"
-                ).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text=student['name'],
-                    style="Preview.TLabel"
-                ).grid(row=row, column=1, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text=class_name,
-                    style="Preview.TLabel"
-                ).grid(row=row, column=2, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text="________________",
-                    style="Preview.TLabel"
-                ).grid(row=row, column=3, padx=5, pady=2, sticky="w")
-                row += 1
-
-            # Add empty signature lines
-            for i in range(5):
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text=str(len(session.students) + i + 1),
-                    style="Preview.TLabel"
-                ).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text="",
-                    style="Preview.TLabel"
-                ).grid(row=row, column=1, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text="",
-                    style="Preview.TLabel"
-                ).grid(row=row, column=2, padx=5, pady=2, sticky="w")
-                ttk.Label(
-                    self.attendance_preview_frame,
-                    text="________________",
-                    style="Preview.TLabel"
-                ).grid(row=row, column=3, padx=5, pady=2, sticky="w")
-                row += 1
-
-        # Update canvas scroll region
-        self.attendance_preview_frame.update_idletasks()
-        self.attendance_preview_canvas.configure(
-            scrollregion=self.attendance_preview_canvas.bbox("all")
-        )
+        # all sessions, the canvas only draws the rows in view
+        self.attendance_preview.show(attendance_layout(self.scheduler.attendance_sessions()))
 
     def export_schedule(self):
-        if not self.scheduler.get_schedule():
-            messagebox.showerror("Fehler", "Bitte erst den Zeitplan generieren!")
-            return
-            
-        try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import mm
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-            
-            # Create PDF
-            doc = SimpleDocTemplate(
-                "schedule.pdf",
-                pagesize=landscape(A4),
-                rightMargin=10*mm,
-                leftMargin=10*mm,
-                topMargin=10*mm,
-                bottomMargin=10*mm
-            )
-            
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Add title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=20
-            )
-            story.append(Paragraph("Zeitplan Übersicht", title_style))
-            
-            # Prepare table data
-            time_slots = self.scheduler.time_slots
-            headers = ['Unternehmen'] + [f"{slot} ({time})" for slot, time in time_slots]
-            table_data = [headers]
-            
-            for company in self.scheduler.companies:
-                row = [company.name]
-                for slot_idx, _ in enumerate(time_slots):
-                    if slot_idx < company.earliest_slot:
-                        text = "---"
-                    else:
-                        session = self.scheduler.schedule.get((company.name, slot_idx))
-                        if session:
-                            count = len(session.students)
-                            text = f"Raum {session.room}\n({count} TN)"
-                        else:
-                            text = "---"
-                    row.append(text)
-                table_data.append(row)
-            
-            # Create and style the table
-            col_widths = [40*mm] + [30*mm] * len(time_slots)
-            t = Table(table_data, colWidths=col_widths, repeatRows=1)
-            t.setStyle(TableStyle([
-                ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-                ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0,0), (-1,0), 10),
-                ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                ('TEXTCOLOR', (0,1), (-1,-1), colors.black),
-                ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-                ('FONTSIZE', (0,1), (-1,-1), 9),
-                ('ALIGN', (0,1), (-1,-1), 'CENTER'),
-                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
-                ('BOX', (0,0), (-1,-1), 2, colors.black),
-                ('LINEBELOW', (0,0), (-1,0), 2, colors.black),
-            ]))
-            
-            story.append(t)
-            doc.build(story)
-            
-            messagebox.showinfo(
-                "Export erfolgreich",
-                "Zeitplan wurde als schedule.pdf gespeichert."
-            )
-            
-        except Exception as e:
-            messagebox.showerror(
-                "Export Fehler",
-                f"Fehler beim Exportieren des Zeitplans: {str(e)}"
-            )
+        self._start_exports(['schedule'])
 
     def _on_mousewheel(self, event, canvas):
         canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
@@ -932,6 +1051,7 @@ class RoomManagementApp:
         )
 
 if __name__ == "__main__":
+    use_binary_streams()
     root = tk.Tk()
     app = RoomManagementApp(root)
     root.mainloop()
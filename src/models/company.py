@@ -1,43 +1,120 @@
 from dataclasses import dataclass
-from typing import List
+from collections.abc import MutableMapping
+from typing import List, Dict, Optional, Sequence, Tuple, Iterator
+import numpy as np
 import pandas as pd
 # not working yet
 @dataclass
 class Company:
     name: str
-    capacity: int            
-    max_sessions: int        
-    earliest_slot: int       
-    blocked_slots: List[int] 
+    capacity: int
+    max_sessions: int
+    earliest_slot: int
+    blocked_slots: List[int]
+    company_id: int = -1
 
     @classmethod
-    def from_dataframe(cls, df: pd.DataFrame) -> List['Company']:
-        companies = []
-        for _, row in df.iterrows():
-            # strip extra spaces
-            comp_name = str(row['Unternehmen']).strip()
-            fachrichtung = row['Fachrichtung']
-            max_teilnehmer = int(row['Max. Teilnehmer'])
-            max_veranstaltungen = int(row['Max. Veranstaltungen'])
-            if pd.isna(row['Frühester Zeitpunkt']):
-                earliest = 0
-            else:
-                earliest = ord(str(row['Frühester Zeitpunkt']).strip().upper()[0]) - ord('A')
-            companies.append(cls(
-                name=comp_name,
-                capacity=max_teilnehmer,
-                max_sessions=max_veranstaltungen,
-                earliest_slot=earliest,
-                blocked_slots=list(range(earliest))
-            ))
-        return companies
+    def from_dataframe(cls, df: pd.DataFrame) -> 'CompanyTable':
+        return CompanyTable.from_dataframe(df)
+
+
+class CompanyTable(Sequence):
+    """
+    Spaltenbasierte Unternehmensliste mit ganzzahligen IDs (= Zeilenindex).
+    blocked_mask enthält die gesperrten Slots als Bitmaske (Bit i = Slot i).
+    Die Company-Objekte werden erst beim Zugriff erzeugt.
+    """
+
+    def __init__(self, names: np.ndarray, capacity: np.ndarray, max_sessions: np.ndarray,
+                 earliest_slot: np.ndarray, blocked_mask: np.ndarray):
+        self.names = names
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self.earliest_slot = earliest_slot
+        self.blocked_mask = blocked_mask
+        self.ids = np.arange(len(names))
+        # interned names, first occurrence wins for duplicates
+        self.index_by_name: Dict[str, int] = {}
+        for company_id, name in enumerate(names.tolist()):
+            self.index_by_name.setdefault(name, company_id)
+        self._items: List[Optional[Company]] = [None] * len(names)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'CompanyTable':
+        # strip extra spaces
+        names = df['Unternehmen'].astype(str).str.strip().to_numpy(dtype=object)
+        capacity = df['Max. Teilnehmer'].to_numpy(dtype=np.int64, copy=True)
+        max_sessions = df['Max. Veranstaltungen'].to_numpy(dtype=np.int64, copy=True)
+        earliest_col = df['Frühester Zeitpunkt']
+        letters = earliest_col.fillna('A').astype(str).str.strip().str.upper().str[0].fillna('A')
+        earliest_slot = np.array(letters.tolist(), dtype='U1').view(np.int32).astype(np.int64) - ord('A')
+        blocked_mask = (np.int64(1) << earliest_slot) - 1
+        return cls(names, capacity, max_sessions, earliest_slot, blocked_mask)
+
+    @classmethod
+    def from_companies(cls, companies: List[Company]) -> 'CompanyTable':
+        blocked_mask = [sum(1 << slot for slot in set(c.blocked_slots)) for c in companies]
+        return cls(
+            np.array([c.name.strip() for c in companies], dtype=object),
+            np.array([c.capacity for c in companies], dtype=np.int64),
+            np.array([c.max_sessions for c in companies], dtype=np.int64),
+            np.array([c.earliest_slot for c in companies], dtype=np.int64),
+            np.array(blocked_mask, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        item = self._items[idx]
+        if item is None:
+            mask = int(self.blocked_mask[idx])
+            item = Company(
+                name=self.names[idx],
+                capacity=int(self.capacity[idx]),
+                max_sessions=int(self.max_sessions[idx]),
+                earliest_slot=int(self.earliest_slot[idx]),
+                blocked_slots=[slot for slot in range(mask.bit_length()) if mask >> slot & 1],
+                company_id=idx
+            )
+            self._items[idx] = item
+        return item
+
+    def resolve(self, wish) -> int:
+        """Unternehmens-ID zu einem Wunsch (Name oder 1-basierte Nummer), -1 wenn unbekannt."""
+        wish = str(wish).strip()
+        if wish in self.index_by_name:
+            return self.index_by_name[wish]
+        try:
+            company_id = int(float(wish)) - 1
+        except (ValueError, TypeError):
+            return -1
+        return company_id if 0 <= company_id < len(self) else -1
+
+    def allowed_slots(self, n_slots: int) -> List[List[int]]:
+        """Slots pro Unternehmen ab earliest_slot, die nicht gesperrt sind."""
+        return [
+            [slot for slot in range(earliest, n_slots) if not mask >> slot & 1]
+            for earliest, mask in zip(self.earliest_slot.tolist(), self.blocked_mask.tolist())
+        ]
+
+    def open_slots(self, n_slots: int) -> List[List[int]]:
+        """Erlaubte Slots pro Unternehmen, höchstens max_sessions."""
+        return [
+            allowed[:max_sessions]
+            for allowed, max_sessions in zip(self.allowed_slots(n_slots), self.max_sessions.tolist())
+        ]
 
 @dataclass
 class CompanySession:
     company: Company
     room: str
-    time_slot: str    
-    time_range: str    
+    time_slot: str
+    time_range: str
     students: List[dict] = None
 
     def __post_init__(self):
@@ -52,3 +129,60 @@ class CompanySession:
 
     def is_full(self) -> bool:
         return len(self.students) >= self.company.capacity
+
+
+class SessionGrid(MutableMapping):
+    """
+    Dichtes Raster Unternehmen x Slots mit den CompanySession-Objekten
+    (None = keine Veranstaltung). Ersetzt das frühere Dict
+    {(Unternehmensname, slot_idx): CompanySession} und verhält sich wie ein
+    Dict mit Schlüsseln (company_id, slot_idx); alte Namensschlüssel gelten
+    als nicht vorhanden (in: False, get: None, []: KeyError).
+    """
+
+    def __init__(self, n_companies: int = 0, n_slots: int = 0):
+        self.grid = np.full((n_companies, n_slots), None, dtype=object)
+
+    def reset(self, n_companies: int, n_slots: int):
+        self.grid = np.full((n_companies, n_slots), None, dtype=object)
+
+    def session(self, company_id: int, slot_idx: int) -> Optional[CompanySession]:
+        if not isinstance(company_id, (int, np.integer)) or not isinstance(slot_idx, (int, np.integer)):
+            return None
+        if 0 <= company_id < self.grid.shape[0] and 0 <= slot_idx < self.grid.shape[1]:
+            return self.grid[company_id, slot_idx]
+        return None
+
+    def student_counts(self) -> np.ndarray:
+        """Teilnehmerzahl pro Unternehmen und Slot, -1 ohne Veranstaltung."""
+        counts = np.full(self.grid.shape, -1, dtype=np.int64)
+        for company_id, slot_idx in zip(*np.nonzero(self.grid.astype(bool))):
+            counts[company_id, slot_idx] = len(self.grid[company_id, slot_idx].students)
+        return counts
+
+    def __getitem__(self, key: Tuple[int, int]) -> CompanySession:
+        session = self.session(*key)
+        if session is None:
+            raise KeyError(key)
+        return session
+
+    def __setitem__(self, key: Tuple[int, int], session: CompanySession):
+        self.grid[key] = session
+
+    def __delitem__(self, key: Tuple[int, int]):
+        if self.session(*key) is None:
+            raise KeyError(key)
+        self.grid[key] = None
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, tuple) and len(key) == 2 and self.session(*key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for company_id, slot_idx in zip(*np.nonzero(self.grid.astype(bool))):
+            yield int(company_id), int(slot_idx)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.grid.astype(bool)))
+
+    def clear(self):
+        self.grid.fill(None)
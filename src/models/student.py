@@ -1,47 +1,260 @@
+import hashlib
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 # not working yet
+MAX_WISHES = 6
+
 @dataclass
 class StudentPreference:
-    student_id: str   
-    name: str         
+    student_id: str
+    name: str
     wishes: List[str]
 
     @classmethod
-    def from_dataframe(cls, df: pd.DataFrame, company_mapping: Dict[int, str] = None) -> List['StudentPreference']:
-        preferences = []
-        for idx, row in df.iterrows():
-            klasse = str(row['Klasse']).strip()
-            name = str(row['Name']).strip()
-            vorname = str(row['Vorname']).strip()
-            student_id = f"{klasse}_{idx+1}"
-            full_name = f"{name}, {vorname}"
-            wishes = []
-            for i in range(1, 7):
-                col1 = f'Wahl {i}'
-                col2 = f'Wahl{i}'
-                wish = None
-                if col1 in df.columns:
-                    wish = row.get(col1)
-                elif col2 in df.columns:
-                    wish = row.get(col2)
-                if pd.notna(wish):
-                    try:
-                        wish_num = int(float(str(wish).strip()))
-                        if company_mapping and wish_num in company_mapping:
-                            wishes.append(company_mapping[wish_num])
-                        else:
-                            wishes.append(str(wish_num))
-                    except ValueError:
-                        wishes.append(str(wish).strip())
-            preferences.append(cls(student_id=student_id, name=full_name, wishes=wishes))
-        return preferences
+    def from_dataframe(cls, df: pd.DataFrame, company_mapping: Dict[int, str] = None) -> 'PreferenceMatrix':
+        return PreferenceMatrix.from_dataframe(df, company_mapping)
 
     def get_satisfaction_score(self, realized_wishes: List[bool], max_wishes: int = 6) -> float:
         total_points = 0
-        max_points = sum(range(max_wishes, 0, -1))
+        max_points = max_wishes * (max_wishes + 1) // 2
         for i, wish in enumerate(realized_wishes):
             if wish:
                 total_points += (max_wishes - i)
         return (total_points / max_points) * 100
+
+
+@dataclass
+class StudentScheduleView:
+    """Fertig aufbereiteter Zeitplan einer Schülerin / eines Schülers für Export und Vorschau."""
+    student_id: str
+    name: str
+    class_name: str
+    appointments: List[dict]
+    realized_wishes: List[bool]
+    score: float
+
+
+@dataclass
+class SatisfactionSummary:
+    scores: np.ndarray                 # Score pro Schüler:in (0-100)
+    class_names: List[str]
+    class_means: np.ndarray            # Mittelwert pro Klasse, Reihenfolge wie class_names
+    class_percentiles: np.ndarray      # Klassen x PERCENTILES
+    rank_histogram: np.ndarray         # erfüllte Wünsche pro Rang
+    mean: float
+
+    PERCENTILES = (10, 50, 90)
+
+    def overview_text(self) -> str:
+        ranks = ", ".join(f"{rank}: {int(count)}" for rank, count in enumerate(self.rank_histogram.tolist(), 1))
+        return f"Ø Erfüllung: {self.mean:.1f}% - Erfüllte Wünsche nach Rang: {ranks}"
+
+    def class_stats(self) -> Dict[str, Tuple[float, ...]]:
+        """Klasse -> (Mittelwert, P10, Median, P90)."""
+        return {
+            class_name: (float(mean), *map(float, percentiles))
+            for class_name, mean, percentiles in zip(self.class_names, self.class_means, self.class_percentiles)
+        }
+
+
+def satisfaction_scores(realized_wishes: np.ndarray, max_wishes: int = MAX_WISHES) -> np.ndarray:
+    """Vektorisierte Variante von StudentPreference.get_satisfaction_score für alle Schüler:innen."""
+    n_ranks = realized_wishes.shape[1]
+    points = max_wishes - np.arange(n_ranks)
+    max_points = max_wishes * (max_wishes + 1) // 2
+    return realized_wishes.astype(np.float64) @ points / max_points * 100
+
+
+def summarize_satisfaction(realized_wishes: np.ndarray, class_names: Sequence[str]) -> SatisfactionSummary:
+    """
+    Scores, Klassen-Mittelwerte/-Perzentile und Histogramm der erfüllten
+    Wunschränge aus der Matrix Schüler:innen x Ränge (True = Wunsch erfüllt).
+    """
+    scores = satisfaction_scores(realized_wishes)
+    classes, class_idx = np.unique(np.asarray(class_names, dtype=object).astype(str), return_inverse=True)
+    counts = np.bincount(class_idx, minlength=len(classes))
+    class_means = np.bincount(class_idx, weights=scores, minlength=len(classes)) / np.maximum(counts, 1)
+
+    # sort once by (class, score), then read the percentiles per class slice
+    order = np.lexsort((scores, class_idx))
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    sorted_scores = scores[order]
+    class_percentiles = np.array([
+        np.percentile(sorted_scores[bounds[i]:bounds[i + 1]], SatisfactionSummary.PERCENTILES)
+        for i in range(len(classes))
+    ]).reshape(len(classes), len(SatisfactionSummary.PERCENTILES))
+
+    return SatisfactionSummary(
+        scores=scores,
+        class_names=classes.tolist(),
+        class_means=class_means,
+        class_percentiles=class_percentiles,
+        rank_histogram=realized_wishes.sum(axis=0),
+        mean=float(scores.mean()) if len(scores) else 0.0
+    )
+
+
+def stable_student_id(klasse: str, name: str, vorname: str) -> str:
+    """
+    ID aus Klasse und Name statt Zeilennummer, bleibt beim Umsortieren oder
+    Einfügen von Zeilen gleich. Das Präfix vor '_' ist die Klasse.
+    """
+    key = '\x1f'.join(part.strip().casefold() for part in (klasse, name, vorname))
+    return f"{klasse.strip()}_{hashlib.blake2b(key.encode('utf-8'), digest_size=5).hexdigest()}"
+
+
+def unique_student_ids(student_ids: List[str]) -> np.ndarray:
+    """Gleichnamige in derselben Klasse bekommen -2, -3, ... in Reihenfolge des Auftretens."""
+    seen = set()
+    unique = []
+    for student_id in student_ids:
+        candidate, n = student_id, 1
+        while candidate in seen:
+            n += 1
+            candidate = f"{student_id}-{n}"
+        seen.add(candidate)
+        unique.append(candidate)
+    return np.array(unique, dtype=object)
+
+
+@dataclass
+class PreferenceDelta:
+    """Unterschied zweier Wahllisten, Schüler:innen-IDs pro Kategorie."""
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary_text(self) -> str:
+        return f"Neu: {len(self.added)}, Entfernt: {len(self.removed)}, Geändert: {len(self.changed)}"
+
+
+def _cell_text(value) -> str:
+    if pd.isna(value):
+        return 'nan'
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _text_column(values: pd.Series) -> pd.Series:
+    """
+    Zelltext unabhängig vom dtype: pd.read_excel liefert leere Zellen als
+    NaN und Zahlen mit Lücken als float, openpyxl None und int. Beide
+    ergeben denselben Text ('nan', '10'), die Schüler:innen-IDs hängen also
+    nicht vom Importweg ab.
+    """
+    return pd.Series([_cell_text(value).strip() for value in values.tolist()], index=values.index, dtype=object)
+
+
+class PreferenceMatrix(Sequence):
+    """
+    Spaltenbasierte Schülerwünsche: choices ist eine int16-Matrix
+    (Schüler:innen x 6) mit den Unternehmensnummern, -1 für leere Felder.
+    Die StudentPreference-Objekte werden erst beim Zugriff erzeugt.
+    """
+
+    def __init__(self, student_ids: np.ndarray, names: np.ndarray, choices: np.ndarray,
+                 company_mapping: Dict[int, str] = None,
+                 text_wishes: Dict[Tuple[int, int], str] = None):
+        self.student_ids = student_ids
+        self.names = names
+        self.choices = choices
+        self.company_mapping = company_mapping or {}
+        # non-numeric cells, kept as text: (row, column) -> text
+        self.text_wishes = text_wishes or {}
+        self._items: List[Optional[StudentPreference]] = [None] * len(student_ids)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, company_mapping: Dict[int, str] = None) -> 'PreferenceMatrix':
+        n = len(df)
+        klasse = _text_column(df['Klasse'])
+        name = _text_column(df['Name'])
+        vorname = _text_column(df['Vorname'])
+        student_ids = unique_student_ids([
+            stable_student_id(*row) for row in zip(klasse.tolist(), name.tolist(), vorname.tolist())
+        ])
+        names = (name + ', ' + vorname).to_numpy(dtype=object)
+
+        # resolve wish columns once
+        choices = np.full((n, MAX_WISHES), -1, dtype=np.int16)
+        text_wishes = {}
+        for i in range(1, MAX_WISHES + 1):
+            col = next((c for c in (f'Wahl {i}', f'Wahl{i}') if c in df.columns), None)
+            if col is None:
+                continue
+            values = df[col]
+            if values.dtype == object or pd.api.types.is_string_dtype(values):
+                values = values.astype(str).str.strip().where(values.notna())
+            numeric = np.trunc(pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64))
+            # int16 would wrap silently, numbers outside 1..32767 stay text like other unknown wishes
+            with np.errstate(invalid='ignore'):
+                valid = (numeric >= 1) & (numeric <= np.iinfo(np.int16).max)
+            choices[valid, i - 1] = numeric[valid].astype(np.int16)
+            for row in np.flatnonzero(~valid & values.notna().to_numpy()):
+                if np.isfinite(numeric[row]):
+                    text_wishes[(int(row), i - 1)] = str(int(numeric[row]))
+                else:
+                    text_wishes[(int(row), i - 1)] = str(values.iloc[row]).strip()
+
+        return cls(student_ids, names, choices, company_mapping, text_wishes)
+
+    @classmethod
+    def concat(cls, parts: List['PreferenceMatrix'], company_mapping: Dict[int, str] = None) -> 'PreferenceMatrix':
+        text_wishes = {}
+        offset = 0
+        for part in parts:
+            for (row, col), text in part.text_wishes.items():
+                text_wishes[(row + offset, col)] = text
+            offset += len(part)
+        if not parts:
+            empty = np.empty(0, dtype=object)
+            return cls(empty, empty.copy(), np.full((0, MAX_WISHES), -1, dtype=np.int16), company_mapping)
+        return cls(
+            unique_student_ids(np.concatenate([part.student_ids for part in parts]).tolist()),
+            np.concatenate([part.names for part in parts]),
+            np.concatenate([part.choices for part in parts]),
+            company_mapping,
+            text_wishes
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        item = self._items[idx]
+        if item is None:
+            item = StudentPreference(
+                student_id=self.student_ids[idx],
+                name=self.names[idx],
+                wishes=self._wishes(idx)
+            )
+            self._items[idx] = item
+        return item
+
+    def set_choices(self, idx: int, numbers: Sequence[int]):
+        """Ersetzt die Wünsche einer Zeile durch 1-basierte Unternehmensnummern."""
+        if len(numbers) > MAX_WISHES:
+            raise ValueError(f"höchstens {MAX_WISHES} Wünsche")
+        self.choices[idx] = -1
+        self.choices[idx, :len(numbers)] = numbers
+        for col in range(MAX_WISHES):
+            self.text_wishes.pop((idx, col), None)
+        self._items[idx] = None
+
+    def _wishes(self, idx: int) -> List[str]:
+        wishes = []
+        for col, wish_num in enumerate(self.choices[idx].tolist()):
+            if wish_num >= 0:
+                wishes.append(self.company_mapping.get(wish_num, str(wish_num)))
+            elif (idx, col) in self.text_wishes:
+                wishes.append(self.text_wishes[(idx, col)])
+        return wishes
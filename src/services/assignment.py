@@ -0,0 +1,225 @@
+from typing import List, Dict, Optional, Tuple
+
+INF = float('inf')
+
+
+class MinCostFlow:
+    """
+    Min-Cost-Flow (primal-dual): Dijkstra mit Potentialen liefert die
+    kürzeste Distanz, danach wird per Blocking-Flow auf allen zulässigen
+    Kanten (reduzierte Kosten 0) gleichzeitig augmentiert.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.graph: List[List[int]] = [[] for _ in range(n)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        idx = len(self.to)
+        self.to += [v, u]
+        self.cap += [cap, 0]
+        self.cost += [cost, -cost]
+        self.graph[u].append(idx)
+        self.graph[v].append(idx + 1)
+        return idx
+
+    def flow_on(self, edge: int) -> int:
+        # flow = capacity of the reverse edge
+        return self.cap[edge ^ 1]
+
+    def flow(self, s: int, t: int) -> Tuple[int, int]:
+        """Berechnet den maximalen Fluss mit minimalen Kosten, gibt (Fluss, Kosten) zurück."""
+        import heapq
+
+        n, graph, to, cap, cost = self.n, self.graph, self.to, self.cap, self.cost
+        potential = [0] * n
+        total_flow = 0
+        total_cost = 0
+
+        while True:
+            # Dijkstra on reduced costs
+            dist = [INF] * n
+            dist[s] = 0
+            heap = [(0, s)]
+            while heap:
+                d, v = heapq.heappop(heap)
+                if d > dist[v]:
+                    continue
+                pv = potential[v]
+                for e in graph[v]:
+                    if cap[e] > 0:
+                        w = to[e]
+                        nd = d + cost[e] + pv - potential[w]
+                        if nd < dist[w]:
+                            dist[w] = nd
+                            heapq.heappush(heap, (nd, w))
+            if dist[t] == INF:
+                break
+            for v in range(n):
+                if dist[v] != INF:
+                    potential[v] += dist[v]
+            path_cost = potential[t] - potential[s]
+
+            # blocking flow on admissible edges (reduced cost 0)
+            while True:
+                level = [-1] * n
+                level[s] = 0
+                queue = [s]
+                for v in queue:
+                    pv = potential[v]
+                    for e in graph[v]:
+                        w = to[e]
+                        if cap[e] > 0 and level[w] < 0 and cost[e] + pv - potential[w] == 0:
+                            level[w] = level[v] + 1
+                            queue.append(w)
+                if level[t] < 0:
+                    break
+                it = [0] * n
+                while True:
+                    pushed = self._augment(s, t, level, it, potential)
+                    if not pushed:
+                        break
+                    total_flow += pushed
+                    total_cost += pushed * path_cost
+
+        return total_flow, total_cost
+
+    def _augment(self, s, t, level, it, potential) -> int:
+        graph, to, cap, cost = self.graph, self.to, self.cap, self.cost
+        path: List[int] = []
+        v = s
+        while True:
+            if v == t:
+                pushed = min(cap[e] for e in path)
+                for e in path:
+                    cap[e] -= pushed
+                    cap[e ^ 1] += pushed
+                return pushed
+            adj = graph[v]
+            pv = potential[v]
+            next_level = level[v] + 1
+            while it[v] < len(adj):
+                e = adj[it[v]]
+                w = to[e]
+                if cap[e] > 0 and level[w] == next_level and cost[e] + pv - potential[w] == 0:
+                    break
+                it[v] += 1
+            else:
+                # dead end, retreat
+                if not path:
+                    return 0
+                level[v] = -1
+                e = path.pop()
+                v = to[e ^ 1]
+                it[v] += 1
+                continue
+            path.append(e)
+            v = to[e]
+
+
+def assign_students(
+    wish_lists: List[List[int]],
+    capacities: List[int],
+    open_slots: List[List[int]],
+    n_slots: int,
+    seats: Optional[List[List[int]]] = None,
+    busy: Optional[List[Dict[int, int]]] = None
+) -> List[Dict[int, int]]:
+    """
+    Verteilt Schüler:innen auf Veranstaltungen.
+
+    wish_lists: pro Schüler:in die Unternehmensindizes in Wunschreihenfolge
+    capacities: Plätze pro Veranstaltung je Unternehmen
+    open_slots: pro Unternehmen die Zeitslots, in denen eine Veranstaltung stattfindet
+    seats: optional freie Plätze Unternehmen x Slots (für Nachträge in einen
+           bestehenden Plan), sonst capacities in jedem offenen Slot
+    busy: optional bereits feste Zuteilungen pro Schüler:in (slot_idx -> Unternehmen),
+          diese Slots und Unternehmen werden nicht erneut vergeben
+    Rückgabe: pro Schüler:in ein Dict slot_idx -> Unternehmensindex (nur neue Zuteilungen)
+    """
+    n_students = len(wish_lists)
+    n_companies = len(capacities)
+
+    # Phase 1: min-cost flow student -> company, cost = wish rank
+    source = n_students + n_companies
+    sink = source + 1
+    mcf = MinCostFlow(sink + 1)
+    if seats is None:
+        seats = [[0] * n_slots for _ in range(n_companies)]
+        for c_idx, slots in enumerate(open_slots):
+            for slot_idx in slots:
+                seats[c_idx][slot_idx] = capacities[c_idx]
+    else:
+        seats = [list(row) for row in seats]
+    busy = busy or [{} for _ in range(n_students)]
+
+    wish_edges: List[List[Tuple[int, int]]] = []
+    for s_idx, wishes in enumerate(wish_lists):
+        edges = []
+        seen = set(busy[s_idx].values())
+        for rank, c_idx in enumerate(wishes):
+            if c_idx in seen or not (0 <= c_idx < n_companies) or not open_slots[c_idx]:
+                continue
+            seen.add(c_idx)
+            edges.append((c_idx, mcf.add_edge(s_idx, n_students + c_idx, 1, rank)))
+        wish_edges.append(edges)
+        free_slots = n_slots - len(busy[s_idx])
+        if edges and free_slots > 0:
+            mcf.add_edge(source, s_idx, min(free_slots, len(edges)), 0)
+    for c_idx in range(n_companies):
+        supply = sum(seats[c_idx][slot_idx] for slot_idx in open_slots[c_idx])
+        if supply > 0:
+            mcf.add_edge(n_students + c_idx, sink, supply, 0)
+    mcf.flow(source, sink)
+
+    chosen = [[c_idx for c_idx, e in edges if mcf.flow_on(e)] for edges in wish_edges]
+
+    # Phase 2: place each chosen company into one of its slots
+    assignments: List[Dict[int, int]] = [{} for _ in range(n_students)]
+    order = sorted(range(n_students), key=lambda i: -len(chosen[i]))
+    for s_idx in order:
+        for c_idx, slot_idx in _match_slots(chosen[s_idx], open_slots, seats, busy[s_idx]).items():
+            seats[c_idx][slot_idx] -= 1
+            assignments[s_idx][slot_idx] = c_idx
+
+    # fill remaining free slots with unused wishes, only after every student got the flow's choice
+    for s_idx in order:
+        slot_of = assignments[s_idx]
+        fixed = busy[s_idx]
+        for c_idx in wish_lists[s_idx]:
+            if len(slot_of) + len(fixed) >= n_slots:
+                break
+            if not (0 <= c_idx < n_companies) or c_idx in slot_of.values() or c_idx in fixed.values():
+                continue
+            free = [t for t in open_slots[c_idx] if seats[c_idx][t] > 0 and t not in slot_of and t not in fixed]
+            if free:
+                slot_idx = max(free, key=lambda t: seats[c_idx][t])
+                seats[c_idx][slot_idx] -= 1
+                slot_of[slot_idx] = c_idx
+    return assignments
+
+
+def _match_slots(companies: List[int], open_slots: List[List[int]], seats: List[List[int]],
+                 busy: Dict[int, int] = None) -> Dict[int, int]:
+    """Bipartites Matching Unternehmen -> Slot für eine:n Schüler:in (Kuhn), busy-Slots sind belegt."""
+    slot_owner: Dict[int, int] = {}
+    busy = busy or {}
+
+    def try_place(c_idx, visited):
+        # prefer slots with the most free seats to keep sessions balanced
+        for slot_idx in sorted(open_slots[c_idx], key=lambda t: -seats[c_idx][t]):
+            if seats[c_idx][slot_idx] <= 0 or slot_idx in visited or slot_idx in busy:
+                continue
+            visited.add(slot_idx)
+            owner = slot_owner.get(slot_idx)
+            if owner is None or try_place(owner, visited):
+                slot_owner[slot_idx] = c_idx
+                return True
+        return False
+
+    for c_idx in companies:
+        try_place(c_idx, set())
+    return {c_idx: slot_idx for slot_idx, c_idx in slot_owner.items()}
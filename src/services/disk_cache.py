@@ -0,0 +1,32 @@
+import os
+
+
+def evict_lru(directory: str, suffix: str, max_bytes: int):
+    """
+    Löscht die am längsten nicht benutzten Einträge (älteste mtime) mit
+    Endung suffix, bis der Ordner höchstens max_bytes belegt. Andere
+    Threads oder Prozesse können gleichzeitig im selben Ordner aufräumen:
+    schon verschwundene Einträge werden übersprungen.
+    """
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    entries = []
+    for name in names:
+        if not name.endswith(suffix):
+            continue
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+        total -= size
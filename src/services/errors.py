@@ -0,0 +1,14 @@
+class SchedulerError(Exception):
+    """Basisklasse für Fehler des SchedulerService, die der Aufrufer anzeigen soll."""
+
+
+class ScheduleGenerationError(SchedulerError):
+    pass
+
+
+class ExportError(SchedulerError):
+    pass
+
+
+class SnapshotError(SchedulerError):
+    pass
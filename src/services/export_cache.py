@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from services.disk_cache import evict_lru
+
+# bump when the canvas renderers draw differently, older fragments are ignored then
+FRAGMENT_VERSION = 2
+
+
+def fragment_key(kind: str, data: Any) -> str:
+    """
+    Schlüssel eines Seitenfragments: Art plus SHA-256 der Eingabedaten als
+    JSON. Die Fragmente sind Layoutdaten (Koordinaten, Farben, Texte) und
+    werden über die öffentliche Canvas-API gezeichnet, sie hängen also
+    nicht von den Interna einer reportlab-Version ab.
+    """
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"{kind}-v{FRAGMENT_VERSION}-{digest}"
+
+
+class ExportCache:
+    """
+    Cache für gerenderte Seitenfragmente der PDF-Exporte (Layoutdaten
+    einer Klasse bzw. einer Veranstaltung). Ändert sich nur eine Klasse
+    oder Veranstaltung, wird beim nächsten Export nur deren Fragment neu
+    aufgebaut, der Rest kommt aus dem Cache. Gespeichert wird JSON;
+    evict() löscht die am längsten nicht benutzten Einträge, sobald der
+    Ordner max_bytes überschreitet.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = os.path.join(self.directory, key + '.json')
+        try:
+            with open(entry, encoding='utf-8') as f:
+                fragment = json.load(f)
+            # mark as recently used
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # broken entry, render again
+            return None
+        return fragment
+
+    def put(self, key: str, fragment: Any):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(fragment, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(self.directory, key + '.json'))
+        except OSError:
+            # the cache is an optimisation only
+            pass
+
+    def evict(self):
+        """Einmal pro Export aufrufen, nicht pro Fragment."""
+        try:
+            evict_lru(self.directory, '.json', self.max_bytes)
+        except OSError:
+            # the cache is an optimisation only
+            pass
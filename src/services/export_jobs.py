@@ -0,0 +1,78 @@
+import os
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from services.errors import ExportError
+
+
+@dataclass
+class ExportJob:
+    label: str
+    output_path: str
+    unit: str                       # what progress counts, e.g. "Klassen"
+    done: int = 0
+    total: int = 0                  # 0 = not known yet
+    future: Optional[Future] = None
+
+    def status_text(self) -> str:
+        if self.total:
+            return f"{self.label}: {self.done}/{self.total} {self.unit}"
+        if self.done:
+            return f"{self.label}: {self.done} {self.unit}"
+        return f"{self.label}: läuft..."
+
+
+class ExportQueue:
+    """
+    Führt PDF-Exporte in Hintergrund-Threads aus, mehrere gleichzeitig
+    (z. B. alle drei PDFs). Die Tasks kommen aus SchedulerService.export_task,
+    die Daten sind also schon gesammelt. Jeder Task meldet Fortschritt über
+    progress(erledigt, gesamt); die GUI ruft regelmäßig poll() auf.
+    """
+
+    def __init__(self, max_workers: int = 3):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._progress: "queue.Queue[Tuple[ExportJob, int, int]]" = queue.Queue()
+        self.jobs: List[ExportJob] = []
+
+    def submit(self, label: str, task: Callable[..., str], output_path: str, unit: str) -> ExportJob:
+        """Startet task(progress) im Hintergrund, wirft ExportError, wenn die Datei gerade geschrieben wird."""
+        if self.running(output_path):
+            raise ExportError(f"{os.path.basename(output_path)} wird bereits exportiert")
+        job = ExportJob(label, os.path.abspath(output_path), unit)
+        job.future = self._pool.submit(task, lambda done, total: self._progress.put((job, done, total)))
+        self.jobs.append(job)
+        return job
+
+    def running(self, output_path: str) -> bool:
+        return any(job.output_path == os.path.abspath(output_path) for job in self.jobs)
+
+    def poll(self) -> List[ExportJob]:
+        """
+        Übernimmt den gemeldeten Fortschritt in die laufenden Jobs und gibt
+        die seit dem letzten Aufruf fertigen zurück (Ergebnis oder Fehler in
+        job.future).
+        """
+        while True:
+            try:
+                job, done, total = self._progress.get_nowait()
+            except queue.Empty:
+                break
+            job.done, job.total = done, total
+        finished, running = [], []
+        for job in self.jobs:
+            (finished if job.future.done() else running).append(job)
+        self.jobs = running
+        return finished
+
+    def status_text(self) -> str:
+        return " · ".join(job.status_text() for job in self.jobs)
+
+    def fraction(self) -> float:
+        """Gesamtfortschritt der laufenden Jobs mit bekannter Gesamtzahl, 0..1."""
+        known = [job for job in self.jobs if job.total]
+        if not known:
+            return 0.0
+        return sum(job.done / job.total for job in known) / len(known)
@@ -0,0 +1,100 @@
+import copy
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from services.errors import SchedulerError, ScheduleGenerationError
+from services.scheduler import SchedulerService
+
+
+class GenerationJob:
+    """
+    Erzeugt den Zeitplan in einem Worker-Thread auf einer Kopie des
+    SchedulerService, damit die GUI weiterläuft und der bisherige Plan
+    benutzbar bleibt. Fortschritt kommt als (Anteil 0..1, Text) über eine
+    Queue, die GUI holt ihn per root.after mit poll() ab. cancel() beendet
+    die Verbesserung am nächsten Checkpoint, result() liefert dann den
+    besten bis dahin gefundenen Plan.
+    """
+
+    # seconds between two progress events from the annealing loop
+    PROGRESS_INTERVAL = 0.1
+    # share of the progress bar for planning and assignment when improving afterwards
+    GENERATE_SHARE = 0.2
+
+    def __init__(self, scheduler: SchedulerService, improve_seconds: float = 0.0, seed: int = 0):
+        self.source = scheduler
+        self.scheduler = copy.deepcopy(scheduler)
+        self.improve_seconds = improve_seconds
+        self.seed = seed
+        self.error: Optional[SchedulerError] = None
+        self.cancelled = False
+        self.gained = 0
+        self._events: "queue.Queue[Tuple[float, str]]" = queue.Queue()
+        self._cancel = threading.Event()
+        # imports replace these objects, a result for old inputs is not applied
+        self._inputs = (scheduler.student_preferences, scheduler.companies, scheduler.rooms)
+        self._thread = threading.Thread(target=self._run, name="schedule-generation", daemon=True)
+
+    def start(self) -> 'GenerationJob':
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def poll(self) -> List[Tuple[float, str]]:
+        """Alle seit dem letzten Aufruf gemeldeten Fortschritte, ohne zu blockieren."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def result(self) -> Optional[SchedulerService]:
+        """
+        Der erzeugte Plan, None bei einem Fehler oder wenn in der Quelle
+        inzwischen andere Daten importiert wurden.
+        """
+        if self.error is not None or not self.done():
+            return None
+        inputs = (self.source.student_preferences, self.source.companies, self.source.rooms)
+        if any(current is not started for current, started in zip(inputs, self._inputs)):
+            return None
+        return self.scheduler
+
+    def _run(self):
+        improve = self.improve_seconds > 0
+        try:
+            self._events.put((0.0, "Veranstaltungen planen und zuteilen..."))
+            self.scheduler.generate_schedule()
+            if improve and not self._cancel.is_set():
+                self._events.put((self.GENERATE_SHARE, "Zuteilung verbessern..."))
+                self.gained = self.scheduler.improve_schedule(
+                    time_budget=self.improve_seconds, seed=self.seed, checkpoint=self._checkpoint()
+                )
+        except SchedulerError as e:
+            self.error = e
+        except Exception as e:
+            self.error = ScheduleGenerationError(f"Fehler bei der Zeitplangenerierung: {str(e)}")
+        self.cancelled = self._cancel.is_set()
+        self._events.put((1.0, "Abgebrochen" if self.cancelled else "Fertig"))
+
+    def _checkpoint(self):
+        last = time.perf_counter()
+
+        def checkpoint(progress: float, best_score: int) -> bool:
+            nonlocal last
+            now = time.perf_counter()
+            if now - last >= self.PROGRESS_INTERVAL:
+                last = now
+                share = self.GENERATE_SHARE
+                self._events.put((share + (1 - share) * progress, f"Zuteilung verbessern... {best_score} Wunschpunkte"))
+            return self._cancel.is_set()
+
+        return checkpoint
@@ -0,0 +1,133 @@
+import math
+import random
+import time
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+
+def improve_assignment(
+    student_slots: np.ndarray,
+    points: np.ndarray,
+    seats: np.ndarray,
+    time_budget: float,
+    seed: int,
+    start_temperature: float = 1.5,
+    end_temperature: float = 0.05,
+    checkpoint: Optional[Callable[[float, int], bool]] = None
+) -> Tuple[np.ndarray, int]:
+    """
+    Verbessert eine Zuteilung per Simulated Annealing innerhalb von time_budget Sekunden.
+
+    student_slots: Schüler:innen x Slots, Unternehmens-ID oder -1
+    points: Schüler:innen x (Unternehmen + 1), Punkte pro erfülltem Wunsch;
+            die letzte Spalte ist 0, damit points[s][-1] für "frei" passt
+    seats: Unternehmen x Slots, Plätze der Veranstaltung (0 = keine)
+    checkpoint: wird regelmäßig mit (Anteil des Zeitbudgets, beste Punktsumme)
+            aufgerufen; gibt es True zurück, endet die Suche vorzeitig
+    Rückgabe: beste gefundene Zuteilung und deren Punktsumme
+
+    Züge: Wechsel in eine Veranstaltung mit freiem Platz, Tausch mit einer
+    anderen Person derselben Veranstaltung und Vertauschen zweier Slots
+    einer Person (punktneutral, schafft Platz für weitere Züge).
+    """
+    rng = random.Random(seed)
+    slots = student_slots.tolist()
+    points = points.tolist()
+    cap = seats.tolist()
+    n_students = len(slots)
+    n_slots = len(cap[0]) if cap else 0
+    if n_students == 0 or n_slots == 0:
+        return student_slots.copy(), 0
+
+    members = {}
+    for s, row in enumerate(slots):
+        for t, c in enumerate(row):
+            if c >= 0:
+                members.setdefault((c, t), []).append(s)
+    wishes = [[c for c, p in enumerate(row[:-1]) if p > 0] for row in points]
+    movable = [s for s in range(n_students) if wishes[s]]
+    if not movable:
+        return student_slots.copy(), _score(slots, points)
+
+    score = _score(slots, points)
+    best_score = score
+    best = [row[:] for row in slots]
+    start = time.perf_counter()
+    temperature = start_temperature
+    iteration = 0
+
+    while True:
+        iteration += 1
+        if iteration % 256 == 0:
+            # snapshot the best state only at checkpoints, copying is expensive
+            if score > best_score:
+                best_score = score
+                best = [r[:] for r in slots]
+            progress = (time.perf_counter() - start) / time_budget if time_budget > 0 else 1.0
+            if progress >= 1.0:
+                break
+            if checkpoint is not None and checkpoint(progress, best_score):
+                break
+            temperature = start_temperature * (end_temperature / start_temperature) ** progress
+
+        s = rng.choice(movable)
+        t = rng.randrange(n_slots)
+        row = slots[s]
+        old = row[t]
+
+        if rng.random() < 0.7:
+            c = rng.choice(wishes[s])
+            if c == old or c in row or cap[c][t] == 0:
+                continue
+            session = members.setdefault((c, t), [])
+            if len(session) < cap[c][t]:
+                delta = points[s][c] - points[s][old]
+                if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                    continue
+                row[t] = c
+                session.append(s)
+                if old >= 0:
+                    members[(old, t)].remove(s)
+            else:
+                # swap seats with someone in the full session
+                other = rng.choice(session)
+                if old >= 0 and old in slots[other]:
+                    continue
+                delta = points[s][c] - points[s][old] + points[other][old] - points[other][c]
+                if delta < 0 and rng.random() >= math.exp(delta / temperature):
+                    continue
+                row[t] = c
+                slots[other][t] = old
+                session[session.index(other)] = s
+                if old >= 0:
+                    old_session = members[(old, t)]
+                    old_session[old_session.index(s)] = other
+        else:
+            # exchange two slots of the same student, score neutral
+            t2 = rng.randrange(n_slots)
+            other_c = row[t2]
+            if t2 == t or (old < 0 and other_c < 0):
+                continue
+            if old >= 0 and (cap[old][t2] == 0 or len(members.get((old, t2), ())) >= cap[old][t2]):
+                continue
+            if other_c >= 0 and (cap[other_c][t] == 0 or len(members.get((other_c, t), ())) >= cap[other_c][t]):
+                continue
+            if old >= 0:
+                members[(old, t)].remove(s)
+                members.setdefault((old, t2), []).append(s)
+            if other_c >= 0:
+                members[(other_c, t2)].remove(s)
+                members.setdefault((other_c, t), []).append(s)
+            row[t], row[t2] = other_c, old
+            delta = 0
+
+        score += delta
+
+    if score > best_score:
+        best_score = score
+        best = slots
+    return np.array(best, dtype=student_slots.dtype).reshape(student_slots.shape), best_score
+
+
+def _score(slots, points) -> int:
+    return sum(points[s][c] for s, row in enumerate(slots) for c in row if c >= 0)
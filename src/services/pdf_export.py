@@ -0,0 +1,594 @@
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.company import CompanySession
+from models.student import StudentScheduleView, SatisfactionSummary
+from services.errors import ExportError
+from services.export_cache import ExportCache, fragment_key
+
+# progress(done, total), called by the renderers per class / session
+Progress = Optional[Callable[[int, int], None]]
+
+
+def render_student_schedules(
+    output_path: str,
+    class_schedules: Dict[str, List[StudentScheduleView]],
+    summary: Optional[SatisfactionSummary] = None,
+    cache: Optional[ExportCache] = None,
+    progress: Progress = None
+) -> str:
+    """
+    Schreibt die Zeitpläne der übergebenen Klassen, 4 Schüler pro Seite.
+    Mit summary steht die Auswertung auf der ersten Seite. Läuft ohne
+    SchedulerService, damit es auch in einem Worker-Prozess geht.
+
+    Gezeichnet wird direkt auf den Canvas mit festen Koordinaten (gleiches
+    Layout wie die frühere platypus-Tabelle), jede Seite wird sofort
+    abgeschlossen, es entsteht kein Flowable-Baum für alle Schüler:innen.
+    Kopf und Gitter jeder Tabelle sind pro Zeilenzahl ein Form-XObject.
+    Mit cache kommen die Layoutdaten unveränderter Klassen aus dem Cache
+    und werden nur noch ausgegeben. progress wird nach jeder Klasse
+    aufgerufen.
+    """
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(output_path, pagesize=_StudentPageLayout.PAGE_SIZE)
+    layout = _StudentPageLayout(c)
+    if summary is not None:
+        layout.draw_summary(summary)
+        if class_schedules:
+            c.showPage()
+
+    on_page = 0
+    top = layout.top
+    for done, (class_name, students) in enumerate(sorted(class_schedules.items()), 1):
+        for height, ops in layout.class_blocks(class_name, students, cache):
+            if on_page == 4 or (on_page and top - height < layout.bottom):
+                c.showPage()
+                on_page = 0
+                top = layout.top
+            layout.place(top, ops)
+            top -= height
+            on_page += 1
+        if progress is not None:
+            progress(done, len(class_schedules))
+    c.save()
+    return output_path
+
+
+def use_binary_streams():
+    """
+    Schaltet den ASCII85-Filter von reportlab ab, die komprimierten
+    Seitenströme bleiben binär. Das spart ein Fünftel der Dateigröße, und
+    der reine Python-Encoder macht sonst den Großteil der Zeit beim
+    Speichern aus. rl_config gilt für den ganzen Prozess: einmal beim
+    Programmstart aufrufen, bevor Exporte in Threads laufen.
+    """
+    from reportlab import rl_config
+
+    rl_config.useA85 = 0
+
+
+class _CanvasLayout:
+    """
+    Gemeinsame Basis der Canvas-Renderer: A4, 10 mm Rand plus 6 pt
+    Frame-Padding wie bei SimpleDocTemplate. Text geht blockweise über ein
+    Textobjekt von reportlab in den Seitenstrom.
+
+    Alle Zeichenhilfen laufen über _emit: normal wird sofort gezeichnet,
+    innerhalb von _record entstehen stattdessen Layoutdaten (Name der
+    Operation plus Koordinaten und Texte, JSON-tauglich), die replay später
+    über dieselben Canvas-Aufrufe ausgibt. So landen im ExportCache keine
+    Interna von reportlab.
+    """
+
+    from reportlab.lib.pagesizes import A4 as PAGE_SIZE
+    PADDING = 6
+
+    def __init__(self, c):
+        from reportlab.lib import colors
+        from reportlab.lib.units import mm
+
+        self.c = c
+        self.colors = colors
+        self.left = 10*mm + self.PADDING
+        self.frame_width = self.PAGE_SIZE[0] - 2 * self.left
+        self.top = self.PAGE_SIZE[1] - 10*mm - self.PADDING
+        self.bottom = 10*mm + self.PADDING
+        self._ops: Optional[list] = None
+        self._forms = set()
+
+    def _columns(self, widths):
+        x = self.left + (self.frame_width - sum(widths)) / 2
+        edges = [x]
+        for width in widths:
+            x += width
+            edges.append(x)
+        return edges
+
+    def _record(self, draw, *args) -> list:
+        """Führt draw aus und gibt die Layoutdaten zurück, statt zu zeichnen."""
+        self._ops = []
+        try:
+            draw(*args)
+            return self._ops
+        finally:
+            self._ops = None
+
+    def _emit(self, op: str, *args):
+        if self._ops is not None:
+            self._ops.append([op, *args])
+        else:
+            getattr(self, '_op_' + op)(*args)
+
+    def replay(self, ops: list):
+        """Zeichnet Layoutdaten aus _record (auch nach einer Runde durch JSON)."""
+        for op, *args in ops:
+            getattr(self, '_op_' + op)(*args)
+
+    def _fill(self, color):
+        self._emit('fill', list(color.rgb()))
+
+    def _rect(self, x: float, y: float, width: float, height: float):
+        self._emit('rect', x, y, width, height)
+
+    def _draw_text(self, font_name: str, size: float, cells, centred: bool = False):
+        """cells: (x, y, text); alle Zellen in einem Textobjekt, also ein BT/ET-Block."""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        if centred:
+            cells = [(x - stringWidth(text, font_name, size) / 2, y, text) for x, y, text in cells]
+        self._emit('text', font_name, size, [list(cell) for cell in cells])
+
+    def _draw_columns(self, font_name: str, size: float, col_x, y: float, leading: float, columns):
+        """
+        columns: Texte pro Spalte von oben nach unten, erste Grundlinie y,
+        Zeilenabstand leading. Pro Spalte wird nur einmal positioniert, die
+        Zeilen folgen mit T*.
+        """
+        self._emit('columns', font_name, size, list(col_x), y, leading, [list(texts) for texts in columns])
+
+    def _draw_grid(self, top, col_x, heights, color):
+        self._emit('grid', top, list(col_x), list(heights), list(color.rgb()))
+
+    def _do_form(self, name: str, x: float, y: float):
+        c = self.c
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(name)
+        c.restoreState()
+
+    def _op_fill(self, rgb):
+        self.c.setFillColorRGB(*rgb)
+
+    def _op_rect(self, x, y, width, height):
+        self.c.rect(x, y, width, height, stroke=0, fill=1)
+
+    def _op_text(self, font_name, size, cells):
+        text_object = self.c.beginText()
+        text_object.setFont(font_name, size)
+        for x, y, text in cells:
+            text_object.setTextOrigin(x, y)
+            # textLine instead of textOut: the cursor is set per cell anyway, no string width needed
+            text_object.textLine(text)
+        self.c.drawText(text_object)
+
+    def _op_columns(self, font_name, size, col_x, y, leading, columns):
+        text_object = self.c.beginText()
+        text_object.setFont(font_name, size, leading)
+        for x, texts in zip(col_x, columns):
+            text_object.setTextOrigin(x, y)
+            for text in texts:
+                text_object.textLine(text)
+        self.c.drawText(text_object)
+
+    def _op_grid(self, top, col_x, heights, rgb):
+        c = self.c
+        c.setStrokeColorRGB(*rgb)
+        c.setLineWidth(0.25)
+        lines = []
+        y = top
+        for height in [0] + list(heights):
+            y -= height
+            lines.append((col_x[0], y, col_x[-1], y))
+        lines.extend((x, top, x, y) for x in col_x)
+        c.lines(lines)
+
+
+class _StudentPageLayout(_CanvasLayout):
+    """
+    Schülerseite, Tabelle zentriert. Die Zeilenhöhen entsprechen der
+    früheren TableStyle (Kopf 27 pt, Zeilen 20 pt).
+    """
+
+    TITLE_FONT = ('Helvetica-Bold', 12)
+    TITLE_HEIGHT = 22 + 10          # leading + spaceAfter
+    HEADER_HEIGHT = 27
+    ROW_HEIGHT = 20
+    SPACER = 24                     # "<br/><br/>" after each table
+    HEADER = ('Time', 'Company', 'Room', 'Wish')
+    STATS_HEADER = ('Klasse', 'Ø', 'P10', 'Median', 'P90')
+    STATS_ROW_HEIGHT = 18
+
+    def __init__(self, c):
+        from reportlab.lib.units import mm
+
+        super().__init__(c)
+        self.col_x = self._columns([60*mm, 60*mm, 30*mm, 20*mm])
+        self.stats_col_x = self._columns([40*mm, 30*mm, 30*mm, 30*mm, 30*mm])
+
+    def block_height(self, rows: int) -> float:
+        return self.TITLE_HEIGHT + self.HEADER_HEIGHT + rows * self.ROW_HEIGHT + self.SPACER
+
+    def class_blocks(self, class_name: str, students: List[StudentScheduleView],
+                     cache: Optional[ExportCache] = None) -> List[tuple]:
+        """(Höhe, Layoutdaten ab top=0) pro Schüler:in einer Klasse."""
+        if cache is not None:
+            key = fragment_key('students', [
+                class_name, [[student.name, student.score, student.appointments] for student in students]
+            ])
+            blocks = cache.get(key)
+            if blocks is not None:
+                return blocks
+        blocks = [
+            (self.block_height(len(student.appointments)), self._record(self.draw_student, 0, student, class_name))
+            for student in students
+        ]
+        if cache is not None:
+            cache.put(key, blocks)
+        return blocks
+
+    def place(self, top: float, ops: list):
+        """Setzt einen Block aus class_blocks an die Höhe top."""
+        self.c.saveState()
+        self.c.translate(0, top)
+        self.replay(ops)
+        self.c.restoreState()
+
+    def draw_student(self, top: float, student: StudentScheduleView, class_name: str):
+        self._fill(self.colors.black)
+        self._draw_text(*self.TITLE_FONT, [(self.left, top - 12, f"{student.name} - Klasse {class_name} - Score: {student.score:.1f}%")])
+
+        rows = [
+            (appointment['time'], appointment['company'], appointment['room'], str(appointment['wish_number']))
+            for appointment in student.appointments
+        ]
+        table_top = top - self.TITLE_HEIGHT
+        self._emit('student_frame', len(rows), table_top)
+        self._draw_table_body(table_top - self.HEADER_HEIGHT, self.col_x, rows, self.ROW_HEIGHT, row_base=4)
+
+    def _op_student_frame(self, rows: int, top: float):
+        """Kopf und Gitter einer Schülertabelle, pro Zeilenzahl einmal als Form-XObject."""
+        name = f"student_{rows}"
+        if name not in self._forms:
+            c = self.c
+            width = self.col_x[-1] - self.col_x[0]
+            heights = [self.HEADER_HEIGHT] + [self.ROW_HEIGHT] * rows
+            # the form is drawn in its own coordinates: top left corner at (0, 0)
+            c.beginForm(name, 0, -sum(heights), width, 0)
+            self._draw_table_frame(0, [x - self.col_x[0] for x in self.col_x], self.HEADER, heights,
+                                   header_base=14, grid_color=self.colors.red)
+            c.endForm()
+            self._forms.add(name)
+        self._do_form(name, self.col_x[0], top)
+
+    def draw_summary(self, summary: SatisfactionSummary):
+        from reportlab.lib.utils import simpleSplit
+
+        c = self.c
+        self._fill(self.colors.black)
+        self._draw_text(*self.TITLE_FONT, [(self.left, self.top - 12, "Auswertung")])
+        y = self.top - self.TITLE_HEIGHT
+        lines = simpleSplit(summary.overview_text(), 'Helvetica', 10, self.PAGE_SIZE[0] - 2 * self.left)
+        self._draw_columns('Helvetica', 10, [self.left], y - 10, 12, [lines])
+        y -= 12 * len(lines)
+
+        rows = [
+            (class_name, *[f"{value:.1f}%" for value in stats])
+            for class_name, stats in sorted(summary.class_stats().items())
+        ]
+        while True:
+            per_page = int((y - self.bottom) // self.STATS_ROW_HEIGHT) - 1
+            chunk, rows = rows[:per_page], rows[per_page:]
+            heights = [self.STATS_ROW_HEIGHT] * (len(chunk) + 1)
+            self._draw_table(y, self.stats_col_x, self.STATS_HEADER, chunk, heights,
+                             header_base=5, row_base=5, grid_color=self.colors.grey)
+            if not rows:
+                break
+            c.showPage()
+            y = self.top
+
+    def _draw_table(self, top, col_x, header, rows, heights, header_base, row_base, grid_color):
+        self._draw_table_frame(top, col_x, header, heights, header_base, grid_color)
+        # body rows share one height
+        self._draw_table_body(top - heights[0], col_x, rows, heights[-1], row_base)
+
+    def _draw_table_frame(self, top, col_x, header, heights, header_base, grid_color):
+        colors = self.colors
+
+        self._fill(colors.grey)
+        self._rect(col_x[0], top - heights[0], col_x[-1] - col_x[0], heights[0])
+        self._fill(colors.whitesmoke)
+        y = top - heights[0]
+        self._draw_text('Helvetica-Bold', 10, [(x + self.PADDING, y + header_base, text) for x, text in zip(col_x, header)])
+        self._draw_grid(top, col_x, heights, grid_color)
+
+    def _draw_table_body(self, top, col_x, rows, row_height, row_base):
+        self._fill(self.colors.black)
+        if rows:
+            self._draw_columns('Helvetica', 10, [x + self.PADDING for x in col_x], top - row_height + row_base, row_height,
+                               [[str(text) for text in column] for column in zip(*rows)])
+
+
+def render_attendance_lists(output_path: str, sessions: List[CompanySession],
+                            cache: Optional[ExportCache] = None, progress: Progress = None) -> str:
+    """
+    Anwesenheitslisten, eine Veranstaltung pro Seite (bei vielen
+    Teilnehmer:innen auf Folgeseiten fortgesetzt). Das Tabellengerüst mit
+    Kopfzeile, Gitter, Nummernspalte und den fünf Leerzeilen wird pro
+    Zeilenzahl einmal als Form-XObject angelegt und nur referenziert; pro
+    Veranstaltung kommen Überschrift, Namen und Klassen dazu; mit cache
+    kommen deren Layoutdaten für unveränderte Veranstaltungen aus dem Cache.
+    progress wird nach jeder Veranstaltung aufgerufen.
+    """
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(output_path, pagesize=_AttendancePageLayout.PAGE_SIZE)
+    layout = _AttendancePageLayout(c)
+    first_page = True
+    for done, session in enumerate(sessions, 1):
+        for page in layout.session_pages(session, cache):
+            if not first_page:
+                c.showPage()
+            first_page = False
+            layout.draw_page(*page)
+        if progress is not None:
+            progress(done, len(sessions))
+    c.save()
+    return output_path
+
+
+class _AttendancePageLayout(_CanvasLayout):
+    """
+    Maße wie die frühere platypus-Tabelle: Überschrift Heading1 (18 pt,
+    Zeilenabstand 22), Spalten 20/80/30/50 mm zentriert, Kopf 27 pt,
+    Zeilen 24 pt, Text zentriert.
+    """
+
+    HEADING_FONT = ('Helvetica-Bold', 18)
+    HEADING_LEADING = 22
+    HEADING_SPACE = 6
+    HEADER_HEIGHT = 27
+    ROW_HEIGHT = 24
+    EMPTY_ROWS = 5
+    HEADER = ('Nr.', 'Name', 'Klasse', 'Unterschrift')
+
+    def __init__(self, c):
+        from reportlab.lib.units import mm
+
+        super().__init__(c)
+        self.col_x = self._columns([20*mm, 80*mm, 30*mm, 50*mm])
+        self.centres = [(a + b) / 2 for a, b in zip(self.col_x, self.col_x[1:])]
+
+    def session_pages(self, session: CompanySession, cache: Optional[ExportCache] = None) -> List[list]:
+        """Pro Seite: [Tabellenoberkante, erste Nummer, Zeilen, Layoutdaten für den Text]."""
+        from reportlab.lib.utils import simpleSplit
+
+        heading = simpleSplit(session.company.name, *self.HEADING_FONT, self.frame_width) or ['']
+        heading += [f"Zeitfenster: {session.time_slot} ({session.time_range})", f"Raum: {session.room}"]
+        students = [
+            (student['name'], student['id'].split('_')[0])
+            for student in sorted(session.students, key=lambda x: x['name'])
+        ]
+        if cache is not None:
+            key = fragment_key('attendance', [heading, students])
+            pages = cache.get(key)
+            if pages is not None:
+                return pages
+
+        total = len(students) + self.EMPTY_ROWS
+        table_top = self.top - len(heading) * self.HEADING_LEADING - self.HEADING_SPACE
+        per_page = max(1, int((table_top - self.bottom - self.HEADER_HEIGHT) // self.ROW_HEIGHT))
+
+        pages = []
+        for first in range(0, total, per_page):
+            rows = min(per_page, total - first)
+            ops = self._record(self._draw_page_text, heading, students[first:first + rows], table_top)
+            pages.append([table_top, first + 1, rows, ops])
+        if cache is not None:
+            cache.put(key, pages)
+        return pages
+
+    def draw_page(self, table_top: float, first_number: int, rows: int, ops: list):
+        self._draw_skeleton(table_top, first_number, rows)
+        self.replay(ops)
+
+    def _draw_page_text(self, heading: List[str], students: List[tuple], table_top: float):
+        self._fill(self.colors.black)
+        self._draw_text(*self.HEADING_FONT, [
+            (self.left, self.top - self.HEADING_FONT[1] - i * self.HEADING_LEADING, line)
+            for i, line in enumerate(heading)
+        ])
+        cells = []
+        y = table_top - self.HEADER_HEIGHT
+        for name, class_name in students:
+            y -= self.ROW_HEIGHT
+            cells.append((self.centres[1], y + 8, name))
+            cells.append((self.centres[2], y + 8, class_name))
+        self._draw_text('Helvetica', 10, cells, centred=True)
+
+    def _draw_skeleton(self, top: float, first_number: int, rows: int):
+        """Kopf, Gitter und Zeilennummern first_number.. als wiederverwendbares Form-XObject."""
+        c = self.c
+        name = f"attendance_{first_number}_{rows}"
+        width = self.col_x[-1] - self.col_x[0]
+        if name not in self._forms:
+            height = self.HEADER_HEIGHT + rows * self.ROW_HEIGHT
+            # the form is drawn in its own coordinates: top left corner at (0, 0)
+            c.beginForm(name, 0, -height, width, 0)
+            col_x = [x - self.col_x[0] for x in self.col_x]
+            centres = [centre - self.col_x[0] for centre in self.centres]
+            self._fill(self.colors.grey)
+            self._rect(0, -self.HEADER_HEIGHT, width, self.HEADER_HEIGHT)
+            self._fill(self.colors.whitesmoke)
+            self._draw_text('Helvetica-Bold', 10, [
+                (centre, -self.HEADER_HEIGHT + 14, text) for centre, text in zip(centres, self.HEADER)
+            ], centred=True)
+            self._fill(self.colors.black)
+            self._draw_text('Helvetica', 10, [
+                (centres[0], -self.HEADER_HEIGHT - (i + 1) * self.ROW_HEIGHT + 8, str(first_number + i))
+                for i in range(rows)
+            ], centred=True)
+            self._draw_grid(0, col_x, [self.HEADER_HEIGHT] + [self.ROW_HEIGHT] * rows, self.colors.black)
+            c.endForm()
+            self._forms.add(name)
+        self._do_form(name, self.col_x[0], top)
+
+
+def render_schedule_overview(
+    output_path: str,
+    time_slots: List[Tuple[str, str]],
+    rows: List[Tuple[str, List[str]]],
+    progress: Progress = None
+) -> str:
+    """
+    Zeitplanübersicht Unternehmen x Slots (Querformat). rows: Name des
+    Unternehmens und Zelltext pro Slot. progress wird pro Seite aufgerufen.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+    # Create PDF
+    doc = SimpleDocTemplate(
+        output_path,
+        pagesize=landscape(A4),
+        rightMargin=10*mm,
+        leftMargin=10*mm,
+        topMargin=10*mm,
+        bottomMargin=10*mm
+    )
+
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Add title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=20
+    )
+    story.append(Paragraph("Zeitplan Übersicht", title_style))
+
+    # Prepare table data
+    headers = ['Unternehmen'] + [f"{slot} ({time})" for slot, time in time_slots]
+    table_data = [headers] + [[name] + cells for name, cells in rows]
+
+    # Create and style the table
+    col_widths = [40*mm] + [30*mm] * len(time_slots)
+    t = Table(table_data, colWidths=col_widths, repeatRows=1)
+    t.setStyle(TableStyle([
+        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
+        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('BOTTOMPADDING', (0,0), (-1,0), 12),
+        ('BACKGROUND', (0,1), (-1,-1), colors.white),
+        ('TEXTCOLOR', (0,1), (-1,-1), colors.black),
+        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,1), (-1,-1), 9),
+        ('ALIGN', (0,1), (-1,-1), 'CENTER'),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ('BOX', (0,0), (-1,-1), 2, colors.black),
+        ('LINEBELOW', (0,0), (-1,0), 2, colors.black),
+    ]))
+
+    story.append(t)
+
+    def on_page(canvas, doc):
+        # total page count is only known after the build
+        if progress is not None:
+            progress(doc.page, 0)
+
+    doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    if progress is not None:
+        progress(doc.page, doc.page)
+    return output_path
+
+
+def class_file_name(class_name: str) -> str:
+    # class names end up in file names, keep them portable
+    return "student_schedules_" + re.sub(r'[^\w.-]', '_', class_name) + ".pdf"
+
+
+def export_class_pdfs(
+    output_dir: str,
+    class_schedules: Dict[str, List[StudentScheduleView]],
+    summary: Optional[SatisfactionSummary] = None,
+    workers: Optional[int] = None,
+    combine: Optional[str] = None,
+    cache: Optional[ExportCache] = None
+) -> List[str]:
+    """
+    Ein PDF pro Klasse, die Klassen werden parallel in Prozessen gerendert.
+    Die Auswertung (summary) wird zu student_schedules_auswertung.pdf.
+    combine: None, 'pdf' (alles in student_schedules.pdf) oder 'zip'.
+    Rückgabe: Pfade der Einzeldateien, bei combine zuletzt die Gesamtdatei.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    if summary is not None:
+        jobs.append((os.path.join(output_dir, "student_schedules_auswertung.pdf"), {}, summary, cache))
+    used = set()
+    for class_name, students in sorted(class_schedules.items()):
+        file_name = class_file_name(class_name)
+        # 'HÖH222' and 'HöH222' would overwrite each other on Windows
+        n = 1
+        while file_name.casefold() in used:
+            n += 1
+            file_name = class_file_name(f"{class_name}_{n}")
+        used.add(file_name.casefold())
+        jobs.append((os.path.join(output_dir, file_name), {class_name: students}, None, cache))
+
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        paths = [render_student_schedules(*job) for job in jobs]
+    else:
+        # largest classes first so no worker is left with a big one at the end
+        order = sorted(range(len(jobs)), key=lambda i: -sum(len(students) for students in jobs[i][1].values()))
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_binary_streams) as pool:
+            futures = {i: pool.submit(render_student_schedules, *jobs[i]) for i in order}
+            paths = [futures[i].result() for i in range(len(jobs))]
+
+    if combine == 'pdf':
+        paths.append(merge_pdfs(paths, os.path.join(output_dir, "student_schedules.pdf")))
+    elif combine == 'zip':
+        zip_path = os.path.join(output_dir, "student_schedules.zip")
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                archive.write(path, os.path.basename(path))
+        paths.append(zip_path)
+    return paths
+
+
+def merge_pdfs(paths: List[str], output_path: str) -> str:
+    """Hängt die PDFs in der gegebenen Reihenfolge aneinander (pypdf)."""
+    try:
+        from pypdf import PdfWriter
+    except ImportError as e:
+        raise ExportError("Zum Zusammenführen der PDFs wird pypdf benötigt (pip install pypdf)") from e
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+    return output_path
@@ -0,0 +1,77 @@
+import heapq
+from typing import List, Set
+import numpy as np
+
+
+def demand_histogram(wish_matrix: np.ndarray, n_companies: int) -> np.ndarray:
+    """
+    Nachfrage pro Unternehmen und Wunschrang (Unternehmen x Ränge).
+    wish_matrix: Schüler:innen x Ränge mit Unternehmens-IDs, -1 = leer/unbekannt
+    """
+    n_ranks = wish_matrix.shape[1]
+    ranks = np.broadcast_to(np.arange(n_ranks), wish_matrix.shape)
+    valid = (wish_matrix >= 0) & (wish_matrix < n_companies)
+    flat = wish_matrix[valid].astype(np.int64) * n_ranks + ranks[valid]
+    return np.bincount(flat, minlength=n_companies * n_ranks).reshape(n_companies, n_ranks)
+
+
+def weighted_demand(histogram: np.ndarray, n_slots: int) -> np.ndarray:
+    """
+    Erwartete Teilnehmerzahl pro Unternehmen. Die Ränge werden wie beim
+    Erfüllungsscore gewichtet (6, 5, ..., 1) und so normiert, dass jede:r
+    Schüler:in insgesamt n_slots Plätze nachfragt.
+    """
+    n_ranks = histogram.shape[1]
+    weights = np.arange(n_ranks, 0, -1, dtype=np.float64)
+    weights *= n_slots / weights.sum()
+    return histogram @ weights
+
+
+def plan_sessions(
+    demand: np.ndarray,
+    capacity: np.ndarray,
+    max_sessions: np.ndarray,
+    allowed_slots: List[List[int]],
+    n_rooms: int,
+    n_slots: int,
+    own_room: Set[int] = frozenset(),
+    slack: float = 0.5
+) -> List[List[int]]:
+    """
+    Legt fest, in welchen Slots jedes Unternehmen eine Veranstaltung anbietet.
+
+    Es wird immer das Unternehmen mit der größten ungedeckten Nachfrage
+    bedient, und zwar im am wenigsten belegten erlaubten Slot, solange dort
+    noch ein Raum frei ist. Unternehmen in own_room (z. B. Polizei/Aula)
+    belegen keinen der allgemeinen Räume. Solange Räume frei sind, wird
+    nachgelegt, bis die ungedeckte Nachfrage unter -slack * Kapazität fällt;
+    der Puffer lässt der Zuteilung Spielraum bei Slotkonflikten.
+    """
+    n_companies = len(allowed_slots)
+    unmet = demand.astype(np.float64).copy()
+    capacity = capacity.tolist()
+    max_sessions = max_sessions.tolist()
+    load = [0] * n_slots
+    open_slots: List[List[int]] = [[] for _ in range(n_companies)]
+
+    heap = [(-unmet[c], c) for c in range(n_companies) if unmet[c] > 0 and allowed_slots[c]]
+    heapq.heapify(heap)
+    while heap:
+        _, c = heapq.heappop(heap)
+        if len(open_slots[c]) >= max_sessions[c] or capacity[c] <= 0:
+            continue
+        candidates = [
+            slot for slot in allowed_slots[c]
+            if slot not in open_slots[c] and (c in own_room or load[slot] < n_rooms)
+        ]
+        if not candidates:
+            continue
+        slot = min(candidates, key=lambda t: (load[t], t))
+        open_slots[c].append(slot)
+        if c not in own_room:
+            load[slot] += 1
+        unmet[c] -= capacity[c]
+        if unmet[c] > -slack * capacity[c]:
+            heapq.heappush(heap, (-unmet[c], c))
+
+    return [sorted(slots) for slots in open_slots]
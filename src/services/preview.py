@@ -0,0 +1,152 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from models.company import CompanySession
+from models.student import StudentScheduleView
+
+ATTENDANCE_HEADER = ('Nr.', 'Name', 'Klasse', 'Unterschrift')
+SIGNATURE_LINE = "________________"
+EMPTY_ROWS = 5
+
+# row heights in pixels, including the paddings of the former label grid
+TITLE_SPACE, TITLE_HEIGHT = 20, 22
+TEXT_HEIGHT = 21
+ROOM_HEIGHT = 29
+ROW_HEIGHT = 21
+
+
+@dataclass
+class PreviewRow:
+    top: int
+    height: int
+    style: str                  # 'title', 'text', 'header' or 'cell'
+    cells: Tuple[str, ...]
+
+
+class RowLayout:
+    """
+    Zeilen einer Vorschau mit festen Höhen untereinander. visible() findet
+    per Bisektion die Zeilen eines Ausschnitts, die GUI zeichnet nur diese.
+    """
+
+    def __init__(self):
+        self.rows: List[PreviewRow] = []
+        self.height = 0
+        self._tops: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, style: str, cells: Iterable[str], height: int, space_before: int = 0):
+        top = self.height + space_before
+        self.rows.append(PreviewRow(top, height, style, tuple(cells)))
+        self._tops.append(top)
+        self.height = top + height
+
+    def visible(self, top: float, bottom: float) -> range:
+        """Indizes der Zeilen, die den Bereich top..bottom berühren."""
+        start = max(0, bisect_right(self._tops, top) - 1)
+        return range(start, bisect_right(self._tops, bottom))
+
+
+def attendance_layout(sessions: Sequence[CompanySession]) -> RowLayout:
+    """
+    Anwesenheitslisten aller Veranstaltungen wie im PDF: Unternehmen,
+    Zeitfenster, Raum, Kopfzeile, Teilnehmer:innen und fünf Leerzeilen.
+    """
+    layout = RowLayout()
+    for session in sessions:
+        layout.add('title', [session.company.name], TITLE_HEIGHT, space_before=TITLE_SPACE)
+        layout.add('text', [f"Zeitfenster: {session.time_slot} ({session.time_range})"], TEXT_HEIGHT)
+        layout.add('text', [f"Raum: {session.room}"], ROOM_HEIGHT)
+        layout.add('header', ATTENDANCE_HEADER, ROW_HEIGHT)
+        students = sorted(session.students, key=lambda x: x['name'])
+        for number, student in enumerate(students, 1):
+            layout.add('cell', [str(number), student['name'], student['id'].split('_')[0], SIGNATURE_LINE], ROW_HEIGHT)
+        for number in range(len(students) + 1, len(students) + EMPTY_ROWS + 1):
+            layout.add('cell', [str(number), '', '', SIGNATURE_LINE], ROW_HEIGHT)
+    return layout
+
+
+def column_positions(layout: RowLayout, measure: Callable[[str, str], int],
+                     left: int = 5, gap: int = 10) -> List[int]:
+    """
+    x-Position jeder Spalte, so breit wie ihr längster Text (wie das frühere
+    Label-Grid mit padx=5). measure(Stil, Text) liefert die Breite in Pixeln. Zeilen mit
+    nur einer Zelle (Titel, Text) dürfen über die Spalten hinauslaufen.
+    """
+    texts: Dict[Tuple[str, int], set] = {}
+    for row in layout.rows:
+        if len(row.cells) > 1:
+            for column, text in enumerate(row.cells):
+                texts.setdefault((row.style, column), set()).add(text)
+    widths: List[int] = []
+    for (style, column), values in texts.items():
+        widths.extend([0] * (column + 1 - len(widths)))
+        widths[column] = max([widths[column]] + [measure(style, text) for text in values])
+    positions = [left]
+    for width in widths[:-1]:
+        positions.append(positions[-1] + width + gap)
+    return positions
+
+
+def class_title(class_name: str, stats: Sequence[float]) -> str:
+    mean, p10, median, p90 = stats
+    return f"Klasse {class_name} - Ø {mean:.1f}% (Median {median:.1f}%, P10 {p10:.1f}%, P90 {p90:.1f}%)"
+
+
+def student_rows(students: Sequence[StudentScheduleView]) -> List[Tuple[str, str, List[Tuple[str, ...]]]]:
+    """Pro Schüler:in: ID, Titelzeile und die Termine als (Zeit, Unternehmen, Raum, Wunsch)."""
+    return [
+        (
+            student.student_id,
+            f"{student.name} - Bewertung: {student.score:.1f}%",
+            [
+                (appointment['time'], appointment['company'], appointment['room'], str(appointment['wish_number']))
+                for appointment in student.appointments
+            ],
+        )
+        for student in students
+    ]
+
+
+def schedule_rows(companies, schedule, time_slots) -> Dict[str, Tuple[str, ...]]:
+    """
+    Zeilen der Zeitplanansicht mit fester iid pro Unternehmen:
+    iid -> (Name, Zelltext pro Slot).
+    """
+    rows = {}
+    for company in companies or []:
+        cells = [company.name]
+        for slot_idx in range(len(time_slots)):
+            text = ""
+            if slot_idx >= company.earliest_slot:
+                session = schedule.session(company.company_id, slot_idx)
+                if session:
+                    count = len(session.students)
+                    text = f"Raum: {session.room}"
+                    if count > 0:
+                        text += f"\n({count} Schü{'' if count == 1 else 'ler:innen'})"
+            cells.append(text)
+        rows[f"company-{company.company_id}"] = tuple(cells)
+    return rows
+
+
+def diff_rows(old: Dict[str, Tuple[str, ...]], new: Dict[str, Tuple[str, ...]]):
+    """
+    Unterschied zweier Zeilenstände: entfernte iids, neue iids (mit
+    Position in new) und geänderte Zellen als (iid, Spalte, Text).
+    """
+    removed = [iid for iid in old if iid not in new]
+    added = []
+    changed = []
+    for position, (iid, values) in enumerate(new.items()):
+        before = old.get(iid)
+        if before is None:
+            added.append((position, iid))
+        elif before != values:
+            changed.extend(
+                (iid, column, text) for column, (text, previous) in enumerate(zip(values, before)) if text != previous
+            )
+    return removed, added, changed
@@ -0,0 +1,61 @@
+from typing import List, Dict
+
+from services.errors import ScheduleGenerationError
+
+
+class RoomAllocationError(ScheduleGenerationError):
+    pass
+
+
+def allocate_rooms(
+    session_masks: Dict[int, int],
+    rooms: List[str],
+    time_slots: List[str]
+) -> Dict[int, Dict[int, str]]:
+    """
+    Verteilt Räume auf Unternehmen ohne Doppelbelegung.
+
+    session_masks: Unternehmens-ID -> Bitmaske der Slots mit Veranstaltung
+    rooms: verfügbare Räume
+    time_slots: Slotbezeichnungen (für die Fehlermeldung)
+    Rückgabe: Unternehmens-ID -> {slot_idx: Raum}
+
+    Jeder Raum führt seine Belegung als Bitmaske. Unternehmen bleiben nach
+    Möglichkeit den ganzen Tag in einem Raum; Unternehmen mit disjunkten
+    Slots (z. B. unterschiedlichem frühesten Zeitpunkt) teilen sich Räume.
+    """
+    # fail fast: a slot needs more rooms than exist
+    demand = [sum(1 for mask in session_masks.values() if mask >> slot & 1) for slot in range(len(time_slots))]
+    missing = [
+        f"{time_slots[slot]}: {count} Veranstaltungen, {len(rooms)} Räume"
+        for slot, count in enumerate(demand) if count > len(rooms)
+    ]
+    if missing:
+        raise RoomAllocationError("Zu wenige Räume für " + "; ".join(missing))
+
+    occupied = [0] * len(rooms)
+    allocation: Dict[int, Dict[int, str]] = {}
+
+    # most sessions first (stable, keeps the caller's order), best fit = fullest room that still has the slots free
+    order = sorted(session_masks, key=lambda c: -bin(session_masks[c]).count('1'))
+    for company_id in order:
+        mask = session_masks[company_id]
+        slots = [slot for slot in range(len(time_slots)) if mask >> slot & 1]
+        best = -1
+        for room_idx, room_mask in enumerate(occupied):
+            if room_mask & mask == 0 and (best < 0 or bin(room_mask).count('1') > bin(occupied[best]).count('1')):
+                best = room_idx
+        if best >= 0:
+            occupied[best] |= mask
+            allocation[company_id] = {slot: rooms[best] for slot in slots}
+            continue
+
+        # no single room is free for the whole day, change rooms between slots
+        allocation[company_id] = {}
+        for slot in slots:
+            bit = 1 << slot
+            room_idx = next(idx for idx, room_mask in enumerate(occupied) if not room_mask & bit)
+            occupied[room_idx] |= bit
+            allocation[company_id][slot] = rooms[room_idx]
+
+    return allocation
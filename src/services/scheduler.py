@@ -1,17 +1,44 @@
-from typing import List, Dict, Optional, Tuple
+from dataclasses import replace
+from typing import Callable, List, Dict, Optional, Union
+import numpy as np
 import pandas as pd
-from tkinter import messagebox
 
-from models.student import StudentPreference
-from models.company import Company, CompanySession
+from models.student import (
+    StudentPreference, PreferenceMatrix, PreferenceDelta, StudentScheduleView, SatisfactionSummary,
+    MAX_WISHES, summarize_satisfaction
+)
+from models.company import Company, CompanySession, CompanyTable, SessionGrid
+from services.assignment import assign_students
+from services.rooms import allocate_rooms
+from services.planning import demand_histogram, weighted_demand, plan_sessions
+from services.local_search import improve_assignment
+from services.errors import SchedulerError, ScheduleGenerationError, ExportError, SnapshotError
+from services.snapshots import write_snapshot, read_snapshot
+from services.pdf_export import (
+    render_student_schedules, render_attendance_lists, render_schedule_overview, export_class_pdfs
+)
+from services.export_cache import ExportCache
 
 class SchedulerService:
     def __init__(self):
         self.student_preferences: Optional[List[StudentPreference]] = None
-        self.companies: Optional[List[Company]] = None
+        self.companies: Optional[CompanyTable] = None
         self.rooms: Optional[List[str]] = None
-        # Schedule: maps, company name, slot
-        self.schedule: Dict[Tuple[str, int], CompanySession] = {}
+        # Schedule: grid companies x slots, indexed by company id, slot
+        self.schedule = SessionGrid()
+        # reverse index: student row -> company id per slot (-1 = free)
+        self.student_slots = np.empty((0, 0), dtype=np.int64)
+        self.student_rows: Dict[str, int] = {}
+        # bumped on every schedule change, invalidates the cached views
+        self.schedule_version = 0
+        self._student_views: Optional[Dict[str, List[StudentScheduleView]]] = None
+        self._student_views_version = -1
+        self._satisfaction: Optional[SatisfactionSummary] = None
+        self._satisfaction_version = -1
+        # companies x wish ranks, cached for fast re-planning
+        self._demand_histogram: Optional[np.ndarray] = None
+        # rendered page fragments per class / session, None = always render everything
+        self.export_cache: Optional[ExportCache] = None
         # list of tuples: slot letter, time range
         self.time_slots = [
             ('A', '8:45 – 9:30'),
@@ -25,22 +52,354 @@ class SchedulerService:
         if df is None or df.empty:
             return False
         
-        company_mapping = {}
-        if self.companies:
-            for idx, company in enumerate(self.companies, 1):
-                normalized_name = company.name.strip()
-                company_mapping[idx] = normalized_name
-                company_mapping[str(idx)] = normalized_name
-        
         df.columns = df.columns.str.strip()
-        self.student_preferences = StudentPreference.from_dataframe(df, company_mapping)
+        return self.load_student_matrix(StudentPreference.from_dataframe(df))
+
+    def load_student_matrix(self, prefs: PreferenceMatrix) -> bool:
+        """Übernimmt eine fertige Wunschmatrix, z. B. aus workbooks.stream_preferences."""
+        if prefs is None or len(prefs) == 0:
+            return False
+        if self.companies:
+            # wish numbers -> names, resolved lazily by the matrix
+            prefs.company_mapping = dict(enumerate(self.companies.names.tolist(), 1))
+        self.student_preferences = prefs
+        self._demand_histogram = None
+        self._index_students()
         return True
 
+    def load_all(self, rooms: pd.DataFrame, companies: pd.DataFrame,
+                 preferences: Union[pd.DataFrame, PreferenceMatrix]) -> Dict[str, bool]:
+        """
+        Übernimmt alle drei Eingaben, z. B. aus workbooks.read_all. Die
+        Unternehmen kommen vor den Wünschen, weil die Wunschnummern über
+        self.companies auf Namen abgebildet werden.
+        """
+        loaded = {
+            'rooms': self.load_rooms(rooms),
+            'companies': self.load_companies(companies),
+        }
+        if isinstance(preferences, PreferenceMatrix):
+            loaded['preferences'] = self.load_student_matrix(preferences)
+        else:
+            loaded['preferences'] = self.load_student_preferences(preferences)
+        return loaded
+
+    def reimport_student_preferences(self, preferences: Union[pd.DataFrame, PreferenceMatrix]) -> Optional[PreferenceDelta]:
+        """
+        Liest eine geänderte Wahlliste in einen bestehenden Zeitplan ein. Die
+        IDs hängen nur an Klasse und Name, daher werden neue, entfernte und
+        geänderte Schüler:innen erkannt. Alle anderen behalten ihre
+        Veranstaltungen; Geänderte behalten die, die noch auf ihrer Liste
+        stehen. Nur die freien Slots der Betroffenen werden neu vergeben, auf
+        die Restplätze der bestehenden Veranstaltungen. Ohne Zeitplan wie
+        load_student_preferences. Gibt None zurück, wenn die Liste leer ist.
+        """
+        if isinstance(preferences, pd.DataFrame):
+            if preferences.empty:
+                return None
+            preferences.columns = preferences.columns.str.strip()
+            preferences = StudentPreference.from_dataframe(preferences)
+        if preferences is None or len(preferences) == 0:
+            return None
+
+        old_ids = self._student_ids()
+        old_rows = dict(self.student_rows)
+        old_wishes = self._wish_matrix() if old_ids else None
+        old_slots = self.student_slots
+        had_schedule = len(self.schedule) > 0
+
+        self.load_student_matrix(preferences)
+        new_ids = self._student_ids()
+        new_wishes = self._wish_matrix()
+        new_id_set = set(new_ids)
+        delta = PreferenceDelta(
+            added=[student_id for student_id in new_ids if student_id not in old_rows],
+            removed=[student_id for student_id in old_ids if student_id not in new_id_set],
+            changed=[
+                student_id for row, student_id in enumerate(new_ids)
+                if student_id in old_rows and not np.array_equal(old_wishes[old_rows[student_id]], new_wishes[row])
+            ]
+        )
+        if not had_schedule:
+            return delta
+
+        # carry over kept assignments by id, changed students keep still-wished companies
+        student_slots = np.full((len(new_ids), len(self.time_slots)), -1, dtype=np.int64)
+        changed = set(delta.changed)
+        affected = []
+        for row, student_id in enumerate(new_ids):
+            old_row = old_rows.get(student_id)
+            if old_row is not None:
+                student_slots[row] = old_slots[old_row]
+            if student_id in changed:
+                kept = np.isin(student_slots[row], new_wishes[row])
+                student_slots[row, ~kept] = -1
+            if old_row is None or student_id in changed:
+                affected.append(row)
+        self._apply_student_slots(student_slots)
+        if affected:
+            self._fill_students(affected, new_wishes, set())
+        return delta
+
+    def _fill_students(self, rows: List[int], wish_matrix: np.ndarray, changed: set):
+        """
+        Vergibt die freien Slots der Zeilen rows auf die Restplätze des
+        bestehenden Plans (Min-Cost-Flow), danach für noch freie Slots
+        augmentierende Züge über _augment_seat. changed sammelt die
+        veränderten Veranstaltungen.
+        """
+        counts = self.schedule.student_counts()
+        open_slots = [np.flatnonzero(row >= 0).tolist() for row in counts]
+        seats = np.where(counts >= 0, self.companies.capacity[:, None] - counts, 0)
+        busy = [
+            {slot_idx: company_id for slot_idx, company_id in enumerate(self.student_slots[row].tolist()) if company_id >= 0}
+            for row in rows
+        ]
+        assignments = assign_students(
+            wish_matrix[rows].tolist(),
+            self.companies.capacity.tolist(),
+            open_slots,
+            len(self.time_slots),
+            seats=seats.tolist(),
+            busy=busy
+        )
+        for row, slots in zip(rows, assignments):
+            for slot_idx, company_id in slots.items():
+                self._seat_student(row, company_id, slot_idx)
+                changed.add((company_id, slot_idx))
+
+        n_companies = len(self.companies)
+        for row in rows:
+            for slot_idx in np.flatnonzero(self.student_slots[row] < 0).tolist():
+                for company_id in wish_matrix[row].tolist():
+                    if 0 <= company_id < n_companies and self._augment_seat(row, company_id, slot_idx, changed):
+                        break
+        self.schedule_version += 1
+
+    def _augment_seat(self, row: int, company_id: int, slot_idx: int, changed: set) -> bool:
+        """
+        Setzt row in die volle Veranstaltung (company_id, slot_idx), indem
+        eine andere Person in eine Veranstaltung desselben Unternehmens in
+        einem Slot wechselt, in dem sie frei ist. Für sie ändert sich nur die Uhrzeit.
+        """
+        session = self.schedule.session(company_id, slot_idx)
+        if session is None or company_id in self.student_slots[row]:
+            return False
+        for target_slot in range(len(self.time_slots)):
+            target = self.schedule.session(company_id, target_slot)
+            if target_slot == slot_idx or target is None or target.is_full():
+                continue
+            for student in session.students:
+                other = self.student_rows[student['id']]
+                if self.student_slots[other, target_slot] < 0:
+                    self._unseat_student(other, slot_idx)
+                    self._seat_student(other, company_id, target_slot)
+                    self._seat_student(row, company_id, slot_idx)
+                    changed.update({(company_id, slot_idx), (company_id, target_slot)})
+                    return True
+        return False
+
+    def _seat_student(self, row: int, company_id: int, slot_idx: int):
+        student = self.student_preferences[row]
+        self.schedule.session(company_id, slot_idx).add_student(student.student_id, student.name)
+        self.student_slots[row, slot_idx] = company_id
+
+    def _unseat_student(self, row: int, slot_idx: int) -> int:
+        company_id = int(self.student_slots[row, slot_idx])
+        session = self.schedule.session(company_id, slot_idx)
+        if session is not None:
+            student_id = self.student_preferences.student_ids[row]
+            session.students[:] = [student for student in session.students if student['id'] != student_id]
+        self.student_slots[row, slot_idx] = -1
+        return company_id
+
+    def update_student(self, student_id: str, wishes: List[Union[int, str]]) -> List[tuple]:
+        """
+        Ändert die Wünsche einer Person im bestehenden Zeitplan. wishes sind
+        Unternehmens-IDs (int, eindeutig auch bei gleichnamigen Unternehmen)
+        oder Namen; Unbekanntes wirft SchedulerError. Veranstaltungen, die
+        nicht mehr gewünscht sind, werden frei und neu vergeben; alle anderen
+        Zuteilungen bleiben. Gibt die geänderten (company_id, slot_idx) zurück.
+        """
+        prefs = self.student_preferences
+        row = self.student_rows.get(student_id)
+        if row is None or not isinstance(prefs, PreferenceMatrix):
+            raise SchedulerError(f"Unbekannte:r Schüler:in: {student_id}")
+        if len(wishes) > MAX_WISHES:
+            raise SchedulerError(f"Höchstens {MAX_WISHES} Wünsche")
+
+        company_ids = []
+        for wish in wishes:
+            if isinstance(wish, (int, np.integer)):
+                company_id = int(wish) if 0 <= wish < len(self.companies) else -1
+            else:
+                company_id = self.companies.resolve(wish)
+            if company_id < 0:
+                raise SchedulerError(f"Unbekanntes Unternehmen: {wish}")
+            company_ids.append(company_id)
+        prefs.set_choices(row, [company_id + 1 for company_id in company_ids])
+        self._demand_histogram = None
+
+        wish_matrix = self._wish_matrix()
+        changed = set()
+        for slot_idx, company_id in enumerate(self.student_slots[row].tolist()):
+            if company_id >= 0 and company_id not in wish_matrix[row]:
+                self._unseat_student(row, slot_idx)
+                changed.add((company_id, slot_idx))
+        self._fill_students([row], wish_matrix, changed)
+        return sorted(changed)
+
+    def update_company(self, company_id: int, capacity: Optional[int] = None,
+                       max_sessions: Optional[int] = None, earliest_slot: Optional[int] = None) -> List[tuple]:
+        """
+        Ändert Kapazität, max. Veranstaltungen oder frühesten Slot eines
+        Unternehmens im bestehenden Zeitplan. Nicht mehr erlaubte
+        Veranstaltungen ziehen nach Möglichkeit in einen erlaubten Slot mit
+        freiem Raum um, überzählige Teilnehmer:innen (schlechtester Wunschrang
+        zuerst) werden wie alle Betroffenen neu vergeben. Gibt die geänderten
+        (company_id, slot_idx) zurück.
+        """
+        companies = self.companies
+        if not isinstance(companies, CompanyTable) or not 0 <= company_id < len(companies):
+            raise SchedulerError(f"Unbekanntes Unternehmen: {company_id}")
+        old_capacity = int(companies.capacity[company_id])
+        if capacity is not None:
+            companies.capacity[company_id] = capacity
+        if max_sessions is not None:
+            companies.max_sessions[company_id] = max_sessions
+        if earliest_slot is not None:
+            # keep explicit blocks behind the old earliest slot
+            old_prefix = (1 << int(companies.earliest_slot[company_id])) - 1
+            extra = int(companies.blocked_mask[company_id]) & ~old_prefix
+            companies.earliest_slot[company_id] = earliest_slot
+            companies.blocked_mask[company_id] = ((1 << earliest_slot) - 1) | extra
+        companies._items[company_id] = None
+        company = companies[company_id]
+        # the wish distribution (_demand_histogram) does not depend on these values
+
+        n_slots = len(self.time_slots)
+        mask = int(companies.blocked_mask[company_id])
+        allowed = [slot for slot in range(company.earliest_slot, n_slots) if not mask >> slot & 1]
+        sessions = {slot_idx: self.schedule.session(company_id, slot_idx) for slot_idx in range(n_slots)}
+        sessions = {slot_idx: session for slot_idx, session in sessions.items() if session is not None}
+        for session in sessions.values():
+            session.company = company
+
+        wish_matrix = self._wish_matrix()
+        changed = set()
+        displaced = []
+
+        def drop_session(slot_idx):
+            session = sessions.pop(slot_idx)
+            rows = [self.student_rows[student['id']] for student in session.students]
+            for row in rows:
+                self._unseat_student(row, slot_idx)
+            displaced.extend(rows)
+            del self.schedule[(company_id, slot_idx)]
+            changed.add((company_id, slot_idx))
+            return slot_idx, session.room, rows
+
+        # sessions in slots that are no longer allowed move to a free room in an allowed slot
+        # participants come along; whoever is busy at the new time swaps that
+        # booking into the freed old slot if the other company has a seat there
+        moved = [drop_session(slot_idx) for slot_idx in list(sessions) if slot_idx not in allowed]
+        for old_slot, room, rows in moved:
+            if len(sessions) >= company.max_sessions:
+                break
+            for slot_idx in allowed:
+                if slot_idx in sessions:
+                    continue
+                free_room = self._free_room(slot_idx, room)
+                if free_room is None:
+                    continue
+                slot_letter, time_range = self.time_slots[slot_idx]
+                session = CompanySession(company=company, room=free_room, time_slot=slot_letter, time_range=time_range)
+                self.schedule[(company_id, slot_idx)] = sessions[slot_idx] = session
+                changed.add((company_id, slot_idx))
+                for row in rows:
+                    if session.is_full():
+                        break
+                    other = int(self.student_slots[row, slot_idx])
+                    if other >= 0:
+                        target = self.schedule.session(other, old_slot)
+                        if target is None or target.is_full() or self.student_slots[row, old_slot] >= 0:
+                            continue
+                        self._unseat_student(row, slot_idx)
+                        self._seat_student(row, other, old_slot)
+                        changed.update({(other, slot_idx), (other, old_slot)})
+                    self._seat_student(row, company_id, slot_idx)
+                break
+
+        # more sessions than allowed: the emptiest ones go
+        while len(sessions) > company.max_sessions:
+            drop_session(min(sessions, key=lambda slot_idx: len(sessions[slot_idx].students)))
+
+        # fewer seats: whoever ranked the company lowest leaves first
+        for slot_idx, session in sessions.items():
+            excess = len(session.students) - company.capacity
+            if excess <= 0:
+                continue
+            rows = [self.student_rows[student['id']] for student in session.students]
+            rank = {row: int(np.flatnonzero(wish_matrix[row] == company_id)[0]) if company_id in wish_matrix[row] else MAX_WISHES
+                    for row in rows}
+            for row in sorted(rows, key=lambda row: -rank[row])[:excess]:
+                self._unseat_student(row, slot_idx)
+                displaced.append(row)
+            changed.add((company_id, slot_idx))
+
+        displaced = [row for row in dict.fromkeys(displaced) if company_id not in self.student_slots[row]]
+        if displaced:
+            self._fill_students(displaced, wish_matrix, changed)
+        else:
+            self.schedule_version += 1
+
+        # new seats (more capacity, new sessions) go straight to wishers with a free slot there,
+        # their other wishes had no free seats before either
+        gained = [
+            slot_idx for slot_idx, session in sessions.items()
+            if len(session.students) < company.capacity
+            and (company.capacity > old_capacity or (company_id, slot_idx) in changed)
+        ]
+        if gained:
+            self._seat_wishers(company_id, gained, wish_matrix, changed)
+        return sorted(changed)
+
+    def _seat_wishers(self, company_id: int, slots: List[int], wish_matrix: np.ndarray, changed: set):
+        """
+        Setzt Personen, die company_id wünschen und noch nicht dort sind, in
+        die freien Plätze der Veranstaltungen in slots, bester Wunschrang zuerst.
+        """
+        wished = wish_matrix == company_id
+        rows = np.flatnonzero(
+            wished.any(axis=1)
+            & (self.student_slots[:, slots] < 0).any(axis=1)
+            & ~(self.student_slots == company_id).any(axis=1)
+        )
+        capacity = self.companies.capacity[company_id]
+        for row in rows[np.argsort(wished[rows].argmax(axis=1), kind='stable')].tolist():
+            for slot_idx in slots:
+                session = self.schedule.session(company_id, slot_idx)
+                if self.student_slots[row, slot_idx] < 0 and len(session.students) < capacity:
+                    self._seat_student(row, company_id, slot_idx)
+                    changed.add((company_id, slot_idx))
+                    break
+
+    def _free_room(self, slot_idx: int, preferred: str) -> Optional[str]:
+        """Ein in slot_idx freier Raum, preferred (bzw. Aula) wenn möglich."""
+        if preferred == "Aula":
+            # Polizei keeps its own room
+            return preferred
+        used = {session.room for (_, slot), session in self.schedule.items() if slot == slot_idx}
+        if preferred not in used:
+            return preferred
+        return next((room for room in self.rooms or [] if room not in used), None)
+
     def load_companies(self, df: pd.DataFrame) -> bool:
         if df is None or df.empty:
             return False
         df.columns = df.columns.str.strip()
         self.companies = Company.from_dataframe(df)
+        self._demand_histogram = None
         return True
 
     def load_rooms(self, df: pd.DataFrame) -> bool:
@@ -58,314 +417,455 @@ class SchedulerService:
         ])
 
     def generate_schedule(self) -> bool:
+        """Erzeugt den Zeitplan, wirft ScheduleGenerationError bei Fehlern."""
         try:
-            company_to_number = {}
-            number_to_company = {}
-            for idx, company in enumerate(self.companies, 1):
-                normalized_name = company.name.strip()
-                company_to_number[normalized_name] = str(idx)
-                number_to_company[str(idx)] = normalized_name
-                number_to_company[idx] = normalized_name
-
-            first_wish_counts = {}
-            for student in self.student_preferences:
-                if student.wishes:
-                    first_wish = str(student.wishes[0]).strip()
-                    # Try: to convert to number, if not possible use the string directly
-                    try:
-                        wish_num = int(float(first_wish))
-                        company_name = number_to_company.get(wish_num, first_wish)
-                    except (ValueError, TypeError):
-                        company_name = first_wish
-                    first_wish_counts[company_name] = first_wish_counts.get(company_name, 0) + 1
-
-            sessions_per_company = {}
-            for company in self.companies:
-                normalized_name = company.name.strip()
-                first_wish_count = first_wish_counts.get(normalized_name, 0)
-                if first_wish_count > 0:
-                    min_sessions = -(-first_wish_count // company.capacity)
-                    sessions_per_company[normalized_name] = min(min_sessions, company.max_sessions)
-
-            sorted_companies = sorted(
-                self.companies,
-                key=lambda x: first_wish_counts.get(x.name.strip(), 0),
-                reverse=True
-            )
+            companies = self.companies
+            if not isinstance(companies, CompanyTable):
+                companies = self.companies = CompanyTable.from_companies(companies)
+            wish_matrix = self._wish_matrix()
+
+            self.schedule.reset(len(companies), len(self.time_slots))
+            open_slots = self.plan_sessions()
+            # most requested companies first
+            sorted_ids = np.argsort(-self._weighted_demand(), kind='stable').tolist()
 
-            self.schedule.clear()
-            company_rooms = {}
-            available_rooms = self.rooms.copy()
-            
             # for Polizei - assign Aula
-            polizei_company = next((company for company in sorted_companies if company.name.strip() == "Polizei"), None)
-            if polizei_company:
-                company_rooms["Polizei"] = "Aula"
-                sorted_companies.remove(polizei_company)
+            polizei_id = companies.index_by_name.get("Polizei")
+            room_plan = {}
+            if polizei_id is not None:
+                sorted_ids.remove(polizei_id)
                 # ToDo
-                for slot_idx, (slot_letter, time_range) in enumerate(self.time_slots):
-                    if slot_idx >= polizei_company.earliest_slot:
-                        session = CompanySession(
-                            company=polizei_company,
-                            room="Aula",
-                            time_slot=slot_letter,
-                            time_range=time_range
-                        )
-                        self.schedule[(polizei_company.name, slot_idx)] = session
-            
-            # non police companies
-            for company in sorted_companies:
-                if not available_rooms:
-                    available_rooms = self.rooms.copy()
-                company_room = available_rooms.pop(0)
-                company_rooms[company.name] = company_room
-
-                # earliest slot
-                for slot_offset in range(len(self.time_slots) - company.earliest_slot):
-                    slot_idx = company.earliest_slot + slot_offset
+                room_plan[polizei_id] = {slot_idx: "Aula" for slot_idx in open_slots[polizei_id]}
+
+            # non police companies, no room twice in the same slot
+            session_masks = {
+                company_id: sum(1 << slot_idx for slot_idx in open_slots[company_id])
+                for company_id in sorted_ids if open_slots[company_id]
+            }
+            room_plan.update(allocate_rooms(session_masks, self.rooms, [slot for slot, _ in self.time_slots]))
+
+            for company_id, slot_rooms in room_plan.items():
+                for slot_idx, room in slot_rooms.items():
                     slot_letter, time_range = self.time_slots[slot_idx]
                     session = CompanySession(
-                        company=company,
-                        room=company_room,
+                        company=companies[company_id],
+                        room=room,
                         time_slot=slot_letter,
                         time_range=time_range
                     )
-                    self.schedule[(company.name, slot_idx)] = session
+                    self.schedule[(company_id, slot_idx)] = session
 
+            self._assign_students(wish_matrix.tolist(), open_slots)
+            self._index_students()
             return True
 
         except Exception as e:
-            messagebox.showerror("Error", f"Fehler bei der Zeitplangenerierung: {str(e)}")
             self.schedule.clear()
-            return False
+            self._index_students()
+            if isinstance(e, ScheduleGenerationError):
+                raise
+            raise ScheduleGenerationError(f"Fehler bei der Zeitplangenerierung: {str(e)}") from e
 
-    def get_schedule(self) -> Dict[Tuple[str,int], CompanySession]:
-        return self.schedule
+    def _wish_matrix(self) -> np.ndarray:
+        """Unternehmens-IDs pro Schüler:in in Wunschreihenfolge (-1 = unbekannt/leer)."""
+        prefs = self.student_preferences
+        if isinstance(prefs, PreferenceMatrix):
+            # company numbers are 1-based, empty cells (-1) become -2
+            matrix = prefs.choices.astype(np.int64) - 1
+            # only the text cells go through the names, numbers keep same-named companies apart
+            for (row, col), text in prefs.text_wishes.items():
+                matrix[row, col] = self.companies.resolve(text)
+            return matrix
+        matrix = np.full((len(prefs), MAX_WISHES), -1, dtype=np.int64)
+        for row, student in enumerate(prefs):
+            ids = [self.companies.resolve(wish) for wish in student.wishes[:MAX_WISHES]]
+            matrix[row, :len(ids)] = ids
+        return matrix
+
+    def _weighted_demand(self) -> np.ndarray:
+        if self._demand_histogram is None:
+            self._demand_histogram = demand_histogram(self._wish_matrix(), len(self.companies))
+        return weighted_demand(self._demand_histogram, len(self.time_slots))
 
-    def export_student_schedules(self):
+    def plan_sessions(self) -> List[List[int]]:
         """
-        Exportiert Schülerzeitpläne als PDF mit 4 Schülern pro Seite,
-        sortiert nach Klassen.
+        Slots mit Veranstaltung pro Unternehmen, nach Nachfrage über alle
+        Wunschränge, max_sessions und verfügbaren Räumen.
         """
-        try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import mm
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-            
-            # group students
-            class_schedules = {}
-            for student in self.student_preferences:
-                class_name = student.student_id.split('_')[0]
-                if class_name not in class_schedules:
-                    class_schedules[class_name] = []
-                
-                # collect all appointments
-                student_schedule = []
-                realized_wishes = []
-                for slot_idx, (slot_letter, time_range) in enumerate(self.time_slots):
-                    session_found = False
-                    for wish_idx, wish in enumerate(student.wishes):
-                        key = (str(wish).strip(), slot_idx)
-                        if key in self.schedule:
-                            session = self.schedule[key]
-                            if any(s['id'] == student.student_id for s in session.students):
-                                student_schedule.append({
-                                    'time': f"{slot_letter} ({time_range})",
-                                    'company': str(wish).strip(),
-                                    'room': session.room,
-                                    'wish_number': wish_idx + 1
-                                })
-                                realized_wishes.append(True)
-                                session_found = True
-                                break
-                    if not session_found:
-                        realized_wishes.append(False)
-                
-                # calculate Erfüllungsscore
-                satisfaction_score = student.get_satisfaction_score(realized_wishes)
-                
-                class_schedules[class_name].append({
-                    'name': student.name,
-                    'schedule': sorted(student_schedule, key=lambda x: x['time']),
-                    'score': satisfaction_score
+        companies = self.companies
+        polizei_id = companies.index_by_name.get("Polizei")
+        return plan_sessions(
+            self._weighted_demand(),
+            companies.capacity,
+            companies.max_sessions,
+            companies.allowed_slots(len(self.time_slots)),
+            len(self.rooms),
+            len(self.time_slots),
+            own_room={polizei_id} if polizei_id is not None else set()
+        )
+
+    def _assign_students(self, wish_lists: List[List[int]], open_slots: List[List[int]]):
+        """Weist jede:n Schüler:in höchstens einer Veranstaltung pro Slot zu (Min-Cost-Flow)."""
+        assignments = assign_students(
+            wish_lists,
+            self.companies.capacity.tolist(),
+            open_slots,
+            len(self.time_slots)
+        )
+        for student, slots in zip(self.student_preferences, assignments):
+            for slot_idx, company_id in slots.items():
+                session = self.schedule.session(company_id, slot_idx)
+                if session:
+                    session.add_student(student.student_id, student.name)
+
+    def improve_schedule(self, time_budget: float = 2.0, seed: int = 0,
+                         restarts: int = None, workers: int = None, checkpoint=None) -> int:
+        """
+        Optionale Verbesserung nach der Zuteilung: unabhängige Simulated-Annealing-
+        Läufe (Seeds seed, seed+1, ...) laufen parallel in Prozessen, die beste
+        Zuteilung wird übernommen. Gibt die gewonnenen Wunschpunkte zurück.
+        Mit checkpoint (siehe improve_assignment) gibt es einen einzelnen Lauf
+        im aufrufenden Thread, der Fortschritt melden und abgebrochen werden kann.
+        """
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not self.schedule or not self.student_rows:
+            return 0
+        # callbacks can't cross process boundaries
+        restarts = 1 if checkpoint is not None else restarts or os.cpu_count() or 1
+        points = self._wish_points()
+        seats = np.zeros(self.schedule.grid.shape, dtype=np.int64)
+        for (company_id, slot_idx), session in self.schedule.items():
+            seats[company_id, slot_idx] = session.company.capacity
+        start_slots = self.student_slots
+        start_score = int(points[np.arange(len(start_slots))[:, None], start_slots].sum())
+
+        args = [(start_slots, points, seats, time_budget, seed + i) for i in range(restarts)]
+        if restarts == 1:
+            results = [improve_assignment(*args[0], checkpoint=checkpoint)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(restarts, workers or os.cpu_count() or 1)) as pool:
+                results = list(pool.map(improve_assignment, *zip(*args)))
+
+        # best result, lowest seed on ties
+        best_slots, best_score = max(results, key=lambda result: result[1])
+        if best_score <= start_score:
+            return 0
+        self._apply_student_slots(best_slots)
+        return best_score - start_score
+
+    def _wish_points(self) -> np.ndarray:
+        """Schüler:innen x (Unternehmen + 1): Punkte pro Wunsch wie im Erfüllungsscore, letzte Spalte 0."""
+        wish_matrix = self._wish_matrix()
+        n_companies = len(self.companies)
+        points = np.zeros((len(wish_matrix), n_companies + 1), dtype=np.int64)
+        # later ranks first, so the best rank of a duplicate wins
+        for rank in range(wish_matrix.shape[1] - 1, -1, -1):
+            column = wish_matrix[:, rank]
+            valid = np.flatnonzero((column >= 0) & (column < n_companies))
+            points[valid, column[valid]] = MAX_WISHES - rank
+        return points
+
+    def _apply_student_slots(self, student_slots: np.ndarray):
+        for session in self.schedule.values():
+            session.students.clear()
+        for student in self.student_preferences:
+            row = self.student_rows[student.student_id]
+            for slot_idx, company_id in enumerate(student_slots[row].tolist()):
+                session = self.schedule.session(company_id, slot_idx)
+                if session:
+                    session.add_student(student.student_id, student.name)
+        self._index_students()
+
+    def _index_students(self):
+        """Baut den Rückwärtsindex Schüler:in -> Veranstaltung pro Slot neu auf."""
+        self.student_rows = {student_id: row for row, student_id in enumerate(self._student_ids())}
+        self.student_slots = np.full((len(self.student_rows), len(self.time_slots)), -1, dtype=np.int64)
+        for (company_id, slot_idx), session in self.schedule.items():
+            for student in session.students:
+                row = self.student_rows.get(student['id'])
+                if row is not None:
+                    self.student_slots[row, slot_idx] = company_id
+        self.schedule_version += 1
+
+    def _student_ids(self) -> List[str]:
+        prefs = self.student_preferences
+        if prefs is None:
+            return []
+        if isinstance(prefs, PreferenceMatrix):
+            return prefs.student_ids.tolist()
+        return [student.student_id for student in prefs]
+
+    def get_student_session(self, student_id: str, slot_idx: int) -> Optional[CompanySession]:
+        row = self.student_rows.get(student_id)
+        if row is None:
+            return None
+        return self.schedule.session(int(self.student_slots[row, slot_idx]), slot_idx)
+
+    def get_student_schedules(self) -> Dict[str, List[StudentScheduleView]]:
+        """
+        Zeitpläne aller Schüler:innen gruppiert nach Klasse. Wird einmal pro
+        Zeitplanversion berechnet und von PDF-Export und Vorschau geteilt.
+        """
+        if self._student_views is not None and self._student_views_version == self.schedule_version:
+            return self._student_views
+
+        wish_lists = self._wish_matrix().tolist()
+        realized = self.realized_wish_matrix()
+        scores = self.get_satisfaction_summary().scores.tolist()
+        class_schedules: Dict[str, List[StudentScheduleView]] = {}
+        for row, student in enumerate(self.student_preferences):
+            class_name = student.student_id.split('_')[0]
+            wishes = wish_lists[row]
+            appointments = []
+            for slot_idx, (slot_letter, time_range) in enumerate(self.time_slots):
+                company_id = int(self.student_slots[row, slot_idx])
+                session = self.schedule.session(company_id, slot_idx)
+                if session is None:
+                    continue
+                wish_idx = wishes.index(company_id) if company_id in wishes else -1
+                appointments.append({
+                    'time': f"{slot_letter} ({time_range})",
+                    'company': session.company.name,
+                    'room': session.room,
+                    'wish_number': wish_idx + 1 if wish_idx >= 0 else '-'
                 })
+            class_schedules.setdefault(class_name, []).append(StudentScheduleView(
+                student_id=student.student_id,
+                name=student.name,
+                class_name=class_name,
+                appointments=appointments,
+                realized_wishes=realized[row].tolist(),
+                score=scores[row]
+            ))
 
-            # Create PDF
-            doc = SimpleDocTemplate(
-                "student_schedules.pdf",
-                pagesize=A4,
-                rightMargin=10*mm,
-                leftMargin=10*mm,
-                topMargin=10*mm,
-                bottomMargin=10*mm
+        self._student_views = class_schedules
+        self._student_views_version = self.schedule_version
+        return class_schedules
+
+    def realized_wish_matrix(self) -> np.ndarray:
+        """Schüler:innen x Wunschränge, True wenn der Wunsch im Zeitplan erfüllt ist."""
+        wish_matrix = self._wish_matrix()
+        attended = (wish_matrix[:, :, None] == self.student_slots[:, None, :]).any(axis=2) & (wish_matrix >= 0)
+        # a company listed twice only counts for its best rank
+        for rank in range(1, wish_matrix.shape[1]):
+            duplicate = (wish_matrix[:, :rank] == wish_matrix[:, rank:rank + 1]).any(axis=1)
+            attended[duplicate, rank] = False
+        return attended
+
+    def get_satisfaction_summary(self) -> SatisfactionSummary:
+        """Erfüllungsscores, Klassenstatistik und Rang-Histogramm, einmal pro Zeitplanversion."""
+        if self._satisfaction is None or self._satisfaction_version != self.schedule_version:
+            class_names = [student_id.split('_')[0] for student_id in self._student_ids()]
+            self._satisfaction = summarize_satisfaction(self.realized_wish_matrix(), class_names)
+            self._satisfaction_version = self.schedule_version
+        return self._satisfaction
+
+    def save_snapshot(self, path: str, inputs: Optional[Dict[str, str]] = None) -> str:
+        """
+        Speichert Unternehmen, Räume, Slots, Wünsche und die Zuteilung als
+        Snapshot. inputs (rooms/companies/preferences -> Dateipfad) legt die
+        Hashes fest, gegen die load_snapshot prüft.
+        """
+        prefs = self.student_preferences
+        if not isinstance(prefs, PreferenceMatrix) or not isinstance(self.companies, CompanyTable):
+            raise SnapshotError("Keine Daten für einen Snapshot geladen")
+        companies = self.companies
+        # room per session, '' = no session
+        session_rooms = np.full(self.schedule.grid.shape, '', dtype=object)
+        for key, session in self.schedule.items():
+            session_rooms[key] = session.room
+        try:
+            write_snapshot(path, {
+                'company_names': companies.names.astype(str),
+                'company_capacity': companies.capacity,
+                'company_max_sessions': companies.max_sessions,
+                'company_earliest_slot': companies.earliest_slot,
+                'company_blocked_mask': companies.blocked_mask,
+                'rooms': np.array(self.rooms or [], dtype=str),
+                'slot_letters': np.array([slot for slot, _ in self.time_slots], dtype=str),
+                'slot_times': np.array([time_range for _, time_range in self.time_slots], dtype=str),
+                'student_ids': prefs.student_ids.astype(str),
+                'student_names': prefs.names.astype(str),
+                'choices': prefs.choices,
+                'session_rooms': session_rooms.astype(str),
+                'student_slots': self.student_slots,
+            }, {
+                'text_wishes': [[row, col, text] for (row, col), text in prefs.text_wishes.items()],
+            }, inputs)
+        except OSError as e:
+            raise SnapshotError(f"Snapshot konnte nicht gespeichert werden: {e}") from e
+        return path
+
+    def load_snapshot(self, path: str, inputs: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Stellt einen mit save_snapshot gespeicherten Zustand wieder her, wirft
+        SnapshotError. Alles wird erst vollständig gelesen und geprüft, bei
+        einem Fehler bleibt der bisherige Zustand unverändert.
+        """
+        arrays, meta = read_snapshot(path, inputs)
+        try:
+            companies = CompanyTable(
+                arrays['company_names'].astype(object),
+                arrays['company_capacity'],
+                arrays['company_max_sessions'],
+                arrays['company_earliest_slot'],
+                arrays['company_blocked_mask']
             )
-            
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=12,
-                spaceAfter=10
+            rooms = arrays['rooms'].tolist()
+            time_slots = list(zip(arrays['slot_letters'].tolist(), arrays['slot_times'].tolist()))
+            text_wishes = {(row, col): text for row, col, text in meta.get('text_wishes', [])}
+            prefs = PreferenceMatrix(
+                arrays['student_ids'].astype(object),
+                arrays['student_names'].astype(object),
+                arrays['choices'],
+                text_wishes=text_wishes
             )
-            
-            story = []
-            
-            # For each class
-            for class_name, students in sorted(class_schedules.items()):
-                students_processed = 0
-                while students_processed < len(students):
-                    # 4 students for a page
-                    page_students = students[students_processed:students_processed+4]
-                    
-                    # students
-                    for student in page_students:
-                        # Header
-                        story.append(Paragraph(
-                            f"{student['name']} - Klasse {class_name} - Score: {student['score']:.1f}%",
-                            title_style
-                        ))
-                        
-                        # Schedule table
-                        schedule_data = [['Time', 'Company', 'Room', 'Wish']]
-                        for appointment in student['schedule']:
-                            schedule_data.append([
-                                appointment['time'],
-                                appointment['company'],
-                                appointment['room'],
-                                str(appointment['wish_number'])
-                            ])
-                        
-                        t = Table(
-                            schedule_data,
-                            colWidths=[60*mm, 60*mm, 30*mm, 20*mm],
-                            style=TableStyle([
-                                ('GRID', (0,0), (-1,-1), 0.25, colors.red),
-                                ('BACKGROUND', (0,0), (-1,0), colors.grey),
-                                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                                ('ALIGN', (0,1), (-2,-1), 'LEFT'),
-                                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0,0), (-1,0), 10),
-                                ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                                ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                                ('TEXTCOLOR', (0,1), (-1,-1), colors.black),
-                                ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-                                ('FONTSIZE', (0,1), (-1,-1), 10),
-                                ('TOPPADDING', (0,1), (-1,-1), 6),
-                                ('BOTTOMPADDING', (0,1), (-1,-1), 6),
-                                ('LEADING', (0,1), (-1,-1), 8)
-                            ])
-                        )
-                        story.append(t)
-                        story.append(Paragraph("<br/><br/>", styles['Normal']))
-                    
-                    students_processed += 4
-            
-            doc.build(story)
-            messagebox.showinfo(
-                "Export erfolgreich",
-                "Schülerzeitpläne wurden unter student_schedules.pdf gespeichert."
+            session_rooms = arrays['session_rooms']
+            student_slots = arrays['student_slots']
+            if len(prefs) == 0:
+                raise ValueError("keine Schüler:innen")
+            if session_rooms.shape != (len(companies), len(time_slots)):
+                raise ValueError(f"session_rooms hat die Form {session_rooms.shape}")
+            if student_slots.shape != (len(prefs), len(time_slots)):
+                raise ValueError(f"student_slots hat die Form {student_slots.shape}")
+
+            schedule = SessionGrid(*session_rooms.shape)
+            for company_id, slot_idx in zip(*np.nonzero(session_rooms != '')):
+                slot_letter, time_range = time_slots[slot_idx]
+                schedule[(int(company_id), int(slot_idx))] = CompanySession(
+                    company=companies[int(company_id)],
+                    room=str(session_rooms[company_id, slot_idx]),
+                    time_slot=slot_letter,
+                    time_range=time_range
+                )
+        except (KeyError, ValueError, IndexError, TypeError) as e:
+            raise SnapshotError(f"Snapshot ist unvollständig: {e}") from e
+
+        self.companies = companies
+        self.rooms = rooms
+        self.time_slots = time_slots
+        self.schedule.grid = schedule.grid
+        self.load_student_matrix(prefs)
+        self._apply_student_slots(student_slots)
+        return True
+
+    def get_schedule(self) -> SessionGrid:
+        return self.schedule
+
+    def export_student_schedules(self, output_path: str = "student_schedules.pdf", progress=None) -> str:
+        """
+        Exportiert Schülerzeitpläne als PDF mit 4 Schülern pro Seite,
+        sortiert nach Klassen. Gibt den Dateipfad zurück, wirft ExportError.
+        """
+        return self.export_task('students', output_path)(progress)
+
+    def export_class_schedules(self, output_dir: str, workers: Optional[int] = None,
+                               combine: Optional[str] = None) -> List[str]:
+        """
+        Schülerzeitpläne als ein PDF pro Klasse, parallel in einem Prozesspool
+        gerendert; die Auswertung kommt in eine eigene Datei. combine='pdf'
+        fügt alles zu student_schedules.pdf zusammen (benötigt pypdf),
+        combine='zip' packt die Dateien in student_schedules.zip.
+        Gibt die geschriebenen Pfade zurück, wirft ExportError.
+        """
+        if combine not in (None, 'pdf', 'zip'):
+            raise ExportError(f"Unbekannte Zusammenführung: {combine}")
+        try:
+            paths = export_class_pdfs(
+                output_dir, self.get_student_schedules(), self.get_satisfaction_summary(), workers, combine,
+                self.export_cache
             )
-            
+            if self.export_cache is not None:
+                self.export_cache.evict()
+            return paths
+        except ExportError:
+            raise
         except Exception as e:
-            messagebox.showerror(
-                "Export Error",
-                f"Fehler beim Exportieren der Schülerzeitpläne: {str(e)}"
-            )
+            raise ExportError(f"Fehler beim Exportieren der Schülerzeitpläne: {str(e)}") from e
 
-    def export_attendance_lists(self, preview_mode=False):
+    def export_attendance_lists(self, output_path: str = "attendance_lists.pdf", progress=None) -> str:
         """
         Exportiert Anwesenheitslisten für jede Veranstaltung als PDF.
-        In der Vorschau werden nur die ersten 6 Unternehmen angezeigt.
+        Gibt den Dateipfad zurück, wirft ExportError.
+        """
+        return self.export_task('attendance', output_path)(progress)
+
+    def export_schedule(self, output_path: str = "schedule.pdf", progress=None) -> str:
+        """
+        Exportiert die Zeitplanübersicht (Unternehmen x Slots) als PDF.
+        Gibt den Dateipfad zurück, wirft ExportError.
         """
+        return self.export_task('schedule', output_path)(progress)
+
+    def export_task(self, kind: str, output_path: str) -> Callable[..., str]:
+        """
+        Sammelt die Daten eines Exports sofort und gibt eine Funktion
+        task(progress=None) -> Pfad zurück, die nur noch rendert. Sie kann in
+        einem Hintergrund-Thread laufen, während der Plan weiter geändert
+        wird. kind: 'students', 'attendance' oder 'schedule'. Wirft ExportError.
+        """
+        what = {
+            'students': "der Schülerzeitpläne",
+            'attendance': "der Anwesenheitslisten",
+            'schedule': "des Zeitplans",
+        }.get(kind)
+        if what is None:
+            raise ExportError(f"Unbekannter Export: {kind}")
+        cache = self.export_cache
         try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.lib.units import mm
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-            
-            doc = SimpleDocTemplate(
-                "attendance_lists.pdf",
-                pagesize=A4,
-                rightMargin=10*mm,
-                leftMargin=10*mm,
-                topMargin=10*mm,
-                bottomMargin=10*mm
-            )
-            
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Sort by company name and time slot
-            sorted_sessions = sorted(
-                self.schedule.items(),
-                key=lambda x: (x[0][0], x[0][1])  # Sort by company name, then slot
-            )
-            
-            # In preview mode, limit to first 6 companies because it gets laggy if not
-            if preview_mode:
-                # Get unique company names ToDo: fachrichtung noch nicht berücksichtigt
-                company_names = list(set(company_name for (company_name, _), _ in sorted_sessions))
-                # Limit to first 6 companies
-                if len(company_names) > 6:
-                    company_names = company_names[:6]
-                # Filter sessions to only include these companies
-                sorted_sessions = [(key, session) for (key, session) in sorted_sessions 
-                                  if key[0] in company_names]
-            
-            for (company_name, slot_idx), session in sorted_sessions:
-                # Header
-                story.append(Paragraph(
-                    f"<b>{company_name}</b><br/>"
-                    f"Zeitfenster: {session.time_slot} ({session.time_range})<br/>"
-                    f"Raum: {session.room}",
-                    styles['Heading1']
-                ))
-                
-                # Attendee list
-                data = [['Nr.', 'Name', 'Klasse', 'Unterschrift']]
-                for i, student in enumerate(sorted(session.students, key=lambda x: x['name']), 1):
-                    class_name = student['id'].split('_')[0]
-                    data.append([str(i), student['name'], class_name, ''])
-                
-                # Add empty rows
-                empty_rows = [['', '', '', ''] for _ in range(5)]
-                for i, empty_row in enumerate(empty_rows, len(data)):
-                    empty_row[0] = str(i)
-                data.extend(empty_rows)
-                
-                t = Table(
-                    data,
-                    colWidths=[20*mm, 80*mm, 30*mm, 50*mm],
-                    style=TableStyle([
-                        ('GRID', (0,0), (-1,-1), 0.25, colors.black),
-                        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-                        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0,0), (-1,0), 10),
-                        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                        ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                        ('TEXTCOLOR', (0,1), (-1,-1), colors.black),
-                        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-                        ('FONTSIZE', (0,1), (-1,-1), 10),
-                        ('TOPPADDING', (0,1), (-1,-1), 6),
-                        ('BOTTOMPADDING', (0,1), (-1,-1), 6)
-                    ])
-                )
-                story.append(t)
-                story.append(Paragraph("<br/><br/>", styles['Normal']))
-            
-            doc.build(story)
-            messagebox.showinfo(
-                "Export erfolgreich",
-                "Anwesenheitslisten wurden unter attendance_lists.pdf gespeichert."
-            )
-            
+            if kind == 'students':
+                render = render_student_schedules
+                args = (self.get_student_schedules(), self.get_satisfaction_summary(), cache)
+            elif kind == 'attendance':
+                render = render_attendance_lists
+                args = (self.attendance_sessions(), cache)
+            else:
+                render = render_schedule_overview
+                args = (list(self.time_slots), self._overview_rows())
         except Exception as e:
-            messagebox.showerror(
-                "Export Fehler",
-                f"Fehler beim Exportieren der Anwesenheitslisten: {str(e)}"
-            )
+            raise ExportError(f"Fehler beim Exportieren {what}: {str(e)}") from e
+
+        def task(progress=None) -> str:
+            try:
+                render(output_path, *args, progress=progress)
+            except Exception as e:
+                raise ExportError(f"Fehler beim Exportieren {what}: {str(e)}") from e
+            if cache is not None:
+                cache.evict()
+            return output_path
+
+        return task
+
+    def attendance_sessions(self) -> List[CompanySession]:
+        """
+        Alle Veranstaltungen nach Unternehmen und Slot sortiert, für
+        Anwesenheitslisten und deren Vorschau. Die Teilnehmerlisten werden
+        kopiert, ein Export im Hintergrund sieht spätere Änderungen nicht.
+        """
+        # Sort by company name and time slot
+        sorted_sessions = sorted(
+            self.schedule.items(),
+            key=lambda x: (x[1].company.name, x[0][1])  # Sort by company name, then slot
+        )
+        return [replace(session, students=list(session.students)) for _, session in sorted_sessions]
+
+    def _overview_rows(self) -> List[tuple]:
+        """(Unternehmen, Zelltext pro Slot) für die Zeitplanübersicht."""
+        rows = []
+        for company in self.companies:
+            cells = []
+            for slot_idx, _ in enumerate(self.time_slots):
+                if slot_idx < company.earliest_slot:
+                    text = "---"
+                else:
+                    session = self.schedule.session(company.company_id, slot_idx)
+                    if session:
+                        count = len(session.students)
+                        text = f"Raum {session.room}\n({count} TN)"
+                    else:
+                        text = "---"
+                cells.append(text)
+            rows.append((company.name, cells))
+        return rows
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from services.errors import SnapshotError
+from services.workbooks import content_hash
+
+# bump when the stored arrays change, older snapshots are rejected then
+SNAPSHOT_VERSION = 1
+
+
+def input_hashes(inputs: Dict[str, str]) -> Dict[str, str]:
+    """Eingabename (rooms, companies, preferences) -> SHA-256 der Datei, wirft SnapshotError."""
+    try:
+        return {name: content_hash(path) for name, path in inputs.items() if path}
+    except OSError as e:
+        raise SnapshotError(f"Eingabedatei kann nicht gelesen werden: {e}") from e
+
+
+def write_snapshot(path: str, arrays: Dict[str, np.ndarray], meta: dict, inputs: Optional[Dict[str, str]] = None):
+    """
+    Schreibt den Zustand als .npz: nur Zahlen- und Unicode-Arrays, keine
+    Pickles. meta wird als JSON mitgespeichert, zusammen mit Version und
+    den Hashes der Eingabedateien.
+    """
+    meta = dict(meta, version=SNAPSHOT_VERSION, inputs=input_hashes(inputs or {}))
+    arrays = dict(arrays, meta=np.array(json.dumps(meta)))
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_snapshot(path: str, inputs: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Liest einen Snapshot. Mit inputs werden die gespeicherten Hashes gegen
+    die aktuellen Dateien geprüft; ein veralteter Snapshot wirft SnapshotError.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+    except (OSError, ValueError, KeyError) as e:
+        raise SnapshotError(f"Snapshot kann nicht gelesen werden: {e}") from e
+
+    try:
+        meta = json.loads(str(arrays.pop('meta', '{}')))
+    except ValueError as e:
+        raise SnapshotError(f"Snapshot-Metadaten sind beschädigt: {e}") from e
+    if not isinstance(meta, dict):
+        raise SnapshotError("Snapshot-Metadaten sind beschädigt")
+    if meta.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot-Version {meta.get('version')} wird nicht unterstützt")
+    if inputs:
+        stored = meta.get('inputs', {})
+        changed = [name for name, digest in input_hashes(inputs).items() if stored.get(name) != digest]
+        if changed:
+            raise SnapshotError("Eingabedateien wurden geändert: " + ", ".join(changed))
+    return arrays, meta
@@ -0,0 +1,234 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+import pandas as pd
+
+from models.student import PreferenceMatrix
+from services.disk_cache import evict_lru
+
+# bump when the normalisation below changes, old cache entries are ignored then
+CACHE_VERSION = 1
+# from this total size of the three workbooks on, read_all parses them in import_pool()
+PARALLEL_IMPORT_BYTES = 4 * 1024 * 1024
+
+_import_pool: Optional[ProcessPoolExecutor] = None
+_import_pool_lock = threading.Lock()
+
+
+def content_hash(file_path: str) -> str:
+    """SHA-256 des Dateiinhalts, unabhängig von Name und Änderungszeit."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """
+    Cache für eingelesene Arbeitsmappen. Schlüssel ist der SHA-256 des
+    Dateiinhalts plus Lesefunktion, gespeichert wird der normalisierte
+    DataFrame als Pickle. Überschreitet der Ordner max_bytes, werden die
+    am längsten nicht benutzten Einträge gelöscht.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def load(self, file_path: str, reader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        entry = os.path.join(self.directory, f"{reader.__name__}-v{CACHE_VERSION}-{content_hash(file_path)}.pkl")
+
+        df = self._read_entry(entry)
+        if df is not None:
+            # mark as recently used
+            os.utime(entry)
+            return df
+
+        df = reader(file_path)
+        self._write_entry(entry, df)
+        return df
+
+    def _read_entry(self, entry: str) -> Optional[pd.DataFrame]:
+        try:
+            with open(entry, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # broken entry, parse again
+            return None
+
+    def _write_entry(self, entry: str, df: pd.DataFrame):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry)
+            evict_lru(self.directory, '.pkl', self.max_bytes)
+        except OSError:
+            # the cache is an optimisation only
+            pass
+
+
+def _load(file_path: str, reader: Callable[[str], pd.DataFrame], cache: Optional[WorkbookCache]) -> pd.DataFrame:
+    if cache is None:
+        return reader(file_path)
+    return cache.load(file_path, reader)
+
+
+def parse_preferences(file_path: str) -> pd.DataFrame:
+    df = pd.read_excel(file_path)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def parse_companies(file_path: str) -> pd.DataFrame:
+    df = pd.read_excel(file_path)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def parse_rooms(file_path: str) -> pd.DataFrame:
+    return pd.read_excel(file_path, header=None)
+
+
+def read_preferences(file_path: str, cache: Optional[WorkbookCache] = None) -> pd.DataFrame:
+    """BOT2: Schülerwünsche (Klasse, Name, Vorname, Wahl 1-6)."""
+    return _load(file_path, parse_preferences, cache)
+
+
+def read_companies(file_path: str, cache: Optional[WorkbookCache] = None) -> pd.DataFrame:
+    """BOT1: Veranstaltungsliste der Unternehmen."""
+    return _load(file_path, parse_companies, cache)
+
+
+def read_rooms(file_path: str, cache: Optional[WorkbookCache] = None) -> pd.DataFrame:
+    """BOT0: Raumliste, eine Spalte ohne Kopfzeile."""
+    return _load(file_path, parse_rooms, cache)
+
+
+def stream_preferences(
+    file_path: str,
+    chunk_size: int = 5000,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    preview_rows: int = 6
+) -> Tuple[PreferenceMatrix, pd.DataFrame]:
+    """
+    Liest eine BOT2-Wahlliste zeilenweise (openpyxl read_only) und baut die
+    Wunschmatrix in Blöcken von chunk_size Zeilen auf, der Speicherbedarf
+    bleibt dabei unabhängig von der Dateigröße. progress(gelesen, gesamt)
+    wird nach jedem Block aufgerufen; gesamt ist None, wenn die Datei keine
+    Größe angibt. Gibt die Matrix und die ersten Zeilen für die Vorschau zurück.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        total = ws.max_row - 1 if ws.max_row else None
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return PreferenceMatrix.concat([]), pd.DataFrame()
+        columns = [str(col).strip() if col is not None else '' for col in header]
+
+        parts = []
+        preview_data = []
+        chunk = []
+        done = 0
+        # blank rows only count if data follows, like pd.read_excel
+        pending_blank = 0
+
+        def flush():
+            nonlocal chunk, done
+            df = pd.DataFrame(chunk, columns=columns)
+            if len(preview_data) < preview_rows:
+                preview_data.extend(chunk[:preview_rows - len(preview_data)])
+            parts.append(PreferenceMatrix.from_dataframe(df))
+            done += len(chunk)
+            chunk = []
+            if progress:
+                progress(done, total)
+
+        for row in rows:
+            if all(value is None for value in row):
+                pending_blank += 1
+                continue
+            chunk.extend([(None,) * len(columns)] * pending_blank)
+            pending_blank = 0
+            chunk.append(tuple(row[:len(columns)]) + (None,) * (len(columns) - len(row)))
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        wb.close()
+
+    return PreferenceMatrix.concat(parts), pd.DataFrame(preview_data, columns=columns)
+
+
+@dataclass
+class Workbooks:
+    """Ergebnis von read_all; preferences ist bei stream=True eine PreferenceMatrix."""
+    rooms: pd.DataFrame
+    companies: pd.DataFrame
+    preferences: Union[pd.DataFrame, PreferenceMatrix]
+    preferences_preview: pd.DataFrame
+
+
+def _read_preferences_with_preview(file_path: str, cache: Optional[WorkbookCache], stream: bool):
+    if stream:
+        return stream_preferences(file_path)
+    df = read_preferences(file_path, cache)
+    return df, df
+
+
+def import_pool() -> ProcessPoolExecutor:
+    """
+    Prozesspool für read_all, wird beim ersten großen Import gestartet und
+    danach wiederverwendet, der Start (spawn/forkserver) kostet also nur
+    einmal pro Programmlauf.
+    """
+    global _import_pool
+    with _import_pool_lock:
+        if _import_pool is None:
+            _import_pool = ProcessPoolExecutor(max_workers=3)
+        return _import_pool
+
+
+def read_all(
+    rooms_path: str,
+    companies_path: str,
+    preferences_path: str,
+    cache: Optional[WorkbookCache] = None,
+    stream: bool = False,
+    executor: Optional[Executor] = None
+) -> Workbooks:
+    """
+    Liest BOT0, BOT1 und BOT2 ein. Ab PARALLEL_IMPORT_BYTES zusammen
+    parst import_pool() die drei Dateien gleichzeitig in eigenen Prozessen
+    (read_excel hält den GIL, Threads bringen nichts), die Wartezeit
+    entspricht dann der langsamsten Datei. Kleinere Dateien werden der
+    Reihe nach gelesen, dort kostet schon der Start eines Pools mehr als
+    das Lesen. executor ersetzt den gemeinsamen Pool.
+    """
+    if executor is None:
+        size = sum(os.path.getsize(path) for path in (rooms_path, companies_path, preferences_path))
+        if size < PARALLEL_IMPORT_BYTES:
+            rooms = read_rooms(rooms_path, cache)
+            companies = read_companies(companies_path, cache)
+            prefs, preview = _read_preferences_with_preview(preferences_path, cache, stream)
+            return Workbooks(rooms, companies, prefs, preview)
+        executor = import_pool()
+    rooms = executor.submit(read_rooms, rooms_path, cache)
+    companies = executor.submit(read_companies, companies_path, cache)
+    preferences = executor.submit(_read_preferences_with_preview, preferences_path, cache, stream)
+    prefs, preview = preferences.result()
+    return Workbooks(rooms.result(), companies.result(), prefs, preview)